@@ -9,6 +9,14 @@ class ApiService {
   static String? accessToken;
   static String? refreshToken;
 
+  // Agenda local para la sincronización incremental (id_clase -> clase)
+  static final Map<int, dynamic> _clasesLocales = {};
+  static String? _tokenSync;
+
+  // ETag y respuesta guardada por día (fecha -> valor)
+  static final Map<String, String> _etagsPorDia = {};
+  static final Map<String, List<dynamic>> _clasesPorDia = {};
+
   // =====================================================
   // 🔹 LOGIN INSTRUCTOR
   // Django espera: { correo, password }
@@ -76,6 +84,49 @@ class ApiService {
     final url =
         Uri.parse('$baseUrl/api/instructor/clases/?fecha=$f');
 
+    final headers = {
+      'Authorization': 'Bearer $accessToken',
+      'Content-Type': 'application/json',
+    };
+    final etag = _etagsPorDia[f];
+    if (etag != null && _clasesPorDia.containsKey(f)) {
+      headers['If-None-Match'] = etag;
+    }
+
+    final resp = await http.get(url, headers: headers);
+
+    print('CLASES FECHA status: ${resp.statusCode}');
+
+    // 304: el día no cambió, se usa lo que ya estaba
+    if (resp.statusCode == 304) {
+      return _clasesPorDia[f]!;
+    }
+
+    if (resp.statusCode == 200) {
+      final clases = jsonDecode(resp.body) as List;
+      final nuevoEtag = resp.headers['etag'];
+      if (nuevoEtag != null) {
+        _etagsPorDia[f] = nuevoEtag;
+        _clasesPorDia[f] = clases;
+      }
+      return clases;
+    } else {
+      throw Exception(
+          'Error ${resp.statusCode}: ${resp.body}');
+    }
+  }
+
+  // =====================================================
+  // 🔹 OBTENER CLASES DE UN RANGO (ej: semana del calendario)
+  // Una sola llamada; Django responde { "dias": { "YYYY-MM-DD": [clases] } }
+  // con todos los días del rango (máximo 62).
+  // =====================================================
+  static Future<Map<String, List<dynamic>>> fetchClasesRango(
+      DateTime desde, DateTime hasta) async {
+    final formato = DateFormat('yyyy-MM-dd');
+    final url = Uri.parse('$baseUrl/api/instructor/clases/rango/'
+        '?desde=${formato.format(desde)}&hasta=${formato.format(hasta)}');
+
     final resp = await http.get(
       url,
       headers: {
@@ -84,14 +135,56 @@ class ApiService {
       },
     );
 
-    print('CLASES FECHA status: ${resp.statusCode}');
-    print('CLASES FECHA body: ${resp.body}');
+    print('CLASES RANGO status: ${resp.statusCode}');
 
-    if (resp.statusCode == 200) {
-      return jsonDecode(resp.body) as List;
-    } else {
-      throw Exception(
-          'Error ${resp.statusCode}: ${resp.body}');
+    if (resp.statusCode != 200) {
+      throw Exception('Error ${resp.statusCode}: ${resp.body}');
+    }
+
+    final dias = jsonDecode(resp.body)['dias'] as Map<String, dynamic>;
+    return dias.map((fecha, clases) => MapEntry(fecha, clases as List));
+  }
+
+  // =====================================================
+  // 🔹 SINCRONIZAR CLASES (solo cambios)
+  // La primera vez baja la agenda desde hoy; después pide solo lo
+  // creado/editado/eliminado desde el último token.
+  // =====================================================
+  static Future<List<dynamic>> syncClases() async {
+    final query = _tokenSync == null
+        ? ''
+        : '?since=${Uri.encodeQueryComponent(_tokenSync!)}';
+    final url = Uri.parse('$baseUrl/api/instructor/clases/sync/$query');
+
+    final resp = await http.get(
+      url,
+      headers: {
+        'Authorization': 'Bearer $accessToken',
+        'Content-Type': 'application/json',
+      },
+    );
+
+    print('SYNC status: ${resp.statusCode}');
+
+    if (resp.statusCode != 200) {
+      throw Exception('Error ${resp.statusCode}: ${resp.body}');
     }
+
+    final data = jsonDecode(resp.body);
+    if (data['completo'] == true) {
+      _clasesLocales.clear();
+    }
+    for (final c in data['clases'] as List) {
+      _clasesLocales[c['id_clase'] as int] = c;
+    }
+    for (final id in data['eliminadas'] as List) {
+      _clasesLocales.remove(id as int);
+    }
+    _tokenSync = data['token'];
+
+    final clases = _clasesLocales.values.toList();
+    clases.sort((a, b) =>
+        (a['hora_inicio'] as String).compareTo(b['hora_inicio'] as String));
+    return clases;
   }
 }
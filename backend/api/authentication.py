@@ -0,0 +1,83 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from usuarios.models import Usuario
+
+# Claims propios que lleva el token además del user_id de SimpleJWT
+CLAIM_RUT = "rut"
+CLAIM_CENTRO = "centro"
+CLAIM_TIPO = "tipo"
+
+
+def agregar_claims(token, usuario):
+    """Copia RUT, centro y tipo del Usuario al token (el access hereda los del refresh)."""
+    token[CLAIM_RUT] = usuario.rut_usuario
+    token[CLAIM_CENTRO] = usuario.id_centro_id
+    token[CLAIM_TIPO] = usuario.tipo_de_usuario_id
+    return token
+
+
+def tokens_para_usuario(usuario, user):
+    refresh = agregar_claims(RefreshToken.for_user(user), usuario)
+    return {"access": str(refresh.access_token), "refresh": str(refresh)}
+
+
+class JWTUsuarioAuthentication(JWTStatelessUserAuthentication):
+    """
+    Valida el JWT sin ir a la base: request.user es un TokenUser armado desde el
+    token y request.auth trae los claims (rut, centro, tipo).
+    """
+
+
+def identidad_desde_claims(token):
+    """(rut, centro_id) desde los claims del token, o (None, None) si es un token viejo."""
+    if token is not None and CLAIM_RUT in token:
+        return token[CLAIM_RUT], token.get(CLAIM_CENTRO)
+    return None, None
+
+
+def identidad_por_user(user_id):
+    """
+    Respaldo para tokens emitidos antes de tener los claims: busca por el User
+    vinculado o por el correo (username), como se hacía antes.
+    """
+    fila = (
+        Usuario.objects.filter(user_id=user_id).values_list("rut_usuario", "id_centro").first()
+        if user_id is not None else None
+    )
+    if fila is None:
+        username = User.objects.filter(pk=user_id).values_list("username", flat=True).first()
+        if username:
+            fila = Usuario.objects.filter(correo=username).values_list("rut_usuario", "id_centro").first()
+    return fila if fila else (None, None)
+
+
+def identidad_api(request):
+    """(rut, centro_id) del Usuario dueño del token; con claims no hace consultas."""
+    rut, centro = identidad_desde_claims(request.auth)
+    if rut is None:
+        return identidad_por_user(getattr(request.user, "id", None))
+    return rut, centro
+
+
+async def aidentidad_jwt(request):
+    """
+    Para vistas async fuera de DRF: valida el Bearer del request (sin base de datos)
+    y retorna (rut, centro_id). None si no viene token o no es válido.
+    """
+    try:
+        resultado = JWTUsuarioAuthentication().authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    if resultado is None:
+        return None
+
+    user, token = resultado
+    rut, centro = identidad_desde_claims(token)
+    if rut is None:
+        rut, centro = await sync_to_async(identidad_por_user)(user.id)
+    return rut, centro
@@ -39,7 +39,37 @@ class ClaseSerializer(serializers.ModelSerializer):
 
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework import serializers
-from usuarios.models import Usuario
+from rest_framework.exceptions import AuthenticationFailed, Throttled
+from backend_project.throttling import ip_del_request, limpiar_fallos, login_bloqueado, registrar_fallo
+from usuarios.models import Usuario, normalizar_correo
+from .authentication import agregar_claims
+
+class UsuarioTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """/api/token/ con los claims del Usuario vinculado (ver api/authentication.py)."""
+
+    def validate(self, attrs):
+        # mismo límite de intentos fallidos que login_view e InstructorLoginView:
+        # el User tiene el mismo hash, así que sin esto se podría adivinar por aquí
+        correo = normalizar_correo(attrs.get(self.username_field))
+        ip = ip_del_request(self.context["request"])
+        if login_bloqueado(correo, ip):
+            raise Throttled(detail="Demasiados intentos fallidos. Intenta más tarde.")
+        try:
+            datos = super().validate(attrs)
+        except AuthenticationFailed:
+            registrar_fallo(correo, ip)
+            raise
+        limpiar_fallos(correo)
+        return datos
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        usuario = Usuario.objects.filter(user=user).first()
+        if usuario:
+            agregar_claims(token, usuario)
+        return token
+
 
 class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
     # renombramos el campo para que Flutter mande "email" en lugar de "username"
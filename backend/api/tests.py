@@ -1,3 +1,66 @@
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from centros.models import CentroDeEsqui
+from usuarios.models import Identificador, Usuario
+
+# hasher rápido: estos tests cuentan intentos, no miden el costo del hash
+HASHER_RAPIDO = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=HASHER_RAPIDO, LOGIN_MAX_FALLOS_CORREO=3)
+class LimiteLoginTests(TestCase):
+    """Los tres logins comparten el límite de intentos fallidos (backend_project/throttling.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Identificador.objects.create(tipo_de_usuario="instructor")
+        centro = CentroDeEsqui.objects.create(nombre_centro="norte", ubicacion="norte")
+        cls.usuario = Usuario.objects.create(
+            rut_usuario="norte-0", nombre="Inst", apellido="Norte", tipo_de_usuario_id="instructor",
+            id_centro=centro, correo="inst@norte.cl", contraseña=make_password("clave-buena"),
+        )
+        # como lo deja InstructorLoginView: el User con el mismo hash
+        cls.usuario.user = User.objects.create(username="inst@norte.cl", password=cls.usuario.contraseña)
+        cls.usuario.save(update_fields=["user"])
+
+    def setUp(self):
+        cache.clear()
+
+    def _token(self, password):
+        return self.client.post("/api/token/", {"username": "inst@norte.cl", "password": password})
+
+    def test_api_token_bloquea_tras_los_fallos(self):
+        for _ in range(3):
+            self.assertEqual(self._token("mala").status_code, 401)
+        # bloqueado aunque ahora la clave sea la correcta
+        self.assertEqual(self._token("clave-buena").status_code, 429)
+
+    def test_api_token_comparte_el_limite_con_el_login_de_la_app(self):
+        for _ in range(3):
+            r = self.client.post("/api/instructor/login/", {"correo": "inst@norte.cl", "password": "mala"})
+            self.assertEqual(r.status_code, 401)
+        self.assertEqual(self._token("clave-buena").status_code, 429)
+
+    def test_login_web_bloquea_tras_los_fallos(self):
+        for _ in range(settings.LOGIN_MAX_FALLOS_CORREO):
+            r = self.client.post("/login/", {"username": "Inst@Norte.cl", "password": "mala"})
+            self.assertEqual(r.status_code, 200)
+        r = self.client.post("/login/", {"username": "inst@norte.cl", "password": "clave-buena"})
+        self.assertEqual(r.status_code, 429)
+        self.assertNotIn("usuario_id", self.client.session)
+
+    def test_login_exitoso_limpia_los_fallos(self):
+        def login_app(password):
+            return self.client.post("/api/instructor/login/", {"correo": "inst@norte.cl", "password": password})
+
+        for _ in range(settings.LOGIN_MAX_FALLOS_CORREO - 1):
+            self.assertEqual(login_app("mala").status_code, 401)
+        self.assertEqual(login_app("clave-buena").status_code, 200)
+        # la cuenta parte de cero: otra tanda de fallos bajo el tope no la bloquea
+        for _ in range(settings.LOGIN_MAX_FALLOS_CORREO - 1):
+            self.assertEqual(login_app("mala").status_code, 401)
+        self.assertEqual(login_app("clave-buena").status_code, 200)
@@ -4,10 +4,11 @@ from rest_framework import status
 from rest_framework.permissions import AllowAny
 
 from django.contrib.auth.models import User
-from django.contrib.auth.hashers import check_password
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from usuarios.models import Usuario
+from backend_project.throttling import ip_del_request, limpiar_fallos, login_bloqueado, registrar_fallo
+from backend_project.utils import verificar_credenciales
+from usuarios.models import normalizar_correo
+from .authentication import tokens_para_usuario
 
 
 class InstructorLoginView(APIView):
@@ -16,7 +17,7 @@ class InstructorLoginView(APIView):
     authentication_classes = []  # no exige JWT para entrar
 
     def post(self, request):
-        correo = request.data.get("correo")
+        correo = normalizar_correo(request.data.get("correo"))
         password = request.data.get("password")
 
         if not correo or not password:
@@ -25,46 +26,37 @@ class InstructorLoginView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # buscar en tu tabla usuarios_usuario
-        try:
-            instructor = Usuario.objects.get(correo=correo)
-        except Usuario.DoesNotExist:
+        ip = ip_del_request(request)
+        if login_bloqueado(correo, ip):
             return Response(
-                {"detail": "Credenciales inválidas"},
-                status=status.HTTP_401_UNAUTHORIZED,
+                {"detail": "Demasiados intentos fallidos. Intenta más tarde."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
             )
 
-        # comparar con la contraseña encriptada
-        if not check_password(password, instructor.contraseña):
+        # busca por correo (índice único) y compara con la contraseña encriptada
+        instructor = verificar_credenciales(correo, password)
+        if instructor is None:
+            registrar_fallo(correo, ip)
             return Response(
                 {"detail": "Credenciales inválidas"},
                 status=status.HTTP_401_UNAUTHORIZED,
             )
+        limpiar_fallos(correo)
 
-        # crear o reutilizar User de Django vinculado
-        if getattr(instructor, "user", None) is None:
-            user = User.objects.create(
+        # crear o reutilizar el User de Django vinculado
+        user = instructor.user
+        if user is None:
+            user, _ = User.objects.get_or_create(
                 username=correo,
-                email=correo,
-                is_active=True,
+                defaults={"email": correo, "is_active": True},
             )
             user.password = instructor.contraseña  # ya viene encriptada
-            user.save()
-            # si aún no tienes el campo user en tu modelo Usuario,
-            # este bloque lo ajustamos después
-            if hasattr(instructor, "user"):
-                instructor.user = user
-                instructor.save(update_fields=["user"])
-        else:
-            user = instructor.user
-
-        # generar tokens JWT
-        refresh = RefreshToken.for_user(user)
+            user.save(update_fields=["password"])
+            instructor.user = user
+            instructor.save(update_fields=["user"])
 
+        # generar tokens JWT con rut/centro/tipo como claims
         return Response(
-            {
-                "access": str(refresh.access_token),
-                "refresh": str(refresh),
-            },
+            tokens_para_usuario(instructor, user),
             status=status.HTTP_200_OK,
         )
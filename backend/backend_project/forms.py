@@ -1,5 +1,5 @@
 from django import forms
-from usuarios.models import Usuario, Identificador
+from usuarios.models import Usuario, Identificador, normalizar_correo
 
 class LoginForm(forms.Form):
     username = forms.CharField(label='Usuario')
@@ -31,6 +31,9 @@ class RegistroForm(forms.ModelForm):
             "contraseña",
         ]
 
+    def clean_correo(self):
+        return normalizar_correo(self.cleaned_data.get("correo"))
+
     def clean(self):
         cd = super().clean()
 
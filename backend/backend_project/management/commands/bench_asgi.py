@@ -0,0 +1,130 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from time import perf_counter
+
+from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+from django.utils.timezone import localdate
+
+from api.authentication import tokens_para_usuario
+from centros.models import CentroDeEsqui
+from clases.models import Clase, limites_del_dia
+from director.models import EstadoInstructor
+from usuarios.models import Usuario, Identificador
+
+
+def _resumen(nombre, tiempos, total):
+    tiempos = sorted(tiempos)
+    p50 = tiempos[len(tiempos) // 2] * 1000
+    p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))] * 1000
+    return f"{nombre:<28} {len(tiempos) / total:8.1f} req/s  p50={p50:6.1f} ms  p95={p95:6.1f} ms"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el handler WSGI (hilos, como gunicorn gthread) contra el ASGI (un event loop, "
+        "como un worker de uvicorn) con muchas apps pidiendo su agenda a la vez y boleterías "
+        "mirando la grilla. Corre en una base de prueba que se crea y se borra. Es una prueba "
+        "en proceso: para números de producción, repetir con gunicorn/uvicorn y un generador de carga."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--instructores", type=int, default=40)
+        parser.add_argument("--concurrentes", type=int, default=100, help="Apps pidiendo a la vez.")
+        parser.add_argument("--pedidos", type=int, default=5, help="Pedidos por app.")
+        parser.add_argument("--hilos", type=int, default=8, help="Hilos del worker WSGI.")
+
+    def handle(self, *args, **opts):
+        nombre_original = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                self._correr(opts)
+        finally:
+            connection.creation.destroy_test_db(nombre_original, verbosity=0)
+
+    def _correr(self, opts):
+        cabeceras, cookies = self._poblar(opts)
+        for vista, url, cabeceras_vista, cookies_vista in (
+            ("app instructor (JWT)", "/api/instructor/clases/", cabeceras, None),
+            ("grilla boletería (sesión)", "/clases/del_dia/", None, cookies),
+        ):
+            self.stdout.write(f"\n{vista}: {opts['concurrentes']} clientes x {opts['pedidos']} pedidos")
+            self.stdout.write(self._wsgi(url, cabeceras_vista, cookies_vista, opts))
+            self.stdout.write(asyncio.run(self._asgi(url, cabeceras_vista, cookies_vista, opts)))
+
+    def _poblar(self, opts):
+        hoy = localdate()
+        centro = CentroDeEsqui.objects.create(nombre_centro="bench", ubicacion="bench")
+        for tipo in ("instructor", "boleteria"):
+            Identificador.objects.get_or_create(tipo_de_usuario=tipo)
+        clave = make_password("clave-turno")
+        instructores = Usuario.objects.bulk_create([
+            Usuario(rut_usuario=f"bench-{i}", nombre="Bench", apellido=str(i),
+                    correo=f"bench-{i}@bench.cl", contraseña=clave,
+                    tipo_de_usuario_id="instructor", id_centro=centro)
+            for i in range(opts["instructores"])
+        ])
+        Usuario.objects.create(rut_usuario="bench-bol", nombre="Bench", apellido="Bol",
+                               correo="bol@bench.cl", contraseña=clave,
+                               tipo_de_usuario_id="boleteria", id_centro=centro)
+        EstadoInstructor.objects.bulk_create([
+            EstadoInstructor(instructor=inst, id_centro=centro, fecha=hoy, activo=True) for inst in instructores
+        ])
+        inicio_dia, _ = limites_del_dia(hoy)
+        Clase.objects.bulk_create([
+            Clase(nombre_titular="bench", titular_telefono="0", nivel_clase=1, disciplina_clase="ski",
+                  hora_inicio=inicio_dia + timedelta(hours=9 + b), hora_fin=inicio_dia + timedelta(hours=10 + b),
+                  duracion=60, cantidad_alumnos=1, rut_usuario=inst, id_centro=centro)
+            for inst in instructores for b in range(0, 8, 2)
+        ])
+
+        user = User.objects.create(username="bench-0@bench.cl")
+        tokens = tokens_para_usuario(instructores[0], user)
+        cabeceras = {"Authorization": f"Bearer {tokens['access']}"}
+
+        cliente = Client()
+        r = cliente.post("/login/", {"username": "bol@bench.cl", "password": "clave-turno"})
+        assert r.status_code == 302, r.status_code
+        return cabeceras, cliente.cookies
+
+    def _wsgi(self, url, cabeceras, cookies, opts):
+        def app(_):
+            cliente = Client()
+            if cookies:
+                cliente.cookies = cookies
+            tiempos = []
+            for _ in range(opts["pedidos"]):
+                t = perf_counter()
+                r = cliente.get(url, headers=cabeceras)
+                tiempos.append(perf_counter() - t)
+                assert r.status_code == 200, r.status_code
+            return tiempos
+
+        t = perf_counter()
+        with ThreadPoolExecutor(opts["hilos"]) as ex:
+            tiempos = [x for lista in ex.map(app, range(opts["concurrentes"])) for x in lista]
+        return _resumen(f"WSGI ({opts['hilos']} hilos)", tiempos, perf_counter() - t)
+
+    async def _asgi(self, url, cabeceras, cookies, opts):
+        async def app():
+            cliente = AsyncClient()
+            if cookies:
+                cliente.cookies = cookies
+            tiempos = []
+            for _ in range(opts["pedidos"]):
+                t = perf_counter()
+                r = await cliente.get(url, headers=cabeceras)
+                tiempos.append(perf_counter() - t)
+                assert r.status_code == 200, r.status_code
+            return tiempos
+
+        t = perf_counter()
+        resultados = await asyncio.gather(*(app() for _ in range(opts["concurrentes"])))
+        tiempos = [x for lista in resultados for x in lista]
+        return _resumen("ASGI (1 event loop)", tiempos, perf_counter() - t)
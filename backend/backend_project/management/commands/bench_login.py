@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, get_hasher
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+
+from centros.models import CentroDeEsqui
+from backend_project.throttling import limpiar_fallos
+from usuarios.models import Usuario, Identificador
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el login al inicio de turno: verificación de claves en paralelo (PBKDF2 por "
+        "defecto contra el scrypt configurado) y el login completo por /login/, primero con "
+        "hashes viejos (se regeneran) y después ya regenerados. Los datos se revierten al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--usuarios", type=int, default=40)
+        parser.add_argument("--hilos", type=int, default=8, help="Logins simultáneos en la prueba de hashes.")
+
+    def handle(self, *args, **opts):
+        self._hashes_en_paralelo(opts)
+        try:
+            with transaction.atomic():
+                self._login_completo(opts)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _hashes_en_paralelo(self, opts):
+        n = opts["usuarios"]
+        # hashlib libera el GIL, así que los hilos compiten por CPU como lo harían los workers
+        for nombre, hasher in (("pbkdf2 (defecto)", PBKDF2PasswordHasher()), ("preferido", get_hasher())):
+            codificado = hasher.encode("clave-turno", hasher.salt())
+            t = perf_counter()
+            with ThreadPoolExecutor(opts["hilos"]) as ex:
+                ok = list(ex.map(lambda _: check_password("clave-turno", codificado), range(n)))
+            total = perf_counter() - t
+            assert all(ok)
+            self.stdout.write(
+                f"{nombre:<17} {hasher.algorithm:<14} {n / total:7.1f} verificaciones/s "
+                f"con {opts['hilos']} hilos"
+            )
+
+    def _login_completo(self, opts):
+        centro = CentroDeEsqui.objects.create(nombre_centro="bench", ubicacion="bench")
+        tipo, _ = Identificador.objects.get_or_create(tipo_de_usuario="boleteria")
+        viejo = PBKDF2PasswordHasher().encode("clave-turno", PBKDF2PasswordHasher().salt())
+        Usuario.objects.bulk_create([
+            Usuario(rut_usuario=f"bench-{i}", nombre="Bench", apellido=str(i),
+                    correo=f"bench-{i}@bench.cl", contraseña=viejo,
+                    tipo_de_usuario=tipo, id_centro=centro)
+            for i in range(opts["usuarios"])
+        ])
+
+        cliente = Client(SERVER_NAME="localhost")
+        for vuelta in ("hash viejo (se regenera)", "hash regenerado"):
+            t = perf_counter()
+            for i in range(opts["usuarios"]):
+                r = cliente.post("/login/", {"username": f"BENCH-{i}@bench.cl ", "password": "clave-turno"})
+                assert r.status_code == 302, r.status_code
+            total = perf_counter() - t
+            self.stdout.write(f"login completo, {vuelta}: {opts['usuarios'] / total:.1f} logins/s")
+
+        hashes = Usuario.objects.filter(id_centro=centro).values_list("contraseña", flat=True)
+        self.stdout.write(f"algoritmos guardados: {sorted({h.split('$')[0] for h in hashes})}")
+
+        # bloqueo por intentos fallidos
+        codigos = [
+            cliente.post("/login/", {"username": "bench-0@bench.cl", "password": "mala"}).status_code
+            for _ in range(7)
+        ]
+        limpiar_fallos("bench-0@bench.cl", "127.0.0.1")
+        self.stdout.write(f"intentos fallidos seguidos -> {codigos}")
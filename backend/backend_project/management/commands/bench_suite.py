@@ -0,0 +1,281 @@
+import json
+import platform
+import subprocess
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+from time import perf_counter
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min
+from django.test import Client, override_settings
+from django.utils.timezone import now
+
+from api.authentication import tokens_para_usuario
+from centros.models import CentroDeEsqui
+from clases.models import Clase
+from director.models import EstadoInstructor
+from usuarios.models import Usuario
+from .generar_temporada import PREFIJO_CENTRO, PREFIJO_RUT
+
+# Pedidos extra por escenario que se repiten con tracemalloc para la memoria pico
+# (aparte de los medidos: tracemalloc hace más lento cada pedido).
+PEDIDOS_MEMORIA = 3
+
+
+def _percentil(ordenados, p):
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Suite de rendimiento: recorre dashboard, grilla de boletería, crear_clase, "
+        "asistencia, reportes y la API del instructor con el cliente de pruebas de Django "
+        "sobre una temporada sintética (generar_temporada), y reporta p50/p95, consultas "
+        "y memoria pico por escenario. Guarda el resultado en JSON (--salida) para "
+        "comparar entre commits (--comparar). Por defecto crea una base de prueba, la "
+        "puebla con --semilla y la borra al final; --base-actual usa la base configurada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-actual", action="store_true",
+                            help="No crear base de prueba: usar la temporada ya generada en la base configurada.")
+        parser.add_argument("--centros", type=int, default=2)
+        parser.add_argument("--instructores", type=int, default=150, help="Instructores por centro.")
+        parser.add_argument("--dias", type=int, default=30)
+        parser.add_argument("--semilla", type=int, default=1)
+        parser.add_argument("--repeticiones", type=int, default=30, help="Pedidos medidos por escenario.")
+        parser.add_argument("--salida", default=None,
+                            help="Archivo JSON (por defecto bench_resultados/<fecha>-<commit>.json).")
+        parser.add_argument("--comparar", default=None, help="JSON de una corrida anterior para mostrar diferencias.")
+
+    def handle(self, *args, **opts):
+        if opts["base_actual"]:
+            resultado = self._correr_con_hosts(opts)
+        else:
+            nombre_original = connection.settings_dict["NAME"]
+            connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                call_command(
+                    "generar_temporada", centros=opts["centros"], instructores=opts["instructores"],
+                    dias=opts["dias"], semilla=opts["semilla"], stdout=self.stdout,
+                )
+                resultado = self._correr_con_hosts(opts)
+            finally:
+                connection.creation.destroy_test_db(nombre_original, verbosity=0)
+
+        salida = Path(opts["salida"] or Path(settings.BASE_DIR) / "bench_resultados" / (
+            f"{resultado['fecha'][:19].replace(':', '')}-{resultado['commit'] or 'sin-git'}.json"
+        ))
+        salida.parent.mkdir(parents=True, exist_ok=True)
+        salida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+        self.stdout.write(self.style.SUCCESS(f"\nResultados en {salida}"))
+
+        if opts["comparar"]:
+            self._comparar(json.loads(Path(opts["comparar"]).read_text(encoding="utf-8")), resultado)
+
+    def _correr_con_hosts(self, opts):
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            return self._correr(opts)
+
+    # ---------- escenarios ----------
+
+    def _correr(self, opts):
+        centro = CentroDeEsqui.objects.filter(nombre_centro__startswith=PREFIJO_CENTRO).order_by("pk").first()
+        if centro is None:
+            raise CommandError("No hay temporada sintética en la base: correr generar_temporada primero.")
+        n = int(centro.nombre_centro.rsplit(" ", 1)[1])
+        director = Usuario.objects.get(rut_usuario=f"{PREFIJO_RUT}{n}-dir")
+        boleteria = Usuario.objects.get(rut_usuario=f"{PREFIJO_RUT}{n}-bol")
+
+        rango = EstadoInstructor.objects.filter(instructor__id_centro=centro).aggregate(
+            desde=Min("fecha"), hasta=Max("fecha"),
+        )
+        fechas = [rango["desde"] + timedelta(days=d) for d in range((rango["hasta"] - rango["desde"]).days + 1)]
+        medio = fechas[len(fechas) // 2]
+
+        cli_director = self._cliente(director)
+        cli_boleteria = self._cliente(boleteria)
+        instructor = (
+            Usuario.objects.filter(id_centro=centro, tipo_de_usuario_id="instructor")
+            .order_by("rut_usuario").first()
+        )
+        if instructor.user_id is None:
+            instructor.user = User.objects.create(username=f"bench-{instructor.rut_usuario}")
+            instructor.save(update_fields=["user"])
+        jwt = {"Authorization": f"Bearer {tokens_para_usuario(instructor, instructor.user)['access']}"}
+
+        # (rut, fecha) activos para crear clases al cierre, donde la temporada no pone clases
+        activos = list(
+            EstadoInstructor.objects.filter(instructor__id_centro=centro, activo=True, fecha__in=fechas)
+            .select_related("instructor").order_by("fecha", "instructor_id")
+            .values_list("instructor_id", "fecha", "instructor__disciplina")[: opts["repeticiones"] + PEDIDOS_MEMORIA]
+        )
+        plantel = list(
+            Usuario.objects.filter(id_centro=centro, tipo_de_usuario_id="instructor")
+            .order_by("rut_usuario").values_list("rut_usuario", "disciplina")
+        )
+        activos_del_dia = {
+            f: list(
+                EstadoInstructor.objects.filter(instructor__id_centro=centro, fecha=f, activo=True)
+                .values_list("instructor_id", flat=True)
+            )
+            for f in fechas
+        }
+
+        def fecha(i):
+            return fechas[i % len(fechas)]
+
+        def frio(pedido):
+            def hacer(i):
+                cache.clear()
+                return pedido(i)
+            return hacer
+
+        def crear(i):
+            rut, dia, disciplina = activos[i % len(activos)]
+            return cli_boleteria.post("/clases/crear/", {
+                "fecha": dia.isoformat(), "disciplina_clase": "snow" if disciplina == "snow" else "ski",
+                "nombre_titular": "Bench", "titular_telefono": "0", "nivel_clase": 1,
+                "hora_sola": "17:00", "duracion": 30, "cantidad_alumnos": 1, "rut_usuario": rut,
+            })
+
+        def paquete(i):
+            # 5 días seguidos a las 17:30 (después de crear_clase), un instructor por pedido
+            rut, disciplina = plantel[i % len(plantel)]
+            cuerpo = {
+                "comun": {
+                    "hora_sola": "17:30", "duracion": 30, "rut_usuario": rut, "nivel_clase": 1,
+                    "disciplina_clase": "snow" if disciplina == "snow" else "ski",
+                    "nombre_titular": "Bench paquete", "titular_telefono": "0", "cantidad_alumnos": 1,
+                },
+                "reservas": [{"fecha": f.isoformat()} for f in fechas[:5]],
+            }
+            return cli_boleteria.post("/clases/reservas/", json.dumps(cuerpo), content_type="application/json")
+
+        def asistencia(i):
+            dia = fecha(i)
+            return cli_director.post("/director/asistencia/", {
+                "fecha": dia.isoformat(), "activos": activos_del_dia[dia],
+            })
+
+        escenarios = {
+            "dashboard (página)": lambda i: cli_director.get(f"/director/dashboard/?fecha={fecha(i)}"),
+            "dashboard json (cache frío)": frio(lambda i: cli_director.get(f"/director/dashboard/json/?fecha={fecha(i)}")),
+            "dashboard json (cache)": lambda i: cli_director.get(f"/director/dashboard/json/?fecha={medio}"),
+            "grilla boletería (cache frío)": frio(lambda i: cli_boleteria.get(f"/clases/del_dia/?fecha={fecha(i)}")),
+            "grilla boletería (cache)": lambda i: cli_boleteria.get(f"/clases/del_dia/?fecha={medio}"),
+            "crear_clase": crear,
+            "reserva paquete 5 días": paquete,
+            "asistencia del día": asistencia,
+            "reportes (todos, mes)": lambda i: cli_director.get(f"/director/reportes/?inst=todos&mes={medio:%Y-%m}"),
+            "reportes (un instructor)": lambda i: cli_director.get(
+                f"/director/reportes/?inst={instructor.rut_usuario}&mes={medio:%Y-%m}"
+            ),
+            "api instructor día": lambda i: cli_director.get(
+                f"/api/instructor/clases/?fecha={fecha(i)}", headers=jwt
+            ),
+            "api instructor rango (7 días)": lambda i: cli_director.get(
+                f"/api/instructor/clases/rango/?desde={fecha(i)}&hasta={fecha(i) + timedelta(days=6)}", headers=jwt
+            ),
+            "api instructor sync (completa)": lambda i: cli_director.get("/api/instructor/clases/sync/", headers=jwt),
+        }
+
+        resultados = {}
+        for nombre, pedido in escenarios.items():
+            resultados[nombre] = self._medir(pedido, opts["repeticiones"])
+            r = resultados[nombre]
+            self.stdout.write(
+                f"{nombre:<32} p50={r['p50_ms']:7.1f} ms  p95={r['p95_ms']:7.1f} ms  "
+                f"consultas={r['consultas_promedio']:5.1f} (máx {r['consultas_max']})  "
+                f"memoria={r['memoria_pico_kb']:8.0f} KB  {r['estados']}"
+            )
+        resultados["crear_clase"]["clases_creadas"] = Clase.objects.filter(nombre_titular="Bench").count()
+        resultados["reserva paquete 5 días"]["clases_creadas"] = Clase.objects.filter(nombre_titular="Bench paquete").count()
+
+        return {
+            "fecha": now().isoformat(),
+            "commit": _commit(),
+            "entorno": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "base": connection.vendor,
+                "cache": settings.CACHES["default"]["BACKEND"],
+            },
+            "datos": {
+                "centros": CentroDeEsqui.objects.filter(nombre_centro__startswith=PREFIJO_CENTRO).count(),
+                "instructores": Usuario.objects.filter(tipo_de_usuario_id="instructor").count(),
+                "clases": Clase.objects.count(),
+                "estados": EstadoInstructor.objects.count(),
+                "dias": len(fechas),
+            },
+            "parametros": {k: opts[k] for k in ("repeticiones", "semilla", "base_actual")},
+            "escenarios": resultados,
+        }
+
+    def _cliente(self, usuario):
+        """Cliente con la sesión que deja login_view (sin pasar por el hash de la contraseña)."""
+        cliente = Client()
+        session = cliente.session
+        session["usuario_id"] = usuario.rut_usuario
+        session["nombre"] = usuario.nombre
+        session["tipo"] = usuario.tipo_de_usuario_id
+        session.save()
+        return cliente
+
+    def _medir(self, pedido, repeticiones):
+        tiempos, consultas, estados = [], [], {}
+        for i in range(repeticiones):
+            t = perf_counter()
+            r = pedido(i)
+            tiempos.append((perf_counter() - t) * 1000)
+            consultas.append(r.metricas.consultas)
+            estados[str(r.status_code)] = estados.get(str(r.status_code), 0) + 1
+
+        pico = 0
+        for i in range(repeticiones, repeticiones + PEDIDOS_MEMORIA):
+            tracemalloc.start()
+            pedido(i)
+            pico = max(pico, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        tiempos.sort()
+        return {
+            "pedidos": repeticiones,
+            "p50_ms": round(_percentil(tiempos, 0.5), 2),
+            "p95_ms": round(_percentil(tiempos, 0.95), 2),
+            "max_ms": round(tiempos[-1], 2),
+            "consultas_promedio": round(sum(consultas) / len(consultas), 2),
+            "consultas_max": max(consultas),
+            "memoria_pico_kb": round(pico / 1024, 1),
+            "estados": estados,
+        }
+
+    def _comparar(self, anterior, actual):
+        self.stdout.write(f"\nComparado con {anterior.get('commit')} ({anterior.get('fecha', '')[:19]}):")
+        for nombre, r in actual["escenarios"].items():
+            a = anterior.get("escenarios", {}).get(nombre)
+            if a is None:
+                self.stdout.write(f"{nombre:<32} (nuevo)")
+                continue
+            self.stdout.write(
+                f"{nombre:<32} p50 {a['p50_ms']:7.1f} -> {r['p50_ms']:7.1f} ms  "
+                f"p95 {a['p95_ms']:7.1f} -> {r['p95_ms']:7.1f} ms  "
+                f"consultas {a['consultas_promedio']:5.1f} -> {r['consultas_promedio']:5.1f}"
+            )
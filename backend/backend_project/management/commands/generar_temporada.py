@@ -0,0 +1,162 @@
+import random
+from datetime import date, datetime, timedelta, time as dtime
+from time import perf_counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import localdate, make_aware, get_current_timezone
+
+from centros.models import CentroDeEsqui
+from clases import cache_grilla, resumen
+from clases.models import Clase
+from director.models import EstadoInstructor
+from usuarios.models import Usuario, Identificador
+
+PREFIJO_CENTRO = "Temporada sim"
+PREFIJO_RUT = "sim-"
+
+DISCIPLINAS = ["ski"] * 5 + ["snow"] * 3 + ["ambos"] * 2
+IDIOMAS = ["español"] * 6 + ["español, inglés"] * 3 + ["español, portugués", "español, inglés y portugués"]
+DURACIONES = [60, 60, 90, 120]
+PAUSAS = [0, 0, 0, 30, 60]  # minutos libres antes de cada clase
+
+APERTURA = dtime(9, 0)
+CIERRE = dtime(17, 0)
+
+
+def rut_instructor(centro_n, i):
+    return f"{PREFIJO_RUT}{centro_n}-{i:04d}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera una temporada sintética y reproducible (misma --semilla, mismos datos): "
+        "varios centros, cientos de instructores, asistencia de cada día y cientos de "
+        "miles de clases sin solapes. Escribe en la base configurada; para no mezclar "
+        "con datos reales usar otra base (SQLITE_PATH / DB_PERFIL). Cada centro queda "
+        "con un director sim-<n>-dir y una boletería sim-<n>-bol (correo "
+        "sim-<n>-dir@temporada.cl, clave --clave)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--centros", type=int, default=3)
+        parser.add_argument("--instructores", type=int, default=300, help="Instructores por centro.")
+        parser.add_argument("--dias", type=int, default=120, help="Largo de la temporada.")
+        parser.add_argument("--desde", type=date.fromisoformat, default=None,
+                            help="Primer día (YYYY-MM-DD). Por defecto la temporada queda centrada en hoy.")
+        parser.add_argument("--asistencia", type=float, default=0.85,
+                            help="Probabilidad de que un instructor esté activo un día.")
+        parser.add_argument("--max-clases", type=int, default=5, help="Máximo de clases por instructor y día.")
+        parser.add_argument("--clave", default="temporada")
+        parser.add_argument("--semilla", type=int, default=1)
+        parser.add_argument("--lote", type=int, default=5000, help="Filas por bulk_create.")
+
+    def handle(self, *args, **opts):
+        if Usuario.objects.filter(rut_usuario__startswith=PREFIJO_RUT).exists():
+            raise CommandError(
+                "Ya hay una temporada sintética en esta base. Usa una base nueva "
+                "(ej: SQLITE_PATH=/tmp/temporada.sqlite3 python manage.py migrate)."
+            )
+
+        rnd = random.Random(opts["semilla"])
+        desde = opts["desde"] or localdate() - timedelta(days=opts["dias"] // 2)
+        hasta = desde + timedelta(days=opts["dias"] - 1)
+        t0 = perf_counter()
+
+        with transaction.atomic():
+            centros = self._usuarios(rnd, opts)
+            estados, clases = self._temporada(rnd, opts, centros, desde)
+
+        self.stdout.write("Rearmando resumen diario de instructores...")
+        resumen.reconstruir(desde, hasta)
+        for centro, _insts in centros:
+            cache_grilla.invalidar_centro(centro.pk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Temporada {desde} a {hasta}: {len(centros)} centros, "
+            f"{len(centros) * opts['instructores']} instructores, {estados} estados, "
+            f"{clases} clases en {perf_counter() - t0:.1f}s"
+        ))
+
+    def _usuarios(self, rnd, opts):
+        for tipo in ("instructor", "boleteria", "director", "jefe_centro"):
+            Identificador.objects.get_or_create(tipo_de_usuario=tipo)
+        clave = make_password(opts["clave"])  # un solo hash para todos
+
+        centros = []
+        for n in range(1, opts["centros"] + 1):
+            centro = CentroDeEsqui.objects.create(
+                nombre_centro=f"{PREFIJO_CENTRO} {n}", ubicacion="sintético",
+                hora_apertura=APERTURA, hora_cierre=CIERRE, minutos_bloque=30,
+            )
+            personal = [
+                Usuario(rut_usuario=f"{PREFIJO_RUT}{n}-{rol}", nombre=nombre, apellido=f"Sim {n}",
+                        correo=f"{PREFIJO_RUT}{n}-{rol}@temporada.cl", contraseña=clave,
+                        tipo_de_usuario_id=tipo, id_centro=centro)
+                for rol, nombre, tipo in (("dir", "Director", "director"), ("bol", "Boletería", "boleteria"))
+            ]
+            instructores = [
+                Usuario(rut_usuario=rut_instructor(n, i), nombre=f"Instructor {i}", apellido=f"Sim {n}-{i:04d}",
+                        correo=f"{rut_instructor(n, i)}@temporada.cl", contraseña=clave,
+                        tipo_de_usuario_id="instructor", id_centro=centro,
+                        edad=rnd.randint(18, 60), disciplina=rnd.choice(DISCIPLINAS),
+                        nivel_instructor=rnd.randint(1, 3), idioma=rnd.choice(IDIOMAS))
+                for i in range(opts["instructores"])
+            ]
+            Usuario.objects.bulk_create(personal + instructores, batch_size=opts["lote"])
+            centros.append((centro, instructores))
+        return centros
+
+    def _temporada(self, rnd, opts, centros, desde):
+        tz = get_current_timezone()
+        minutos_apertura = APERTURA.hour * 60 + APERTURA.minute
+        minutos_cierre = CIERRE.hour * 60 + CIERRE.minute
+        estados, clases = [], []
+        total_estados = total_clases = 0
+
+        def vaciar(forzar=False):
+            nonlocal estados, clases, total_estados, total_clases
+            if forzar or len(estados) >= opts["lote"]:
+                EstadoInstructor.objects.bulk_create(estados, batch_size=opts["lote"])
+                total_estados += len(estados)
+                estados = []
+            if forzar or len(clases) >= opts["lote"]:
+                Clase.objects.bulk_create(clases, batch_size=opts["lote"])
+                total_clases += len(clases)
+                clases = []
+
+        for d in range(opts["dias"]):
+            fecha = desde + timedelta(days=d)
+            apertura = make_aware(datetime.combine(fecha, APERTURA), timezone=tz)
+            for centro, instructores in centros:
+                for inst in instructores:
+                    activo = rnd.random() < opts["asistencia"]
+                    estados.append(EstadoInstructor(instructor=inst, id_centro=centro, fecha=fecha, activo=activo))
+                    if not activo:
+                        continue
+
+                    # clases seguidas, sin solape, dentro del horario del centro
+                    minuto = minutos_apertura
+                    for _ in range(rnd.randint(0, opts["max_clases"])):
+                        minuto += rnd.choice(PAUSAS)
+                        duracion = rnd.choice(DURACIONES)
+                        if minuto + duracion > minutos_cierre:
+                            break
+                        inicio = apertura + timedelta(minutes=minuto - minutos_apertura)
+                        disciplina = inst.disciplina if inst.disciplina != "ambos" else rnd.choice(["ski", "snow"])
+                        clases.append(Clase(
+                            nombre_titular=f"Titular {rnd.randint(1, 99999)}",
+                            titular_telefono=f"+569{rnd.randint(10000000, 99999999)}",
+                            nivel_clase=rnd.randint(1, inst.nivel_instructor),
+                            disciplina_clase=disciplina,
+                            hora_inicio=inicio, hora_fin=inicio + timedelta(minutes=duracion),
+                            duracion=duracion, cantidad_alumnos=rnd.randint(1, 6),
+                            rut_usuario=inst, id_centro=centro,
+                        ))
+                        minuto += duracion
+                    vaciar()
+            if (d + 1) % 10 == 0:
+                self.stdout.write(f"  {d + 1}/{opts['dias']} días")
+        vaciar(forzar=True)
+        return total_estados, total_clases
@@ -0,0 +1,236 @@
+import logging
+import threading
+from collections import deque
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+# Métricas por request: cantidad de consultas SQL, tiempo en la base, tiempo
+# renderizando plantillas y latencia total. La medición del request en curso va
+# en una ContextVar, así que también cuenta las consultas que el ORM async corre
+# en su hilo (asgiref copia el contexto al pasar a sync_to_async).
+#
+# Los acumulados por vista son del proceso (cada worker tiene los suyos): se
+# consultan en director/metricas/ y se reinician al reiniciar el servidor.
+
+# Latencias que se guardan por vista para calcular p50/p95
+MUESTRAS_POR_VISTA = 500
+
+_actual = ContextVar("metricas_request", default=None)
+
+
+class Medicion:
+    __slots__ = ("consultas", "ms_db", "ms_plantillas")
+
+    def __init__(self):
+        self.consultas = 0
+        self.ms_db = 0.0
+        self.ms_plantillas = 0.0
+
+
+def _medir_consulta(execute, sql, params, many, context):
+    medicion = _actual.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    t = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicion.consultas += 1
+        medicion.ms_db += (perf_counter() - t) * 1000
+
+
+def _instalar(conexion):
+    if _medir_consulta not in conexion.execute_wrappers:
+        conexion.execute_wrappers.append(_medir_consulta)
+
+
+def _al_conectar(sender, connection, **kwargs):
+    _instalar(connection)
+
+
+# Conexiones nuevas (de cualquier hilo) quedan medidas desde que se abren
+connection_created.connect(_al_conectar, dispatch_uid="metricas_consultas")
+
+
+class PlantillasMedidas(DjangoTemplates):
+    """
+    Backend de plantillas de Django que suma el tiempo de render a la medición
+    del request. Solo mide el render de nivel superior (los include y extends
+    van dentro), así no se cuenta dos veces.
+    """
+
+    def get_template(self, template_name):
+        return _PlantillaMedida(super().get_template(template_name))
+
+    def from_string(self, template_code):
+        return _PlantillaMedida(super().from_string(template_code))
+
+
+class _PlantillaMedida:
+    def __init__(self, plantilla):
+        self._plantilla = plantilla
+
+    def __getattr__(self, nombre):
+        return getattr(self._plantilla, nombre)
+
+    def render(self, context=None, request=None):
+        medicion = _actual.get()
+        t = perf_counter()
+        try:
+            return self._plantilla.render(context, request)
+        finally:
+            if medicion is not None:
+                medicion.ms_plantillas += (perf_counter() - t) * 1000
+
+
+# ---------- acumulados por vista ----------
+
+_lock = threading.Lock()
+_por_vista = {}
+
+
+def _registrar(vista, medicion, ms_total):
+    with _lock:
+        datos = _por_vista.get(vista)
+        if datos is None:
+            datos = _por_vista[vista] = {
+                "requests": 0, "consultas": 0, "max_consultas": 0,
+                "ms_db": 0.0, "ms_plantillas": 0.0, "ms_total": 0.0,
+                "latencias": deque(maxlen=MUESTRAS_POR_VISTA),
+            }
+        datos["requests"] += 1
+        datos["consultas"] += medicion.consultas
+        datos["max_consultas"] = max(datos["max_consultas"], medicion.consultas)
+        datos["ms_db"] += medicion.ms_db
+        datos["ms_plantillas"] += medicion.ms_plantillas
+        datos["ms_total"] += ms_total
+        datos["latencias"].append(ms_total)
+
+
+def _percentil(ordenadas, p):
+    return round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))], 2)
+
+
+def estadisticas():
+    """{vista: promedios, p50/p95 de latencia y presupuesto} del proceso actual."""
+    presupuestos = getattr(settings, "PRESUPUESTO_CONSULTAS", {})
+    with _lock:
+        copia = {v: {**d, "latencias": sorted(d["latencias"])} for v, d in _por_vista.items()}
+
+    resultado = {}
+    for vista, d in sorted(copia.items()):
+        n = d["requests"]
+        resultado[vista] = {
+            "requests": n,
+            "consultas_promedio": round(d["consultas"] / n, 2),
+            "consultas_max": d["max_consultas"],
+            "presupuesto_consultas": presupuestos.get(vista),
+            "ms_db_promedio": round(d["ms_db"] / n, 2),
+            "ms_plantillas_promedio": round(d["ms_plantillas"] / n, 2),
+            "ms_total_promedio": round(d["ms_total"] / n, 2),
+            "ms_total_p50": _percentil(d["latencias"], 0.5),
+            "ms_total_p95": _percentil(d["latencias"], 0.95),
+        }
+    return resultado
+
+
+def reiniciar():
+    with _lock:
+        _por_vista.clear()
+
+
+# ---------- middleware ----------
+
+def _nombre_vista(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+    return match.view_name or match._func_path
+
+
+def _iniciar():
+    # la conexión del hilo actual puede venir de antes de cargar este módulo
+    for conexion in connections.all(initialized_only=True):
+        _instalar(conexion)
+    medicion = Medicion()
+    return medicion, _actual.set(medicion), perf_counter()
+
+
+def _terminar(request, response, medicion, inicio):
+    ms_total = (perf_counter() - inicio) * 1000
+    vista = _nombre_vista(request)
+
+    # para que los tests puedan revisar presupuestos (ver asertar_presupuesto)
+    response.metricas = medicion
+    response.vista = vista
+
+    if getattr(settings, "METRICAS_SERVER_TIMING", False):
+        response["Server-Timing"] = (
+            f'db;dur={medicion.ms_db:.1f};desc="{medicion.consultas} consultas", '
+            f"tpl;dur={medicion.ms_plantillas:.1f}, "
+            f"total;dur={ms_total:.1f}"
+        )
+
+    if vista is None:
+        return response
+    _registrar(vista, medicion, ms_total)
+
+    presupuesto = getattr(settings, "PRESUPUESTO_CONSULTAS", {}).get(vista)
+    if presupuesto is not None and medicion.consultas > presupuesto:
+        logger.warning(
+            "%s hizo %d consultas (presupuesto %d)", vista, medicion.consultas, presupuesto
+        )
+    return response
+
+
+@sync_and_async_middleware
+def MetricasMiddleware(get_response):
+    """
+    Mide cada request (consultas, tiempo de base, plantillas y total), lo suma a
+    los acumulados de la vista, agrega la cabecera Server-Timing si
+    METRICAS_SERVER_TIMING está activo y avisa en el log cuando una vista pasa
+    su presupuesto de PRESUPUESTO_CONSULTAS. Va primero en MIDDLEWARE.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            medicion, token, inicio = _iniciar()
+            try:
+                response = await get_response(request)
+            finally:
+                _actual.reset(token)
+            return _terminar(request, response, medicion, inicio)
+
+        return middleware
+
+    def middleware(request):
+        medicion, token, inicio = _iniciar()
+        try:
+            response = get_response(request)
+        finally:
+            _actual.reset(token)
+        return _terminar(request, response, medicion, inicio)
+
+    return middleware
+
+
+def asertar_presupuesto(testcase, response):
+    """
+    Para tests: falla si la vista que respondió hizo más consultas que su
+    presupuesto en settings.PRESUPUESTO_CONSULTAS (o si no tiene presupuesto).
+    """
+    vista = getattr(response, "vista", None)
+    presupuesto = getattr(settings, "PRESUPUESTO_CONSULTAS", {}).get(vista)
+    testcase.assertIsNotNone(presupuesto, f"La vista {vista!r} no tiene presupuesto de consultas.")
+    testcase.assertLessEqual(
+        response.metricas.consultas, presupuesto,
+        f"{vista} hizo {response.metricas.consultas} consultas (presupuesto {presupuesto}).",
+    )
@@ -0,0 +1,27 @@
+from asgiref.sync import iscoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.functional import SimpleLazyObject
+
+from .utils import cargar_usuario_sesion
+
+
+@sync_and_async_middleware
+def UsuarioSesionMiddleware(get_response):
+    """
+    Deja en request.usuario el Usuario de la sesión (con id_centro y tipo_de_usuario).
+    Es perezoso y se resuelve una sola vez: role_required, centro_del_sesion y las
+    vistas comparten la misma consulta. Bajo ASGI no obliga a pasar a hilo: las
+    vistas async usan ausuario_actual en vez de request.usuario.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            request.usuario = SimpleLazyObject(lambda: cargar_usuario_sesion(request))
+            return await get_response(request)
+
+        return middleware
+
+    def middleware(request):
+        request.usuario = SimpleLazyObject(lambda: cargar_usuario_sesion(request))
+        return get_response(request)
+
+    return middleware
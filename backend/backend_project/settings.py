@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -56,22 +57,55 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'backend_project.metricas.MetricasMiddleware',  # primero: mide el request completo
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'backend_project.middleware.UsuarioSesionMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
 ]
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Segundos que se cachea el Usuario de la sesión entre requests (0 = sin cache,
+# una consulta por request). Se invalida al guardar/borrar el Usuario.
+USUARIO_SESION_CACHE_SEGUNDOS = 30
+
+# Métricas por request (backend_project/metricas.py). Server-Timing muestra en las
+# herramientas del navegador las consultas y tiempos de cada respuesta; como eso
+# queda a la vista de cualquier cliente, por defecto solo va con DEBUG
+# (METRICAS_SERVER_TIMING=1 lo activa en un despliegue para perfilar).
+METRICAS_SERVER_TIMING = os.environ.get('METRICAS_SERVER_TIMING', '1' if DEBUG else '0') == '1'
+
+# Máximo de consultas SQL por vista (nombre de la URL). Pasarse deja un aviso en el
+# log y hace fallar los tests de presupuesto (director/tests.py, clases/tests.py).
+PRESUPUESTO_CONSULTAS = {
+    # sesión + usuario de la sesión + lo propio de cada vista (grillas sin cache)
+    'director_dashboard': 2,
+    'director_dashboard_json': 5,
+    'director_reportes': 6,
+    'director_historial': 4,
+    'director_historial_json': 4,
+    'clases_del_dia': 5,
+    'sugerir_instructor': 4,
+    'horarios_libres': 4,
+    # validación + insert del lote + grilla/resumen, con sus savepoints; no crece con el lote
+    'reservar_clases': 14,
+    # API del instructor (JWT: sin sesión)
+    'clases_instructor_dia': 3,
+    'clases_instructor_sync': 3,
+    'clases_instructor_rango': 3,
+}
+
 ROOT_URLCONF = 'backend_project.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates que además mide el tiempo de render (backend_project/metricas.py)
+        'BACKEND': 'backend_project.metricas.PlantillasMedidas',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -90,10 +124,69 @@ WSGI_APPLICATION = 'backend_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# Perfil elegido con DB_PERFIL:
+#   sqlite   (defecto) un solo servidor; WAL deja leer mientras otro escribe
+#   postgres producción con varios centros escribiendo a la vez
+# Ver scripts/test_matrix.sh para correr los tests contra ambos.
+DB_PERFIL = os.environ.get('DB_PERFIL', 'sqlite')
+
+if DB_PERFIL == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'escuela_nieve'),
+            'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        }
+    }
+    if os.environ.get('POSTGRES_POOL', '1') == '1':
+        # pool de psycopg 3 dentro de cada proceso; Django exige CONN_MAX_AGE = 0 con pool
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': int(os.environ.get('POSTGRES_POOL_MIN', '2')),
+                'max_size': int(os.environ.get('POSTGRES_POOL_MAX', '10')),
+                'timeout': 10,
+            },
+        }
+    else:
+        # sin pool (ej: detrás de PgBouncer): conexiones persistentes, revisadas antes de reusar
+        DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('POSTGRES_CONN_MAX_AGE', '60'))
+        DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # IMMEDIATE toma el lock de escritura al abrir la transacción: las
+                # escrituras esperan su turno (busy_timeout) en vez de fallar con "database is locked"
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA busy_timeout=5000;'
+                    'PRAGMA temp_store=MEMORY;'
+                    'PRAGMA cache_size=-20000;'
+                ),
+            },
+        }
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Guarda las grillas diarias (clases/cache_grilla.py) y el Usuario de la sesión.
+# Local por proceso: con varios workers conviene un backend compartido
+# (Redis/Memcached) para que las invalidaciones lleguen a todos.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'plataforma-escuela-nieve',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
     }
 }
 
@@ -142,9 +235,37 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # valida el JWT sin consultar auth.User; el Usuario viene en los claims
+        'api.authentication.JWTUsuarioAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
 }
+
+# Pub/sub de la grilla en vivo (clases/eventos.py). BrokerLocal no necesita servicios
+# externos pero solo reparte dentro del mismo proceso (un worker ASGI).
+EVENTOS_BROKER = 'clases.eventos.BrokerLocal'
+
+# Hashes de contraseña: el primero es el que se usa al crear o regenerar.
+# Los demás siguen validando claves viejas, que se pasan a scrypt en el próximo login.
+# scrypt con los parámetros de Django (N=2**14, r=8, p=5): no se baja el costo para
+# ganar logins por segundo. Medido con bench_login en 1 CPU: 3.6 verificaciones/s y
+# 3.6 logins/s completos con el hash ya regenerado (p=1 daba ~5 veces más).
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# Intentos fallidos de login antes de bloquear (ver backend_project/throttling.py)
+LOGIN_MAX_FALLOS_CORREO = 5
+LOGIN_MAX_FALLOS_IP = 50
+LOGIN_VENTANA_SEGUNDOS = 300
+
+SIMPLE_JWT = {
+    # /api/token/ también agrega rut/centro/tipo al token
+    'TOKEN_OBTAIN_SERIALIZER': 'api.serializers.UsuarioTokenObtainPairSerializer',
+}
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.cache import cache
+
+# Límite de intentos fallidos de login, contados en el cache por correo y por IP.
+# Al empezar el turno entran muchos a la vez desde la misma red del centro, por eso
+# el tope por IP es más alto que el tope por cuenta.
+
+
+def _limites():
+    return (
+        getattr(settings, "LOGIN_MAX_FALLOS_CORREO", 5),
+        getattr(settings, "LOGIN_MAX_FALLOS_IP", 50),
+        getattr(settings, "LOGIN_VENTANA_SEGUNDOS", 300),
+    )
+
+
+def _claves(correo, ip):
+    return f"login:fallos:correo:{correo}", f"login:fallos:ip:{ip}"
+
+
+def ip_del_request(request):
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def login_bloqueado(correo, ip):
+    """True si el correo o la IP superaron los intentos fallidos de la ventana."""
+    max_correo, max_ip, _ = _limites()
+    clave_correo, clave_ip = _claves(correo, ip)
+    fallos = cache.get_many([clave_correo, clave_ip])
+    return fallos.get(clave_correo, 0) >= max_correo or fallos.get(clave_ip, 0) >= max_ip
+
+
+def registrar_fallo(correo, ip):
+    _, _, ventana = _limites()
+    for clave in _claves(correo, ip):
+        # la ventana corre desde el primer fallo
+        if not cache.add(clave, 1, ventana):
+            try:
+                cache.incr(clave)
+            except ValueError:  # expiró entre add e incr
+                cache.set(clave, 1, ventana)
+
+
+def limpiar_fallos(correo, ip=None):
+    """Login exitoso: borra los fallos de la cuenta (y de la IP si se indica)."""
+    clave_correo, clave_ip = _claves(correo, ip)
+    cache.delete_many([clave_correo, clave_ip] if ip is not None else [clave_correo])
@@ -18,7 +18,7 @@ from django.contrib import admin
 from django.urls import path, include
 from . import views
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from clases.api_views import clases_instructor_dia
+from clases.api_views import clases_instructor_dia, clases_instructor_rango, clases_instructor_sync
 from api.views import InstructorLoginView
 
 
@@ -42,6 +42,8 @@ urlpatterns = [
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/instructor/clases/', clases_instructor_dia),
+    path('api/instructor/clases/sync/', clases_instructor_sync, name='clases_instructor_sync'),
+    path('api/instructor/clases/rango/', clases_instructor_rango, name='clases_instructor_rango'),
     path("api/instructor/login/", InstructorLoginView.as_view(), name="instructor_login"),
 
 ]
\ No newline at end of file
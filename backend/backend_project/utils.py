@@ -1,14 +1,104 @@
-from usuarios.models import Usuario
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from usuarios.models import Usuario, normalizar_correo
 
-def usuario_actual(request):
+
+def clave_cache_usuario(rut):
+    return f"usuario_sesion:{rut}"
+
+
+def cargar_usuario_sesion(request):
+    """
+    Busca el Usuario de la sesión (con centro y tipo). Si USUARIO_SESION_CACHE_SEGUNDOS > 0
+    se guarda unos segundos en el cache, invalidado al guardar/borrar el Usuario.
+    """
     rut = request.session.get('usuario_id')
     if not rut:
         return None
+
+    ttl = getattr(settings, "USUARIO_SESION_CACHE_SEGUNDOS", 0)
+    if ttl:
+        usuario = cache.get(clave_cache_usuario(rut))
+        if usuario is not None:
+            return usuario
+
+    try:
+        usuario = Usuario.objects.select_related('id_centro', 'tipo_de_usuario').get(rut_usuario=rut)
+    except Usuario.DoesNotExist:
+        return None
+
+    if ttl:
+        cache.set(clave_cache_usuario(rut), usuario, ttl)
+    return usuario
+
+
+async def acargar_usuario_sesion(request):
+    """Versión async de cargar_usuario_sesion para las vistas async (mismo cache)."""
+    rut = await request.session.aget('usuario_id')
+    if not rut:
+        return None
+
+    ttl = getattr(settings, "USUARIO_SESION_CACHE_SEGUNDOS", 0)
+    if ttl:
+        usuario = await cache.aget(clave_cache_usuario(rut))
+        if usuario is not None:
+            return usuario
+
     try:
-        return Usuario.objects.select_related('id_centro', 'tipo_de_usuario').get(rut_usuario=rut)
+        usuario = await Usuario.objects.select_related('id_centro', 'tipo_de_usuario').aget(rut_usuario=rut)
     except Usuario.DoesNotExist:
         return None
 
+    if ttl:
+        await cache.aset(clave_cache_usuario(rut), usuario, ttl)
+    return usuario
+
+
+def usuario_actual(request):
+    # request.usuario lo deja UsuarioSesionMiddleware (se resuelve una sola vez por request)
+    usuario = getattr(request, 'usuario', None)
+    if usuario is None:
+        return cargar_usuario_sesion(request)
+    return usuario if usuario else None
+
 def centro_del_sesion(request):
     u = usuario_actual(request)
-    return getattr(u, 'id_centro', None)
\ No newline at end of file
+    return getattr(u, 'id_centro', None)
+
+
+async def ausuario_actual(request):
+    # en vistas async request.usuario no sirve (la consulta perezosa sería síncrona)
+    if not hasattr(request, '_ausuario'):
+        request._ausuario = await acargar_usuario_sesion(request)
+    return request._ausuario
+
+
+async def acentro_del_sesion(request):
+    u = await ausuario_actual(request)
+    return getattr(u, 'id_centro', None)
+
+
+def verificar_credenciales(correo, password):
+    """
+    Usuario con ese correo y contraseña, o None. Busca por el índice único de
+    correo y, si el hash quedó con un algoritmo o parámetros viejos, lo regenera
+    con el hasher preferido (PASSWORD_HASHERS) aprovechando que tiene la clave.
+    """
+    correo = normalizar_correo(correo)
+    usuario = (
+        Usuario.objects.select_related("tipo_de_usuario").filter(correo=correo).first()
+        if correo else None
+    )
+    if usuario is None:
+        # mismo costo que una clave incorrecta: no delata qué correos existen
+        make_password(password)
+        return None
+
+    def actualizar_hash(raw):
+        usuario.contraseña = make_password(raw)
+        usuario.save(update_fields=["contraseña"])
+
+    if not check_password(password, usuario.contraseña, setter=actualizar_hash):
+        return None
+    return usuario
@@ -13,36 +13,43 @@ from clases.models import Clase
 from datetime import datetime
 from .forms import LoginForm, RegistroForm
 from django.contrib.auth.models import User      # 👈 IMPORTANTE
+from usuarios.models import normalizar_correo
+from .throttling import ip_del_request, limpiar_fallos, login_bloqueado, registrar_fallo
+from .utils import verificar_credenciales
 
 def login_view(request):
     if request.method == 'POST':
-        correo = request.POST.get('username')
+        correo = normalizar_correo(request.POST.get('username'))
         contraseña = request.POST.get('password')
-
-        try:
-            usuario = Usuario.objects.get(correo=correo)
-
-            # Compara la contraseña ingresada con la encriptada
-            if check_password(contraseña, usuario.contraseña):
-                # Guarda datos en la sesión
-                request.session['usuario_id'] = usuario.rut_usuario
-                request.session['nombre'] = usuario.nombre
-                request.session['tipo'] = usuario.tipo_de_usuario.tipo_de_usuario
-
-                # Redirección según tipo de usuario
-                tipo = usuario.tipo_de_usuario.tipo_de_usuario
-                if tipo == 'boleteria':
-                    return redirect('clases_del_dia')  # URL name de tu vista
-                elif tipo == 'instructor':
-                    return redirect('pagina_instructor')
-                elif tipo == 'director':
-                    return redirect('director_dashboard')
-                else:
-                    messages.error(request, "Tipo de usuario no reconocido.")
+        ip = ip_del_request(request)
+
+        if login_bloqueado(correo, ip):
+            messages.error(request, "Demasiados intentos fallidos. Espera unos minutos e intenta de nuevo.")
+            return render(request, 'login.html', status=429)
+
+        # Busca por correo (índice único) y compara con la contraseña encriptada
+        usuario = verificar_credenciales(correo, contraseña)
+        if usuario is not None:
+            limpiar_fallos(correo)
+
+            # Guarda datos en la sesión
+            request.session['usuario_id'] = usuario.rut_usuario
+            request.session['nombre'] = usuario.nombre
+            request.session['tipo'] = usuario.tipo_de_usuario.tipo_de_usuario
+
+            # Redirección según tipo de usuario
+            tipo = usuario.tipo_de_usuario.tipo_de_usuario
+            if tipo == 'boleteria':
+                return redirect('clases_del_dia')  # URL name de tu vista
+            elif tipo == 'instructor':
+                return redirect('pagina_instructor')
+            elif tipo == 'director':
+                return redirect('director_dashboard')
             else:
-                messages.error(request, "Usuario o contraseña incorrectos.")
-        except Usuario.DoesNotExist:
-            messages.error(request, "No existe un usuario con ese correo.")
+                messages.error(request, "Tipo de usuario no reconocido.")
+        else:
+            registrar_fallo(correo, ip)
+            messages.error(request, "Usuario o contraseña incorrectos.")
 
     return render(request, 'login.html')
 
@@ -91,6 +98,7 @@ def registrar_usuario(request):
             # 2) Crear tu modelo Usuario
             usuario: Usuario = form.save(commit=False)
             usuario.contraseña = make_password(contraseña)
+            usuario.user = user
             usuario.save()
 
             messages.success(request, "Usuario registrado correctamente.")
@@ -116,9 +124,8 @@ class InstructorClasesView(APIView):
         fecha_str = request.GET.get("fecha")
         if fecha_str:
             fecha = datetime.strptime(fecha_str, "%Y-%m-%d").date()
-            clases = Clase.objects.filter(
+            clases = Clase.objects.del_dia(fecha).filter(
                 rut_usuario=instructor,
-                hora_inicio__date=fecha,
             ).order_by("hora_inicio")
         else:
             clases = Clase.objects.filter(
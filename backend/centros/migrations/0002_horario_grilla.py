@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:14
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('centros', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='centrodeesqui',
+            name='hora_apertura',
+            field=models.TimeField(default=datetime.time(9, 0)),
+        ),
+        migrations.AddField(
+            model_name='centrodeesqui',
+            name='hora_cierre',
+            field=models.TimeField(default=datetime.time(17, 0)),
+        ),
+        migrations.AddField(
+            model_name='centrodeesqui',
+            name='minutos_bloque',
+            field=models.PositiveSmallIntegerField(default=30),
+        ),
+    ]
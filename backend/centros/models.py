@@ -1,9 +1,32 @@
+from datetime import time
+
 from django.db import models
 
+
+class PorCentroQuerySet(models.QuerySet):
+    """
+    Base de los querysets de datos que pertenecen a un centro (clases, asistencia,
+    resumen). `campo_centro` es el camino hasta el FK del centro; del_centro()
+    filtra en SQL para que una vista no traiga filas de otros centros.
+    """
+    campo_centro = None
+
+    def del_centro(self, centro):
+        """Filas del centro (instancia o id). Sin centro en la sesión no se restringe."""
+        if centro is None:
+            return self
+        return self.filter(**{self.campo_centro: centro})
+
+
 class CentroDeEsqui(models.Model):
     id_centro = models.AutoField(primary_key=True)
     nombre_centro = models.CharField(max_length=100)
     ubicacion = models.CharField(max_length=200)
 
+    # Horario de la grilla de clases (dashboard y boletería)
+    hora_apertura = models.TimeField(default=time(9, 0))
+    hora_cierre = models.TimeField(default=time(17, 0))
+    minutos_bloque = models.PositiveSmallIntegerField(default=30)  # ancho de cada bloque
+
     def __str__(self):
         return f"{self.nombre_centro} ({self.ubicacion})"
@@ -1,4 +1,6 @@
 from django.contrib import admin
-from .models import Clase
+from .models import Clase, ClaseEliminada, ResumenDiarioInstructor
 
-admin.site.register(Clase)
\ No newline at end of file
+admin.site.register(Clase)
+admin.site.register(ResumenDiarioInstructor)
+admin.site.register(ClaseEliminada)
@@ -1,60 +1,146 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.utils.timezone import localdate
+from django.utils.timezone import localdate, localtime
 from .models import Clase
-from datetime import datetime
-from usuarios.models import Usuario
-from django.core.exceptions import ObjectDoesNotExist
+from datetime import datetime, timedelta
+from api.authentication import aidentidad_jwt, identidad_api
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET
+from .sync import aetag_del_dia, cambios_desde, leer_token, serializar_clase
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-def clases_instructor_dia(request):
+def _sin_instructor():
+    return Response(
+        {"detail": "No se encontró un instructor para este usuario."},
+        status=400,
+    )
+
+
+@require_GET
+async def clases_instructor_dia(request):
+    """
+    Clases del instructor en ?fecha=YYYY-MM-DD (hoy por defecto).
+    Es la llamada que hacen todas las apps antes de empezar las clases, así que
+    es async (fuera de DRF, que no soporta vistas async): valida el JWT sin ir a
+    la base y lee con el ORM async.
+    """
     # 1. Fecha
     fecha_str = request.GET.get("fecha")
     if fecha_str:
         try:
             fecha = datetime.strptime(fecha_str, "%Y-%m-%d").date()
         except ValueError:
-            return Response(
+            return JsonResponse(
                 {"detail": "Formato de fecha inválido. Usa YYYY-MM-DD."},
                 status=400,
             )
     else:
         fecha = localdate()
 
-    # 2. Buscar instructor por correo = username del User
-    user = request.user
+    # 2. Instructor dueño del token (viene en los claims del JWT)
+    identidad = await aidentidad_jwt(request)
+    if identidad is None:
+        respuesta = JsonResponse(
+            {"detail": "Las credenciales de autenticación no se proveyeron o no son válidas."},
+            status=401,
+        )
+        respuesta["WWW-Authenticate"] = 'Bearer realm="api"'
+        return respuesta
+    rut, _centro = identidad
+    if rut is None:
+        return JsonResponse(
+            {"detail": "No se encontró un instructor para este usuario."},
+            status=400,
+        )
+
+    # 3. Si la app ya tiene la versión actual del día, no se manda de nuevo
+    etag = await aetag_del_dia(rut, fecha)
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        respuesta = HttpResponseNotModified()
+        respuesta["ETag"] = etag
+        return respuesta
+
+    # 4. Filtrar clases del día (solo por rut, igual que rango y sync: las clases
+    # quedan en el centro donde se reservaron y el claim de centro puede estar viejo)
+    clases = (
+        Clase.objects.del_dia(fecha)
+        .filter(rut_usuario_id=rut)
+        .order_by("hora_inicio")
+    )
+
+    # 5. Armar JSON que usa Flutter
+    data = [serializar_clase(c) async for c in clases]
+
+    respuesta = JsonResponse(data, safe=False)
+    respuesta["ETag"] = etag
+    return respuesta
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def clases_instructor_sync(request):
+    """
+    Sincronización incremental para la app: ?since=<token> retorna solo las
+    clases creadas/editadas y los id de las que salieron de la agenda desde ese
+    token. Sin since retorna la agenda completa desde hoy. La respuesta trae
+    el token para la siguiente llamada.
+    """
+    since = request.GET.get("since")
+    desde = leer_token(since)
+    if since and desde is None:
+        return Response({"detail": "Token since inválido."}, status=400)
+
+    rut, _centro = identidad_api(request)
+    if rut is None:
+        return _sin_instructor()
+
+    return Response(cambios_desde(rut, desde))
+
+
+# Tope de días por llamada al rango (la vista de calendario pide 1–2 semanas)
+MAX_DIAS_RANGO = 62
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def clases_instructor_rango(request):
+    """
+    Clases del instructor entre ?desde=YYYY-MM-DD y ?hasta=YYYY-MM-DD (ambos
+    inclusive), agrupadas por día. Reemplaza una llamada por día del calendario
+    con una sola consulta por rango sobre hora_inicio.
+    """
     try:
-        instructor = Usuario.objects.get(correo=user.username)
-    except ObjectDoesNotExist:
+        desde = datetime.strptime(request.GET.get("desde", ""), "%Y-%m-%d").date()
+        hasta = datetime.strptime(request.GET.get("hasta", ""), "%Y-%m-%d").date()
+    except ValueError:
+        return Response(
+            {"detail": "Debes indicar desde y hasta con formato YYYY-MM-DD."},
+            status=400,
+        )
+    if hasta < desde:
+        return Response({"detail": "La fecha hasta es anterior a desde."}, status=400)
+    if (hasta - desde).days >= MAX_DIAS_RANGO:
         return Response(
-            {"detail": "No se encontró un instructor con ese correo."},
+            {"detail": f"El rango no puede superar {MAX_DIAS_RANGO} días."},
             status=400,
         )
 
-    # 3. Filtrar clases del día
+    rut, _centro = identidad_api(request)
+    if rut is None:
+        return _sin_instructor()
+
+    # todos los días del rango, también los sin clases, para que la app no tenga que rellenar
+    dias = {
+        (desde + timedelta(days=i)).isoformat(): []
+        for i in range((hasta - desde).days + 1)
+    }
     clases = (
-        Clase.objects.filter(
-            rut_usuario=instructor,
-            hora_inicio__date=fecha,
-        )
+        Clase.objects.en_rango(desde, hasta)
+        .filter(rut_usuario_id=rut)
         .order_by("hora_inicio")
     )
-
-    # 4. Armar JSON que usa Flutter
-    data = []
     for c in clases:
-        data.append(
-            {
-                "hora_inicio": c.hora_inicio.isoformat(),
-                "hora_fin": c.hora_fin.isoformat(),
-                "disciplina_clase": c.disciplina_clase,
-                "nivel_clase": c.nivel_clase,
-                "nombre_titular": c.nombre_titular,
-                "titular_telefono": c.titular_telefono,
-                "cantidad_alumnos": c.cantidad_alumnos,
-            }
-        )
+        dias[localtime(c.hora_inicio).date().isoformat()].append(serializar_clase(c))
 
-    return Response(data)
\ No newline at end of file
+    return Response({"desde": desde.isoformat(), "hasta": hasta.isoformat(), "dias": dias})
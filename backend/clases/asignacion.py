@@ -0,0 +1,42 @@
+from .disponibilidad import disponibilidad_del_dia, mascara, normalizar_idioma, sirve_para
+
+# Cuántas sugerencias retorna por defecto
+CANDIDATOS_POR_DEFECTO = 5
+
+
+def sugerir_instructores(centro, fecha, disciplina, nivel, inicio, fin,
+                         idioma=None, cantidad=CANDIDATOS_POR_DEFECTO, excluir=()):
+    """
+    Mejores instructores activos y libres para una clase nueva, de mejor a peor.
+
+    Filtra por disciplina (o "ambos"), nivel_instructor >= nivel de la clase,
+    idioma (si viene) y que [inicio, fin) esté libre en el mapa del día
+    (ver clases/disponibilidad.py). Ordena para repartir las horas: primero
+    quien lleva menos minutos ese día y, a igualdad, quien tiene el nivel más
+    justo (deja libres a los de nivel alto).
+    Retorna una lista de dicts {rut, nombre, apellido, disciplina, nivel, minutos_dia}.
+    """
+    datos = disponibilidad_del_dia(centro, fecha)
+    pedida = mascara(inicio, fin, fecha)
+    disciplina = (disciplina or "").lower()
+    idioma = normalizar_idioma(idioma) if idioma else None
+
+    libres = [
+        i for i in datos["instructores"]
+        if not i["ocupado"] & pedida
+        and sirve_para(i, disciplina, nivel, idioma)
+        and i["rut"] not in excluir
+    ]
+    libres.sort(key=lambda i: (i["minutos"], i["nivel"] - nivel, i["apellido"], i["rut"]))
+
+    return [
+        {
+            "rut": i["rut"],
+            "nombre": i["nombre"],
+            "apellido": i["apellido"],
+            "disciplina": i["disciplina"],
+            "nivel": i["nivel"],
+            "minutos_dia": i["minutos"],
+        }
+        for i in libres[:cantidad]
+    ]
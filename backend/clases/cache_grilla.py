@@ -0,0 +1,120 @@
+from time import time_ns
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Los datos de la grilla de un día se guardan por (vista, centro, fecha). En vez de
+# borrar claves se cambia una "versión" por día y otra por centro: invalidar un día
+# solo toca ese día y ese centro, e invalidar el centro (ej: alta de instructor)
+# deja obsoletas todas sus fechas de una vez.
+
+TTL_GRILLA = 60 * 60 * 12  # segundos; las versiones hacen el trabajo de invalidar
+
+CLAVE_HITS = "grilla:stats:hits"
+CLAVE_MISSES = "grilla:stats:misses"
+
+
+def _clave_version_dia(centro_id, fecha):
+    return f"grilla:ver:{centro_id}:{fecha.isoformat()}"
+
+
+def _clave_version_centro(centro_id):
+    return f"grilla:ver:{centro_id}"
+
+
+def _contar(clave):
+    cache.add(clave, 0, None)
+    try:
+        cache.incr(clave)
+    except ValueError:  # expulsada entre add e incr
+        cache.set(clave, 1, None)
+
+
+async def _acontar(clave):
+    await cache.aadd(clave, 0, None)
+    try:
+        await cache.aincr(clave)
+    except ValueError:
+        await cache.aset(clave, 1, None)
+
+
+def _clave_datos(vista, centro_id, fecha, versiones):
+    clave_dia = _clave_version_dia(centro_id, fecha)
+    clave_centro = _clave_version_centro(centro_id)
+    return (
+        f"grilla:{vista}:{centro_id}:{fecha.isoformat()}:"
+        f"{versiones.get(clave_centro, 0)}:{versiones.get(clave_dia, 0)}"
+    )
+
+
+def grilla_cacheada(vista, centro_id, fecha, construir):
+    """
+    Retorna los datos de la grilla de `vista` para (centro, fecha) desde el cache,
+    o los arma con construir() y los guarda.
+    """
+    versiones = cache.get_many([_clave_version_dia(centro_id, fecha), _clave_version_centro(centro_id)])
+    clave = _clave_datos(vista, centro_id, fecha, versiones)
+
+    datos = cache.get(clave)
+    if datos is not None:
+        _contar(CLAVE_HITS)
+        return datos
+
+    _contar(CLAVE_MISSES)
+    datos = construir()
+    cache.set(clave, datos, TTL_GRILLA)
+    return datos
+
+
+async def agrilla_cacheada(vista, centro_id, fecha, aconstruir):
+    """Igual que grilla_cacheada para vistas async; aconstruir es una corrutina."""
+    versiones = await cache.aget_many([_clave_version_dia(centro_id, fecha), _clave_version_centro(centro_id)])
+    clave = _clave_datos(vista, centro_id, fecha, versiones)
+
+    datos = await cache.aget(clave)
+    if datos is not None:
+        await _acontar(CLAVE_HITS)
+        return datos
+
+    await _acontar(CLAVE_MISSES)
+    datos = await aconstruir()
+    await cache.aset(clave, datos, TTL_GRILLA)
+    return datos
+
+
+def _cambiar_versiones(claves, al_confirmar):
+    # al confirmarse la transacción: si se cambiara antes, una lectura concurrente
+    # todavía vería los datos viejos y los dejaría guardados con la versión nueva
+    def cambiar():
+        version = time_ns()
+        cache.set_many({clave: version for clave in claves}, None)
+
+    if al_confirmar:
+        transaction.on_commit(cambiar)
+    else:
+        cambiar()
+
+
+def invalidar_dia(centro_id, fecha, al_confirmar=True):
+    """
+    Deja obsoleta la grilla de ese día para el centro (y la vista sin centro).
+    al_confirmar=False cambia la versión ya (los benchmarks, que revierten su transacción).
+    """
+    _cambiar_versiones([_clave_version_dia(centro_id, fecha), _clave_version_dia(None, fecha)], al_confirmar)
+
+
+def invalidar_centro(centro_id, al_confirmar=True):
+    """Deja obsoletas todas las fechas del centro (y de la vista sin centro)."""
+    _cambiar_versiones([_clave_version_centro(centro_id), _clave_version_centro(None)], al_confirmar)
+
+
+def estadisticas():
+    valores = cache.get_many([CLAVE_HITS, CLAVE_MISSES])
+    hits = valores.get(CLAVE_HITS, 0)
+    misses = valores.get(CLAVE_MISSES, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "ratio_hits": round(hits / total, 3) if total else None,
+    }
@@ -0,0 +1,59 @@
+from collections import defaultdict
+
+from .models import Clase
+
+
+def hay_solape(instructor_id, inicio, fin, excluir_id=None):
+    """
+    True si el instructor ya tiene una clase que se cruza con [inicio, fin).
+    Usa el índice (rut_usuario, hora_inicio, hora_fin) de Clase.
+    """
+    qs = Clase.objects.filter(
+        rut_usuario_id=instructor_id,
+        hora_inicio__lt=fin,
+        hora_fin__gt=inicio,
+    )
+    if excluir_id is not None:
+        qs = qs.exclude(pk=excluir_id)
+    return qs.exists()
+
+
+def solapes_en_lote(reservas):
+    """
+    Revisa varias reservas juntas (ej: importación o paquete de varios días).
+
+    reservas: lista de tuplas (instructor_id, inicio, fin).
+    Retorna un dict {índice: motivo} con las reservas que chocan contra una
+    clase existente o contra otra reserva anterior de la misma lista.
+    Hace una sola consulta a la base sin importar cuántas reservas vengan.
+    """
+    if not reservas:
+        return {}
+
+    instructores = {r[0] for r in reservas}
+    desde = min(r[1] for r in reservas)
+    hasta = max(r[2] for r in reservas)
+
+    ocupado = defaultdict(list)
+    existentes = Clase.objects.filter(
+        rut_usuario_id__in=instructores,
+        hora_inicio__lt=hasta,
+        hora_fin__gt=desde,
+    ).values_list("rut_usuario_id", "hora_inicio", "hora_fin")
+    for rut, inicio, fin in existentes:
+        ocupado[rut].append((inicio, fin, "existente"))
+
+    conflictos = {}
+    for i, (rut, inicio, fin) in enumerate(reservas):
+        for otro_inicio, otro_fin, origen in ocupado[rut]:
+            if otro_inicio < fin and otro_fin > inicio:
+                conflictos[i] = (
+                    "Ese instructor ya tiene una clase en ese horario."
+                    if origen == "existente"
+                    else "Se cruza con otra clase del mismo lote."
+                )
+                break
+        else:
+            ocupado[rut].append((inicio, fin, "lote"))
+
+    return conflictos
@@ -0,0 +1,221 @@
+import re
+import unicodedata
+from datetime import datetime, timedelta, time as dtime
+
+from django.utils.timezone import localtime, make_aware, get_current_timezone
+
+from usuarios.models import Usuario
+from .models import Clase, limites_del_dia
+from .cache_grilla import grilla_cacheada
+from .grilla import APERTURA, CIERRE
+
+# Disponibilidad de un día en ranuras de 5 minutos desde la medianoche local
+# (hora de reloj, como se ingresan las clases). Por instructor se guardan:
+#   - ocupado:  int de Python con un bit por ranura; ver si [inicio, fin) está
+#               libre es un AND (lo usa el motor de asignación).
+#   - ocupados: intervalos ocupados ya fusionados y ordenados; de ahí salen los
+#               huecos libres dentro del horario del centro (búsqueda de horarios).
+# Se arma una vez por (centro, fecha) y vive en el cache de la grilla.
+MINUTOS_RANURA = 5
+
+# Cuántos horarios retorna la búsqueda por defecto
+HORARIOS_POR_DEFECTO = 10
+
+
+def normalizar_idioma(texto):
+    """'Inglés ' -> 'ingles' (sin tildes ni mayúsculas)."""
+    texto = unicodedata.normalize("NFKD", (texto or "").strip().lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def idiomas_de(texto):
+    """Campo libre Usuario.idioma ('español, inglés y portugués') -> conjunto normalizado."""
+    partes = re.split(r"[,;/]|\s+y\s+", normalizar_idioma(texto))
+    return frozenset(p.strip() for p in partes if p.strip())
+
+
+def _minutos_del_dia(momento, fecha):
+    local = localtime(momento)
+    return (local.date() - fecha).days * 24 * 60 + local.hour * 60 + local.minute
+
+
+def ranuras(inicio, fin, fecha):
+    """[desde, hasta) en ranuras del día `fecha` (redondea hacia afuera)."""
+    desde = max(0, _minutos_del_dia(inicio, fecha) // MINUTOS_RANURA)
+    hasta = -(-_minutos_del_dia(fin, fecha) // MINUTOS_RANURA)
+    return desde, max(desde + 1, hasta)
+
+
+def mascara(inicio, fin, fecha):
+    """Bits de las ranuras que toca [inicio, fin)."""
+    desde, hasta = ranuras(inicio, fin, fecha)
+    return ((1 << (hasta - desde)) - 1) << desde
+
+
+def momento(fecha, ranura):
+    """Ranura del día -> datetime aware en la TZ del proyecto."""
+    naive = datetime.combine(fecha, dtime.min) + timedelta(minutes=ranura * MINUTOS_RANURA)
+    return make_aware(naive, timezone=get_current_timezone())
+
+
+def _ranura_de_hora(hora):
+    return (hora.hour * 60 + hora.minute) // MINUTOS_RANURA
+
+
+def _fusionar(intervalos):
+    fusionados = []
+    for desde, hasta in sorted(intervalos):
+        if fusionados and desde <= fusionados[-1][1]:
+            fusionados[-1][1] = max(fusionados[-1][1], hasta)
+        else:
+            fusionados.append([desde, hasta])
+    return [tuple(i) for i in fusionados]
+
+
+def _construir_disponibilidad(centro, fecha):
+    inicio_dia, fin_dia = limites_del_dia(fecha)
+
+    filtros = {"estados_diarios__fecha": fecha, "estados_diarios__activo": True}
+    if centro is not None:
+        # en el mismo filter() para que la asistencia también sea de este centro
+        filtros.update(id_centro=centro, estados_diarios__id_centro=centro)
+    instructores = Usuario.objects.filter(
+        tipo_de_usuario__tipo_de_usuario__iexact="instructor", **filtros
+    )
+
+    filas = {
+        rut: {
+            "rut": rut,
+            "nombre": nombre,
+            "apellido": apellido,
+            "disciplina": (disciplina or "").lower(),
+            "nivel": nivel or 0,
+            "idiomas": idiomas_de(idioma),
+            "ocupado": 0,
+            "ocupados": [],
+            "minutos": 0,
+        }
+        for rut, nombre, apellido, disciplina, nivel, idioma in instructores.values_list(
+            "rut_usuario", "nombre", "apellido", "disciplina", "nivel_instructor", "idioma",
+        )
+    }
+
+    # Clases que se cruzan con el día (incluye las que vienen de la noche anterior)
+    clases = Clase.objects.filter(
+        rut_usuario_id__in=filas.keys(),
+        hora_inicio__lt=fin_dia,
+        hora_fin__gt=inicio_dia,
+    ).values_list("rut_usuario_id", "hora_inicio", "hora_fin", "duracion")
+    for rut, inicio, fin, duracion in clases:
+        fila = filas[rut]
+        desde, hasta = ranuras(inicio, fin, fecha)
+        fila["ocupado"] |= ((1 << (hasta - desde)) - 1) << desde
+        fila["ocupados"].append((desde, hasta))
+        fila["minutos"] += duracion
+
+    for fila in filas.values():
+        fila["ocupados"] = _fusionar(fila["ocupados"])
+
+    return {
+        "apertura": _ranura_de_hora(getattr(centro, "hora_apertura", None) or APERTURA),
+        "cierre": _ranura_de_hora(getattr(centro, "hora_cierre", None) or CIERRE),
+        "instructores": list(filas.values()),
+    }
+
+
+def disponibilidad_del_dia(centro, fecha):
+    """
+    Instructores activos del centro en la fecha con su ocupación del día.
+    Se guarda en el cache de la grilla: crear, mover o borrar una clase y
+    cambiar la asistencia ya invalidan ese día (ver clases/signals.py).
+    """
+    return grilla_cacheada(
+        "disponibilidad", getattr(centro, "pk", None), fecha,
+        lambda: _construir_disponibilidad(centro, fecha),
+    )
+
+
+def sirve_para(instructor, disciplina, nivel, idioma=None):
+    """
+    Disciplina (un instructor "ambos" sirve para las dos), nivel_instructor >= nivel
+    de la clase e idioma ya normalizado (None = cualquiera).
+    """
+    return (
+        instructor["nivel"] >= nivel
+        and instructor["disciplina"] in (disciplina, "ambos")
+        and (idioma is None or idioma in instructor["idiomas"])
+    )
+
+
+def huecos(ocupados, apertura, cierre):
+    """Intervalos libres [desde, hasta) dentro de [apertura, cierre)."""
+    libres = []
+    cursor = apertura
+    for desde, hasta in ocupados:
+        if hasta <= cursor:
+            continue
+        if desde >= cierre:
+            break
+        if desde > cursor:
+            libres.append((cursor, desde))
+        cursor = hasta
+    if cursor < cierre:
+        libres.append((cursor, cierre))
+    return libres
+
+
+def _hhmm(ranura):
+    minutos = ranura * MINUTOS_RANURA
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def buscar_horarios(centro, fecha, duracion, disciplina, nivel, idioma=None,
+                    desde=None, hasta=None, cantidad=HORARIOS_POR_DEFECTO):
+    """
+    Primeros horarios en que un instructor activo y apto puede dar una clase
+    de `duracion` minutos, ordenados por hora de inicio (y a igualdad, quien
+    lleva menos minutos ese día).
+
+    desde / hasta (time, opcionales) acotan la HORA DE INICIO; por defecto todo
+    el horario del centro. La clase tiene que terminar antes del cierre.
+    Retorna dicts {rut, nombre, apellido, disciplina, nivel, minutos_dia,
+    inicio, fin, libre_hasta, huecos}; huecos son los intervalos libres del
+    instructor en el día como pares "HH:MM".
+    """
+    datos = disponibilidad_del_dia(centro, fecha)
+    apertura, cierre = datos["apertura"], datos["cierre"]
+    largo = -(-duracion // MINUTOS_RANURA)
+    primera = max(apertura, _ranura_de_hora(desde)) if desde else apertura
+    ultima = min(cierre - largo, _ranura_de_hora(hasta)) if hasta else cierre - largo
+    disciplina = (disciplina or "").lower()
+    idioma = normalizar_idioma(idioma) if idioma else None
+
+    encontrados = []
+    for inst in datos["instructores"]:
+        if not sirve_para(inst, disciplina, nivel, idioma):
+            continue
+        libres = huecos(inst["ocupados"], apertura, cierre)
+        for libre_desde, libre_hasta in libres:
+            inicio = max(libre_desde, primera)
+            if inicio > ultima:
+                break
+            if inicio + largo <= libre_hasta:
+                encontrados.append((inicio, libre_hasta, inst, libres))
+                break
+
+    encontrados.sort(key=lambda e: (e[0], e[2]["minutos"], e[2]["nivel"] - nivel, e[2]["apellido"]))
+    return [
+        {
+            "rut": inst["rut"],
+            "nombre": inst["nombre"],
+            "apellido": inst["apellido"],
+            "disciplina": inst["disciplina"],
+            "nivel": inst["nivel"],
+            "minutos_dia": inst["minutos"],
+            "inicio": momento(fecha, inicio).isoformat(),
+            "fin": (momento(fecha, inicio) + timedelta(minutes=duracion)).isoformat(),
+            "libre_hasta": momento(fecha, libre_hasta).isoformat(),
+            "huecos": [(_hhmm(a), _hhmm(b)) for a, b in libres],
+        }
+        for inicio, libre_hasta, inst, libres in encontrados[:cantidad]
+    ]
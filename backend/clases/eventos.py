@@ -0,0 +1,129 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from django.utils.timezone import localtime
+
+# Cambios de la grilla de un día empujados a las pantallas abiertas (ver
+# clases.views.eventos_grilla). Cada (centro, fecha) es un canal; los eventos
+# son diffs chicos que el navegador aplica sobre la tabla ya dibujada.
+
+# Eventos en espera por pantalla; si una conexión lenta se atrasa más que esto
+# se descartan y se le pide recargar.
+MAX_PENDIENTES = 100
+
+
+class BrokerLocal:
+    """
+    Pub/sub en memoria del proceso, sin servicios externos. Sirve con un solo
+    proceso de servidor (runserver, un worker de uvicorn). Con varios procesos
+    hay que configurar EVENTOS_BROKER con un broker compartido que implemente
+    suscribir / desuscribir / publicar.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._suscriptores = defaultdict(set)
+
+    def suscribir(self, canal):
+        """Se llama desde la corrutina que atiende la conexión; retorna su cola."""
+        suscripcion = (asyncio.get_running_loop(), asyncio.Queue(MAX_PENDIENTES))
+        with self._lock:
+            self._suscriptores[canal].add(suscripcion)
+        return suscripcion
+
+    def desuscribir(self, canal, suscripcion):
+        with self._lock:
+            subs = self._suscriptores.get(canal)
+            if subs is not None:
+                subs.discard(suscripcion)
+                if not subs:
+                    del self._suscriptores[canal]
+
+    def publicar(self, canal, evento):
+        # las señales corren en hilos síncronos: se encola en el loop de cada conexión
+        with self._lock:
+            subs = list(self._suscriptores.get(canal, ()))
+        for loop, cola in subs:
+            try:
+                loop.call_soon_threadsafe(_encolar, cola, evento)
+            except RuntimeError:  # loop cerrado: la conexión ya terminó
+                pass
+
+    def total_suscriptores(self):
+        with self._lock:
+            return sum(len(s) for s in self._suscriptores.values())
+
+
+def _encolar(cola, evento):
+    try:
+        cola.put_nowait(evento)
+    except asyncio.QueueFull:
+        # pantalla atrasada: se vacía y se le pide que recargue completa
+        while not cola.empty():
+            cola.get_nowait()
+        cola.put_nowait(evento_recargar())
+
+
+@lru_cache(maxsize=1)
+def broker():
+    return import_string(getattr(settings, "EVENTOS_BROKER", "clases.eventos.BrokerLocal"))()
+
+
+def canal(centro_id, fecha):
+    return f"grilla:{centro_id}:{fecha.isoformat()}"
+
+
+def publicar(centro_id, fecha, evento):
+    """
+    Publica el evento al confirmarse la transacción, en el canal del centro y en
+    el de la vista sin centro (igual que la invalidación del cache de grillas).
+    """
+    def enviar():
+        b = broker()
+        b.publicar(canal(centro_id, fecha), evento)
+        if centro_id is not None:
+            b.publicar(canal(None, fecha), evento)
+
+    transaction.on_commit(enviar)
+
+
+def formato_sse(evento):
+    return f"event: {evento['tipo']}\ndata: {json.dumps(evento, ensure_ascii=False)}\n\n"
+
+
+# ---- eventos ----
+
+def evento_clase(clase):
+    return {
+        "tipo": "clase",
+        "id_clase": clase.pk,
+        "rut": clase.rut_usuario_id,
+        "hora_inicio": localtime(clase.hora_inicio).isoformat(),
+        "hora_fin": localtime(clase.hora_fin).isoformat(),
+        "duracion": clase.duracion,
+        "disciplina_clase": clase.disciplina_clase,
+        "nivel_clase": clase.nivel_clase,
+        "nombre_titular": clase.nombre_titular,
+        "titular_telefono": clase.titular_telefono,
+        "cantidad_alumnos": clase.cantidad_alumnos,
+    }
+
+
+def evento_borrado(id_clase):
+    return {"tipo": "borrado", "id_clase": id_clase}
+
+
+def evento_estados(estados):
+    """estados: {rut: activo}"""
+    return {"tipo": "estados", "estados": estados}
+
+
+def evento_recargar():
+    # cambios masivos o pantalla atrasada: más simple volver a pedir la grilla
+    return {"tipo": "recargar"}
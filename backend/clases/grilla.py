@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, time as dtime
+from math import ceil
+
+from django.utils.timezone import make_aware, get_current_timezone
+
+# Valores por defecto cuando no hay centro (o el centro no los define)
+APERTURA = dtime(9, 0)
+CIERRE = dtime(17, 0)
+MINUTOS_BLOQUE = 30
+
+
+class GrillaHorario:
+    """
+    Grilla de bloques de un día (por defecto 09:00-17:00 cada 30 min).
+
+    Los límites de los bloques se calculan una sola vez; cada clase se ubica
+    en su rango de bloques con aritmética sobre segundos, sin volver a parsear
+    ni crear datetimes por bloque. Armar la grilla es O(clases + celdas).
+    """
+
+    def __init__(self, fecha, apertura=APERTURA, cierre=CIERRE,
+                 minutos_bloque=MINUTOS_BLOQUE, tz=None):
+        if minutos_bloque <= 0:
+            raise ValueError("minutos_bloque debe ser positivo")
+
+        self.fecha = fecha
+        self.minutos_bloque = minutos_bloque
+
+        inicio_naive = datetime.combine(fecha, apertura)
+        self.inicio = make_aware(inicio_naive, timezone=tz or get_current_timezone())
+
+        minutos_abierto = (cierre.hour * 60 + cierre.minute) - (apertura.hour * 60 + apertura.minute)
+        # un bloque por cada hora de inicio entre apertura y cierre, ambas incluidas: con
+        # 30 min el último parte justo a las 17:00 (igual que antes: 09:00..17:00); si el
+        # ancho no divide el horario, el último parte antes del cierre y lo pasa
+        # (45 min de 09:00 a 17:00: último bloque 16:30-17:15)
+        total = max(minutos_abierto, 0) // minutos_bloque + 1
+
+        self.horas = [
+            (inicio_naive + timedelta(minutes=i * minutos_bloque)).strftime("%H:%M")
+            for i in range(total)
+        ]
+        self._seg_bloque = minutos_bloque * 60
+
+    @classmethod
+    def para_centro(cls, fecha, centro=None, tz=None):
+        """Grilla con el horario y ancho de bloque configurados en el centro."""
+        if centro is None:
+            return cls(fecha, tz=tz)
+        return cls(
+            fecha,
+            apertura=centro.hora_apertura or APERTURA,
+            cierre=centro.hora_cierre or CIERRE,
+            minutos_bloque=centro.minutos_bloque or MINUTOS_BLOQUE,
+            tz=tz,
+        )
+
+    def __len__(self):
+        return len(self.horas)
+
+    def rango(self, inicio, fin):
+        """
+        Índices [primero, ultimo) de los bloques que se solapan con [inicio, fin).
+        Retorna None si la clase queda fuera de la grilla.
+        """
+        desde = (inicio - self.inicio).total_seconds()
+        hasta = (fin - self.inicio).total_seconds()
+
+        primero = max(0, int(desde // self._seg_bloque))
+        ultimo = min(len(self.horas), ceil(hasta / self._seg_bloque))
+        if primero >= ultimo:
+            return None
+        return primero, ultimo
+
+    def celdas(self, instructores_ids, clases):
+        """
+        Mapa {rut_instructor: [clase | None por bloque]}.
+        Las clases de instructores que no están en instructores_ids se ignoran.
+        """
+        total = len(self.horas)
+        horario = {rut: [None] * total for rut in instructores_ids}
+
+        for clase in clases:
+            fila = horario.get(clase.rut_usuario_id)
+            if fila is None:
+                continue
+            rango = self.rango(clase.hora_inicio, clase.hora_fin)
+            if rango is None:
+                continue
+            for i in range(*rango):
+                fila[i] = clase
+
+        return horario
@@ -0,0 +1,106 @@
+import random
+from datetime import timedelta
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.timezone import localdate
+from rest_framework.test import APIClient
+
+from api.authentication import tokens_para_usuario
+from centros.models import CentroDeEsqui
+from clases.models import Clase, limites_del_dia
+from usuarios.models import Usuario, Identificador
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _percentil(tiempos, p):
+    tiempos = sorted(tiempos)
+    return tiempos[min(len(tiempos) - 1, int(len(tiempos) * p))] * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara la vista de calendario de la app pidiendo un día por llamada "
+        "(/api/instructor/clases/) contra una sola llamada a /api/instructor/clases/rango/. "
+        "Todo corre dentro de una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dias", type=int, default=14, help="Días que muestra el calendario.")
+        parser.add_argument("--instructores", type=int, default=100)
+        parser.add_argument("--clases-por-dia", type=int, default=6, help="Por instructor.")
+        parser.add_argument("--historia", type=int, default=120, help="Días de clases generados.")
+        parser.add_argument("--repeticiones", type=int, default=30)
+        parser.add_argument("--semilla", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        try:
+            with transaction.atomic():
+                self._correr(opts)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _correr(self, opts):
+        rnd = random.Random(opts["semilla"])
+        hoy = localdate()
+
+        centro = CentroDeEsqui.objects.create(nombre_centro="bench", ubicacion="bench")
+        tipo, _ = Identificador.objects.get_or_create(tipo_de_usuario="instructor")
+        instructores = Usuario.objects.bulk_create([
+            Usuario(rut_usuario=f"bench-{i}", nombre="Bench", apellido=str(i),
+                    correo=f"bench-{i}@bench.cl", tipo_de_usuario=tipo, id_centro=centro)
+            for i in range(opts["instructores"])
+        ])
+
+        lote = []
+        for dia in range(opts["historia"]):
+            inicio_dia, _ = limites_del_dia(hoy - timedelta(days=opts["historia"] // 2) + timedelta(days=dia))
+            for inst in instructores:
+                for bloque in rnd.sample(range(16), opts["clases_por_dia"]):
+                    inicio = inicio_dia + timedelta(hours=9, minutes=30 * bloque)
+                    lote.append(Clase(
+                        nombre_titular="bench", titular_telefono="0",
+                        nivel_clase=1, disciplina_clase="ski",
+                        hora_inicio=inicio, hora_fin=inicio + timedelta(minutes=30), duracion=30,
+                        cantidad_alumnos=1, rut_usuario=inst, id_centro=centro,
+                    ))
+        Clase.objects.bulk_create(lote, batch_size=5000)
+        self.stdout.write(f"{len(lote)} clases generadas")
+
+        # token como el de InstructorLoginView: con los claims (rut, centro) la vista no consulta al Usuario
+        usuario = User.objects.create(username=instructores[0].correo)
+        cliente = APIClient(SERVER_NAME="localhost")
+        cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens_para_usuario(instructores[0], usuario)['access']}")
+
+        fechas = [hoy + timedelta(days=i) for i in range(opts["dias"])]
+
+        def por_dia():
+            for f in fechas:
+                r = cliente.get("/api/instructor/clases/", {"fecha": f.isoformat()})
+                assert r.status_code == 200, r.status_code
+            return len(fechas)
+
+        def rango():
+            r = cliente.get("/api/instructor/clases/rango/", {
+                "desde": fechas[0].isoformat(), "hasta": fechas[-1].isoformat(),
+            })
+            assert r.status_code == 200, r.status_code
+            return 1
+
+        for nombre, vista in (("un día por llamada", por_dia), ("rango", rango)):
+            vista()  # calentamiento
+            tiempos = []
+            for _ in range(opts["repeticiones"]):
+                t = perf_counter()
+                llamadas = vista()
+                tiempos.append(perf_counter() - t)
+            self.stdout.write(
+                f"{nombre}: {llamadas} llamadas por vista de {opts['dias']} días  "
+                f"p50={_percentil(tiempos, 0.5):.1f} ms  p95={_percentil(tiempos, 0.95):.1f} ms"
+            )
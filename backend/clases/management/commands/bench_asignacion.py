@@ -0,0 +1,121 @@
+import random
+from datetime import timedelta
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.timezone import localdate
+
+from centros.models import CentroDeEsqui
+from clases.asignacion import sugerir_instructores
+from clases.disponibilidad import disponibilidad_del_dia, buscar_horarios
+from clases.cache_grilla import invalidar_dia
+from clases.models import Clase, limites_del_dia
+from director.models import EstadoInstructor
+from usuarios.models import Usuario, Identificador
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _percentiles(tiempos):
+    tiempos = sorted(tiempos)
+    p50 = tiempos[len(tiempos) // 2] * 1000
+    p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))] * 1000
+    return p50, p95
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el motor de asignación (clases/asignacion.py y clases/disponibilidad.py) sobre un centro sintético: "
+        "armado del mapa del día (cache frío), sugerencias y búsqueda de horarios con el mapa en cache. "
+        "Todo corre dentro de una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--instructores", type=int, default=300)
+        parser.add_argument("--clases", type=int, default=1500, help="Clases del día a repartir (máx. 8 por instructor).")
+        parser.add_argument("--repeticiones", type=int, default=200)
+        parser.add_argument("--semilla", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        try:
+            with transaction.atomic():
+                self._correr(opts)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _correr(self, opts):
+        rnd = random.Random(opts["semilla"])
+        hoy = localdate()
+        inicio_dia, _fin = limites_del_dia(hoy)
+
+        centro = CentroDeEsqui.objects.create(nombre_centro="bench", ubicacion="bench")
+        tipo, _ = Identificador.objects.get_or_create(tipo_de_usuario="instructor")
+        instructores = Usuario.objects.bulk_create([
+            Usuario(rut_usuario=f"bench-{i}", nombre="Bench", apellido=str(i),
+                    tipo_de_usuario=tipo, id_centro=centro,
+                    disciplina=rnd.choice(["ski", "snow", "ambos"]),
+                    nivel_instructor=rnd.randint(1, 3),
+                    idioma=rnd.choice(["español", "español, inglés", "español, portugués"]))
+            for i in range(opts["instructores"])
+        ])
+        EstadoInstructor.objects.bulk_create([
+            EstadoInstructor(instructor=inst, id_centro=centro, fecha=hoy, activo=True) for inst in instructores
+        ])
+        # cada clase en un par (instructor, hora) distinto, como en generar_temporada:
+        # sin solapes (en PostgreSQL la restricción de exclusión rechazaría el lote)
+        horas = 8  # clases de 60 min entre 09:00 y 17:00
+        pares = rnd.sample(range(len(instructores) * horas), min(opts["clases"], len(instructores) * horas))
+        clases = []
+        for par in pares:
+            i, hora = divmod(par, horas)
+            inicio = inicio_dia + timedelta(hours=9 + hora)
+            clases.append(Clase(
+                nombre_titular="bench", titular_telefono="0",
+                nivel_clase=1, disciplina_clase="ski",
+                hora_inicio=inicio, hora_fin=inicio + timedelta(minutes=60), duracion=60,
+                cantidad_alumnos=1, rut_usuario=instructores[i], id_centro=centro,
+            ))
+        Clase.objects.bulk_create(clases)
+
+        frio = []
+        for _ in range(min(20, opts["repeticiones"])):
+            invalidar_dia(centro.pk, hoy, al_confirmar=False)  # la transacción del bench no se confirma
+            t = perf_counter()
+            disponibilidad_del_dia(centro, hoy)
+            frio.append(perf_counter() - t)
+
+        caliente = []
+        encontrados = 0
+        for _ in range(opts["repeticiones"]):
+            inicio = inicio_dia + timedelta(hours=9, minutes=15 * rnd.randrange(32))
+            t = perf_counter()
+            candidatos = sugerir_instructores(
+                centro, hoy, rnd.choice(["ski", "snow"]), rnd.randint(1, 3),
+                inicio, inicio + timedelta(minutes=rnd.choice([60, 90, 120])),
+                idioma=rnd.choice([None, "inglés"]),
+            )
+            caliente.append(perf_counter() - t)
+            encontrados += bool(candidatos)
+
+        busqueda = []
+        for _ in range(opts["repeticiones"]):
+            t = perf_counter()
+            buscar_horarios(
+                centro, hoy, rnd.choice([60, 120, 180]), rnd.choice(["ski", "snow"]), rnd.randint(1, 3),
+                idioma=rnd.choice([None, "inglés"]),
+            )
+            busqueda.append(perf_counter() - t)
+
+        self.stdout.write(
+            f"{opts['instructores']} instructores activos, {len(clases)} clases "
+            f"(cache: {settings.CACHES['default']['BACKEND']})"
+        )
+        self.stdout.write("armar mapa del día (cache frío): p50=%.2f ms  p95=%.2f ms" % _percentiles(frio))
+        self.stdout.write("sugerir (mapa en cache):        p50=%.2f ms  p95=%.2f ms" % _percentiles(caliente))
+        self.stdout.write("buscar horarios (mapa en cache): p50=%.2f ms  p95=%.2f ms" % _percentiles(busqueda))
+        self.stdout.write(f"  con al menos un candidato: {encontrados}/{opts['repeticiones']}")
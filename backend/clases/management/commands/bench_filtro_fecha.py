@@ -0,0 +1,92 @@
+import random
+from datetime import timedelta
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils.timezone import localdate
+
+from centros.models import CentroDeEsqui
+from clases.models import Clase, limites_del_dia
+from usuarios.models import Usuario, Identificador
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara hora_inicio__date=fecha contra Clase.objects.del_dia(fecha) sobre una tabla "
+        "sintética. Todo corre dentro de una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--filas", type=int, default=1_000_000)
+        parser.add_argument("--dias", type=int, default=365, help="Días sobre los que se reparten las clases.")
+        parser.add_argument("--repeticiones", type=int, default=20)
+        parser.add_argument("--semilla", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        try:
+            with transaction.atomic():
+                self._correr(opts)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _correr(self, opts):
+        rnd = random.Random(opts["semilla"])
+        hoy = localdate()
+
+        centro = CentroDeEsqui.objects.create(nombre_centro="bench", ubicacion="bench")
+        tipo, _ = Identificador.objects.get_or_create(tipo_de_usuario="instructor")
+        instructores = Usuario.objects.bulk_create([
+            Usuario(rut_usuario=f"bench-{i}", nombre="Bench", apellido=str(i),
+                    tipo_de_usuario=tipo, id_centro=centro)
+            for i in range(200)
+        ])
+
+        self.stdout.write(f"Generando {opts['filas']} clases en {opts['dias']} días...")
+        t0 = perf_counter()
+        lote = []
+        for _ in range(opts["filas"]):
+            dia = hoy - timedelta(days=rnd.randrange(opts["dias"]))
+            inicio, _fin = limites_del_dia(dia)
+            inicio += timedelta(hours=9, minutes=30 * rnd.randrange(16))
+            lote.append(Clase(
+                nombre_titular="bench", titular_telefono="0",
+                nivel_clase=1, disciplina_clase="ski",
+                hora_inicio=inicio, hora_fin=inicio + timedelta(minutes=60), duracion=60,
+                cantidad_alumnos=1, rut_usuario=rnd.choice(instructores), id_centro=centro,
+            ))
+            if len(lote) >= 10_000:
+                Clase.objects.bulk_create(lote)
+                lote = []
+        if lote:
+            Clase.objects.bulk_create(lote)
+        self.stdout.write(f"  listo en {perf_counter() - t0:.1f}s")
+
+        if connection.vendor in ("sqlite", "postgresql"):
+            with connection.cursor() as cur:
+                cur.execute("ANALYZE")
+
+        fechas = [hoy - timedelta(days=rnd.randrange(opts["dias"])) for _ in range(opts["repeticiones"])]
+        consultas = {
+            "hora_inicio__date": lambda f: Clase.objects.filter(hora_inicio__date=f),
+            "del_dia (rango)": lambda f: Clase.objects.del_dia(f),
+        }
+
+        for nombre, consulta in consultas.items():
+            plan = consulta(hoy).explain()
+            tiempos = []
+            filas = 0
+            for f in fechas:
+                t = perf_counter()
+                filas += len(list(consulta(f).values_list("id_clase", flat=True)))
+                tiempos.append(perf_counter() - t)
+            tiempos.sort()
+            p50 = tiempos[len(tiempos) // 2] * 1000
+            p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))] * 1000
+            self.stdout.write(f"\n{nombre}: p50={p50:.2f} ms  p95={p95:.2f} ms  filas/día≈{filas // len(fechas)}")
+            self.stdout.write(f"  plan: {plan}")
@@ -0,0 +1,88 @@
+import random
+from datetime import datetime, timedelta
+from time import perf_counter
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import make_aware, get_current_timezone, localdate
+
+from clases.grilla import GrillaHorario
+
+
+def _grilla_anterior(fecha, horas, instructores_ids, clases):
+    """Algoritmo previo: re-parsea cada bloque por cada clase (O(clases × bloques))."""
+    horario = {rut: {slot: None for slot in horas} for rut in instructores_ids}
+    tz = get_current_timezone()
+    for clase in clases:
+        inst_id = clase.rut_usuario_id
+        if inst_id not in horario:
+            continue
+        inicio, fin = clase.hora_inicio, clase.hora_fin
+        for slot_str in horas:
+            slot_naive = datetime.strptime(f"{fecha} {slot_str}", "%Y-%m-%d %H:%M")
+            slot_inicio = make_aware(slot_naive, timezone=tz)
+            slot_fin = slot_inicio + timedelta(minutes=30)
+            if (slot_inicio < fin) and (slot_fin > inicio):
+                horario[inst_id][slot_str] = clase
+    return horario
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el armado de la grilla diaria (GrillaHorario) contra el algoritmo "
+        "anterior, con clases sintéticas en memoria (no toca la base de datos)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clases", type=int, nargs="+", default=[100, 200, 400, 800, 1600, 3200],
+            help="Cantidades de clases a medir.",
+        )
+        parser.add_argument("--repeticiones", type=int, default=5)
+        parser.add_argument("--semilla", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        rnd = random.Random(opts["semilla"])
+        fecha = localdate()
+        grilla = GrillaHorario(fecha)
+
+        self.stdout.write(f"{'clases':>8} {'anterior ms':>12} {'grilla ms':>10} {'µs/clase':>9}")
+        por_clase = []
+        for n in opts["clases"]:
+            # ~3 clases por instructor, como en un día cargado
+            ruts = [f"inst-{i}" for i in range(max(1, n // 3))]
+            clases = []
+            for _ in range(n):
+                inicio = grilla.inicio + timedelta(minutes=30 * rnd.randrange(len(grilla)))
+                duracion = 30 * rnd.randint(1, 4)
+                clases.append(SimpleNamespace(
+                    rut_usuario_id=rnd.choice(ruts),
+                    hora_inicio=inicio,
+                    hora_fin=inicio + timedelta(minutes=duracion),
+                ))
+
+            t_anterior = self._medir(
+                lambda: _grilla_anterior(fecha, grilla.horas, ruts, clases), opts["repeticiones"]
+            )
+            t_grilla = self._medir(lambda: grilla.celdas(ruts, clases), opts["repeticiones"])
+            por_clase.append(t_grilla / n)
+
+            self.stdout.write(
+                f"{n:>8} {t_anterior * 1000:>12.2f} {t_grilla * 1000:>10.3f} "
+                f"{t_grilla / n * 1e6:>9.2f}"
+            )
+
+        # Escala lineal: el costo por clase se mantiene ~constante al crecer n
+        self.stdout.write(
+            f"costo por clase (máx/mín): {max(por_clase) / min(por_clase):.2f}x"
+        )
+
+    @staticmethod
+    def _medir(fn, repeticiones):
+        mejor = None
+        for _ in range(repeticiones):
+            t0 = perf_counter()
+            fn()
+            dt = perf_counter() - t0
+            mejor = dt if mejor is None else min(mejor, dt)
+        return mejor
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from clases.models import ClaseEliminada
+from clases.sync import RETENCION_ELIMINADAS
+
+
+class Command(BaseCommand):
+    help = "Borra las marcas de clases eliminadas más viejas que la retención de la sincronización."
+
+    def handle(self, *args, **opts):
+        borradas, _ = ClaseEliminada.objects.filter(eliminada_en__lt=now() - RETENCION_ELIMINADAS).delete()
+        self.stdout.write(self.style.SUCCESS(f"{borradas} marcas borradas."))
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from clases.resumen import reconstruir
+
+
+class Command(BaseCommand):
+    help = (
+        "Rearma la tabla ResumenDiarioInstructor desde Clase (completa o entre "
+        "--desde y --hasta). Útil tras cargas masivas o para verificar el resumen."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--desde", help="YYYY-MM-DD")
+        parser.add_argument("--hasta", help="YYYY-MM-DD")
+
+    def handle(self, *args, **opts):
+        try:
+            desde = datetime.strptime(opts["desde"], "%Y-%m-%d").date() if opts["desde"] else None
+            hasta = datetime.strptime(opts["hasta"], "%Y-%m-%d").date() if opts["hasta"] else None
+        except ValueError:
+            raise CommandError("Formato de fecha inválido. Usa YYYY-MM-DD.")
+        if bool(desde) != bool(hasta):
+            raise CommandError("Indica --desde y --hasta juntos, o ninguno.")
+
+        filas = reconstruir(desde, hasta)
+        self.stdout.write(self.style.SUCCESS(f"Resumen reconstruido: {filas} filas."))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+
+# Solo PostgreSQL: impide a nivel de base que un instructor tenga dos clases cruzadas.
+# En SQLite la validación queda en clases/conflictos.py.
+def crear_exclusion(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.execute(
+        'ALTER TABLE clases_clase ADD CONSTRAINT clase_sin_solape_instructor '
+        'EXCLUDE USING gist ("Rut_Usuario" WITH =, tstzrange(hora_inicio, hora_fin, \'[)\') WITH &&)'
+    )
+
+
+def borrar_exclusion(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "ALTER TABLE clases_clase DROP CONSTRAINT IF EXISTS clase_sin_solape_instructor"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clases', '0001_initial'),
+        ('usuarios', '0006_alter_usuario_contraseña_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clase',
+            index=models.Index(fields=['rut_usuario', 'hora_inicio', 'hora_fin'], name='clase_inst_intervalo_idx'),
+        ),
+        migrations.RunPython(crear_exclusion, borrar_exclusion),
+    ]
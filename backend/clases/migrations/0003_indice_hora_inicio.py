@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clases', '0002_indice_intervalo_instructor'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='clase',
+            name='hora_inicio',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
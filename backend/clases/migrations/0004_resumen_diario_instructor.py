@@ -0,0 +1,66 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def llenar_resumen(apps, schema_editor):
+    # mismo armado que clases.resumen.reconstruir: una sola agregación sobre Clase,
+    # para que los reportes no queden vacíos hasta correr reconstruir_resumen
+    Clase = apps.get_model("clases", "Clase")
+    ResumenDiarioInstructor = apps.get_model("clases", "ResumenDiarioInstructor")
+    filas = (
+        Clase.objects
+        .annotate(fecha=TruncDate("hora_inicio"))  # día local (TIME_ZONE del proyecto)
+        .values("rut_usuario_id", "fecha", "disciplina_clase")
+        .annotate(
+            minutos=Sum("duracion"),
+            clases=Count("id_clase"),
+            alumnos=Sum("cantidad_alumnos"),
+        )
+        .order_by()
+    )
+    ResumenDiarioInstructor.objects.bulk_create(
+        (
+            ResumenDiarioInstructor(
+                rut_usuario_id=f["rut_usuario_id"],
+                fecha=f["fecha"],
+                disciplina_clase=f["disciplina_clase"],
+                minutos=f["minutos"] or 0,
+                clases=f["clases"],
+                alumnos=f["alumnos"] or 0,
+            )
+            for f in filas.iterator(chunk_size=2000)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clases', '0003_indice_hora_inicio'),
+        ('usuarios', '0006_alter_usuario_contraseña_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenDiarioInstructor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('disciplina_clase', models.CharField(max_length=20)),
+                ('minutos', models.IntegerField(default=0)),
+                ('clases', models.IntegerField(default=0)),
+                ('alumnos', models.IntegerField(default=0)),
+                ('rut_usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes_diarios', to='usuarios.usuario')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fecha', 'rut_usuario'], name='resumen_fecha_inst_idx')],
+                'constraints': [models.UniqueConstraint(fields=('rut_usuario', 'fecha', 'disciplina_clase'), name='resumen_inst_dia_disciplina_uniq')],
+            },
+        ),
+        migrations.RunPython(llenar_resumen, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clases', '0004_resumen_diario_instructor'),
+        ('usuarios', '0006_alter_usuario_contraseña_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clase',
+            index=models.Index(fields=['hora_inicio', 'id_clase'], name='clase_inicio_id_idx'),
+        ),
+    ]
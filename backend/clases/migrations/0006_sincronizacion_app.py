@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clases', '0005_indice_historial'),
+        ('usuarios', '0006_alter_usuario_contraseña_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaseEliminada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('id_clase', models.IntegerField()),
+                ('rut_usuario', models.CharField(max_length=20)),
+                ('eliminada_en', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='clase',
+            name='actualizada_en',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='clase',
+            index=models.Index(fields=['rut_usuario', 'actualizada_en'], name='clase_inst_actualizada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='claseeliminada',
+            index=models.Index(fields=['rut_usuario', 'eliminada_en'], name='eliminada_inst_fecha_idx'),
+        ),
+    ]
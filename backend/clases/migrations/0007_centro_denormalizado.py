@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copiar_centro_del_instructor(apps, schema_editor):
+    # un solo UPDATE con subconsulta: no trae filas a Python
+    Clase = apps.get_model("clases", "Clase")
+    Usuario = apps.get_model("usuarios", "Usuario")
+    Clase.objects.update(id_centro=Subquery(
+        Usuario.objects.filter(pk=OuterRef("rut_usuario")).values("id_centro")[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('centros', '0002_horario_grilla'),
+        ('clases', '0006_sincronizacion_app'),
+        ('usuarios', '0008_correo_normalizado_unico'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clase',
+            name='id_centro',
+            field=models.ForeignKey(blank=True, db_column='Id_Centro', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='clases', to='centros.centrodeesqui'),
+        ),
+        migrations.RunPython(copiar_centro_del_instructor, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='clase',
+            index=models.Index(fields=['id_centro', 'hora_inicio'], name='clase_centro_inicio_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def rearmar(apps, campos):
+    # mismo armado que clases.resumen.reconstruir, agrupando por `campos`
+    Clase = apps.get_model("clases", "Clase")
+    ResumenDiarioInstructor = apps.get_model("clases", "ResumenDiarioInstructor")
+    filas = (
+        Clase.objects
+        .annotate(fecha=TruncDate("hora_inicio"))  # día local (TIME_ZONE del proyecto)
+        .values(*campos)
+        .annotate(
+            minutos=Sum("duracion"),
+            clases=Count("id_clase"),
+            alumnos=Sum("cantidad_alumnos"),
+        )
+        .order_by()
+    )
+    ResumenDiarioInstructor.objects.all().delete()
+    ResumenDiarioInstructor.objects.bulk_create(
+        (
+            ResumenDiarioInstructor(
+                rut_usuario_id=f["rut_usuario_id"],
+                fecha=f["fecha"],
+                disciplina_clase=f["disciplina_clase"],
+                id_centro_id=f.get("id_centro_id"),
+                minutos=f["minutos"] or 0,
+                clases=f["clases"],
+                alumnos=f["alumnos"] or 0,
+            )
+            for f in filas.iterator(chunk_size=2000)
+        ),
+        batch_size=1000,
+    )
+
+
+def rearmar_por_centro(apps, schema_editor):
+    # las filas existentes no distinguen centro: se rearman desde Clase, ahora
+    # agrupando también por Clase.id_centro
+    rearmar(apps, ["rut_usuario_id", "fecha", "disciplina_clase", "id_centro_id"])
+
+
+def rearmar_sin_centro(apps, schema_editor):
+    # de vuelta a una fila por instructor × día × disciplina (la restricción anterior)
+    rearmar(apps, ["rut_usuario_id", "fecha", "disciplina_clase"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('centros', '0002_horario_grilla'),
+        ('clases', '0007_centro_denormalizado'),
+        ('usuarios', '0008_correo_normalizado_unico'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='resumendiarioinstructor',
+            name='resumen_inst_dia_disciplina_uniq',
+        ),
+        migrations.AddField(
+            model_name='resumendiarioinstructor',
+            name='id_centro',
+            field=models.ForeignKey(blank=True, db_column='Id_Centro', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='resumenes_diarios', to='centros.centrodeesqui'),
+        ),
+        migrations.RunPython(rearmar_por_centro, rearmar_sin_centro),
+        migrations.AddIndex(
+            model_name='resumendiarioinstructor',
+            index=models.Index(fields=['id_centro', 'fecha'], name='resumen_centro_fecha_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumendiarioinstructor',
+            constraint=models.UniqueConstraint(fields=('rut_usuario', 'fecha', 'disciplina_clase', 'id_centro'), name='resumen_inst_dia_disc_centro_uniq'),
+        ),
+    ]
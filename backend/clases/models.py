@@ -1,5 +1,38 @@
+from datetime import datetime, timedelta, time as dtime
+
 from django.db import models
-from usuarios.models import Usuario
+from django.utils.timezone import make_aware, get_current_timezone
+
+from centros.models import CentroDeEsqui, PorCentroQuerySet
+from usuarios.models import Usuario, copiar_centro
+
+
+def limites_del_dia(fecha, tz=None):
+    """
+    [inicio, fin) aware del día local `fecha` (America/Santiago por defecto).
+    Permite filtrar por rango sobre hora_inicio y usar su índice, en vez de
+    hora_inicio__date que envuelve la columna en una conversión de zona horaria.
+    """
+    tz = tz or get_current_timezone()
+    inicio = make_aware(datetime.combine(fecha, dtime.min), timezone=tz)
+    fin = make_aware(datetime.combine(fecha + timedelta(days=1), dtime.min), timezone=tz)
+    return inicio, fin
+
+
+class ClaseQuerySet(PorCentroQuerySet):
+    campo_centro = "id_centro"
+
+    def del_dia(self, fecha, tz=None):
+        """Clases que parten en el día local `fecha`."""
+        inicio, fin = limites_del_dia(fecha, tz)
+        return self.filter(hora_inicio__gte=inicio, hora_inicio__lt=fin)
+
+    def en_rango(self, desde, hasta, tz=None):
+        """Clases que parten entre los días locales desde y hasta (ambos inclusive)."""
+        inicio, _ = limites_del_dia(desde, tz)
+        _, fin = limites_del_dia(hasta, tz)
+        return self.filter(hora_inicio__gte=inicio, hora_inicio__lt=fin)
+
 
 class Clase(models.Model):
     id_clase = models.AutoField(primary_key=True)
@@ -13,7 +46,7 @@ class Clase(models.Model):
         choices=[("ski", "Ski"), ("snow", "Snow")]
     )
 
-    hora_inicio = models.DateTimeField()
+    hora_inicio = models.DateTimeField(db_index=True)
     hora_fin = models.DateTimeField()
     duracion = models.IntegerField()  # en minutos
 
@@ -27,5 +60,114 @@ class Clase(models.Model):
         related_name="clases_asignadas"
     )
 
+    # Centro del instructor, copiado al guardar: las consultas por centro (y día)
+    # usan el índice (id_centro, hora_inicio) sin join con Usuario
+    id_centro = models.ForeignKey(
+        CentroDeEsqui,
+        on_delete=models.PROTECT,
+        db_column="Id_Centro",
+        null=True,
+        blank=True,
+        related_name="clases",
+    )
+
+    # última modificación; la usa la sincronización incremental de la app (clases/sync.py)
+    actualizada_en = models.DateTimeField(auto_now=True)
+
+    objects = ClaseQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # detección de solapes por instructor (ver clases/conflictos.py)
+            models.Index(fields=["rut_usuario", "hora_inicio", "hora_fin"], name="clase_inst_intervalo_idx"),
+            # paginación keyset del historial (director/paginacion.py)
+            models.Index(fields=["hora_inicio", "id_clase"], name="clase_inicio_id_idx"),
+            # cambios de un instructor desde cierto momento (sync de la app)
+            models.Index(fields=["rut_usuario", "actualizada_en"], name="clase_inst_actualizada_idx"),
+            # grilla y reportes de un centro (PorCentroQuerySet.del_centro + del_dia / en_rango)
+            models.Index(fields=["id_centro", "hora_inicio"], name="clase_centro_inicio_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # fila antes del cambio: la usan copiar_centro y las señales (si cambia de
+        # instructor, horario o centro hay que invalidar también lo de antes)
+        self._grilla_anterior = None
+        if self.pk is not None:
+            self._grilla_anterior = (
+                Clase.objects.filter(pk=self.pk)
+                .values_list("rut_usuario_id", "hora_inicio", "id_centro_id")
+                .first()
+            )
+        # bulk_create no pasa por aquí: las cargas masivas ponen id_centro a mano
+        copiar_centro(self, "rut_usuario", kwargs, self._grilla_anterior and self._grilla_anterior[0])
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Clase {self.id_clase} - {self.disciplina_clase} nivel {self.nivel_clase}"
+
+
+class ClaseEliminada(models.Model):
+    """
+    Marca de una clase que ya no está en la agenda de un instructor (borrada o
+    reasignada a otro), para que la app la saque en la próxima sincronización.
+    """
+    id_clase = models.IntegerField()
+    # sin FK: la marca tiene que sobrevivir aunque se borre el instructor
+    rut_usuario = models.CharField(max_length=20)
+    eliminada_en = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["rut_usuario", "eliminada_en"], name="eliminada_inst_fecha_idx")]
+
+    def __str__(self):
+        return f"Clase {self.id_clase} eliminada para {self.rut_usuario}"
+
+
+class ResumenQuerySet(PorCentroQuerySet):
+    campo_centro = "id_centro"
+
+
+class ResumenDiarioInstructor(models.Model):
+    """
+    Totales por instructor × día × disciplina, mantenidos por señales de Clase
+    (ver clases/resumen.py). Los reportes suman estas filas en vez de recorrer Clase.
+    """
+    rut_usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.CASCADE,
+        related_name="resumenes_diarios",
+    )
+    fecha = models.DateField()  # día local de hora_inicio
+    disciplina_clase = models.CharField(max_length=20)
+    # centro de las clases (Clase.id_centro), no el actual del instructor: si se
+    # cambia de centro, sus horas ya hechas siguen contando en el de antes
+    id_centro = models.ForeignKey(
+        CentroDeEsqui,
+        on_delete=models.PROTECT,
+        db_column="Id_Centro",
+        null=True,
+        blank=True,
+        related_name="resumenes_diarios",
+    )
+
+    minutos = models.IntegerField(default=0)
+    clases = models.IntegerField(default=0)
+    alumnos = models.IntegerField(default=0)
+
+    objects = ResumenQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["rut_usuario", "fecha", "disciplina_clase", "id_centro"],
+                name="resumen_inst_dia_disc_centro_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["fecha", "rut_usuario"], name="resumen_fecha_inst_idx"),
+            # reportes de un centro (PorCentroQuerySet.del_centro + rango de fechas)
+            models.Index(fields=["id_centro", "fecha"], name="resumen_centro_fecha_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.rut_usuario_id} {self.fecha} {self.disciplina_clase}: {self.minutos} min"
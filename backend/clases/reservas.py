@@ -0,0 +1,143 @@
+from datetime import date, datetime, timedelta, time as dtime
+
+from django.db import IntegrityError, transaction
+from django.utils.timezone import make_aware, get_current_timezone
+
+from director.models import EstadoInstructor
+from usuarios.models import Usuario
+from .conflictos import solapes_en_lote
+from .models import Clase
+from .signals import clases_cambiadas
+
+# Reserva de varias clases en una operación: paquetes de varios días (5 mañanas
+# para la misma familia) o un grupo repartido entre instructores. Todo el lote se
+# valida junto con una consulta por tipo de dato (instructores, asistencia,
+# solapes) y se inserta con un bulk_create: el costo no crece con cada clase como
+# lo haría repetir crear_clase.
+
+MAX_RESERVAS_POR_LOTE = 60
+
+DISCIPLINAS = ("ski", "snow")
+
+
+def leer_reserva(datos):
+    """
+    Una reserva del JSON (mismos campos que el formulario de crear_clase) ->
+    dict con los datos de la clase. ValueError con el motivo si algo no sirve.
+    """
+    try:
+        fecha = date.fromisoformat(datos["fecha"])
+        hh, mm = map(int, datos["hora_sola"].split(":"))
+        inicio = make_aware(datetime.combine(fecha, dtime(hh, mm)), timezone=get_current_timezone())
+        duracion = int(datos["duracion"])
+        nivel = int(datos["nivel_clase"])
+        alumnos = int(datos["cantidad_alumnos"])
+        reserva = {
+            "rut": str(datos["rut_usuario"]),
+            "fecha": fecha,
+            "inicio": inicio,
+            "fin": inicio + timedelta(minutes=duracion),
+            "duracion": duracion,
+            "nivel_clase": nivel,
+            "cantidad_alumnos": alumnos,
+            "disciplina_clase": datos["disciplina_clase"],
+            "nombre_titular": str(datos["nombre_titular"]).strip(),
+            "titular_telefono": str(datos["titular_telefono"]).strip(),
+        }
+    except KeyError as e:
+        raise ValueError(f"Falta el campo {e.args[0]}.")
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError("Formato inválido en fecha/hora/duración/nivel/alumnos.")
+
+    if reserva["disciplina_clase"] not in DISCIPLINAS:
+        raise ValueError("Disciplina inválida.")
+    if duracion <= 0 or alumnos <= 0:
+        raise ValueError("La duración y la cantidad de alumnos deben ser positivas.")
+    if not reserva["nombre_titular"]:
+        raise ValueError("Falta el nombre del titular.")
+    return reserva
+
+
+def reservar_lote(centro, reservas, todo_o_nada=False):
+    """
+    Valida y crea varias clases juntas. `reservas` son dicts como los de
+    leer_reserva. Retorna una lista con un resultado por reserva, en el mismo
+    orden: {"ok": True, "id_clase": ...} o {"ok": False, "error": ...}.
+
+    Revisa que el instructor sea del centro y esté activo ese día, y que no se
+    cruce con sus clases ni con otra reserva del mismo lote. Con todo_o_nada no
+    se crea ninguna si alguna falla (ej: un paquete que se vende completo o no se vende).
+    """
+    resultados = [None] * len(reservas)
+    leidas = {}
+    for i, datos in enumerate(reservas):
+        try:
+            leidas[i] = leer_reserva(datos)
+        except ValueError as e:
+            resultados[i] = {"ok": False, "error": str(e)}
+
+    ruts = {r["rut"] for r in leidas.values()}
+    fechas = {r["fecha"] for r in leidas.values()}
+    instructores = {
+        rut: (nombre, centro_id)
+        for rut, nombre, centro_id in Usuario.objects.del_centro(centro)
+        .filter(rut_usuario__in=ruts)
+        .values_list("rut_usuario", "nombre", "id_centro")
+    }
+    activos = set(
+        EstadoInstructor.objects.del_centro(centro)
+        .filter(instructor_id__in=ruts, fecha__in=fechas, activo=True)
+        .values_list("instructor_id", "fecha")
+    )
+
+    candidatas = []
+    for i, r in leidas.items():
+        if r["rut"] not in instructores:
+            resultados[i] = {"ok": False, "error": "Instructor no encontrado."}
+        elif (r["rut"], r["fecha"]) not in activos:
+            nombre = instructores[r["rut"]][0]
+            resultados[i] = {"ok": False, "error": f"El instructor {nombre} no está activo el {r['fecha']:%d-%m-%Y}."}
+        else:
+            candidatas.append(i)
+
+    conflictos = solapes_en_lote([(leidas[i]["rut"], leidas[i]["inicio"], leidas[i]["fin"]) for i in candidatas])
+    for pos, motivo in conflictos.items():
+        resultados[candidatas[pos]] = {"ok": False, "error": motivo}
+    candidatas = [i for pos, i in enumerate(candidatas) if pos not in conflictos]
+
+    if todo_o_nada and len(candidatas) < len(reservas):
+        for i in candidatas:
+            resultados[i] = {"ok": False, "error": "No se reservó: otras clases del lote tienen errores."}
+        return resultados
+    if not candidatas:
+        return resultados
+
+    nuevas = [
+        Clase(
+            nombre_titular=leidas[i]["nombre_titular"],
+            titular_telefono=leidas[i]["titular_telefono"],
+            nivel_clase=leidas[i]["nivel_clase"],
+            disciplina_clase=leidas[i]["disciplina_clase"],
+            hora_inicio=leidas[i]["inicio"],
+            hora_fin=leidas[i]["fin"],
+            duracion=leidas[i]["duracion"],
+            cantidad_alumnos=leidas[i]["cantidad_alumnos"],
+            rut_usuario_id=leidas[i]["rut"],
+            id_centro_id=instructores[leidas[i]["rut"]][1],  # bulk_create no pasa por save()
+        )
+        for i in candidatas
+    ]
+    try:
+        # en PostgreSQL la restricción de exclusión cubre la carrera con otra boletería
+        with transaction.atomic():
+            Clase.objects.bulk_create(nuevas)
+    except IntegrityError:
+        for i in candidatas:
+            resultados[i] = {"ok": False, "error": "Otra reserva tomó uno de esos horarios; vuelve a intentar."}
+        return resultados
+
+    for i, clase in zip(candidatas, nuevas):
+        resultados[i] = {"ok": True, "id_clase": clase.pk}
+    # bulk_create no dispara señales: grilla, resumen y pantallas en vivo a mano
+    clases_cambiadas((clase.rut_usuario_id, clase.hora_inicio, clase.id_centro_id) for clase in nuevas)
+    return resultados
@@ -0,0 +1,91 @@
+from django.db import transaction
+from django.db.models import Sum, Count
+from django.db.models.functions import TruncDate
+
+from .models import Clase, ResumenDiarioInstructor
+
+
+def recalcular_dias(pares):
+    """
+    Recalcula el resumen de los (rut_instructor, fecha) afectados a partir de sus
+    clases: una agregación, un delete y un insert para todo el lote. Se rehace el
+    cruce instructores × fechas (incluye los pares pedidos; rehacer uno de más no
+    cambia nada), así que una reserva de varios días cuesta lo mismo que una.
+    """
+    pares = set(pares)
+    if not pares:
+        return
+    ruts = {rut for rut, _fecha in pares}
+    fechas = {fecha for _rut, fecha in pares}
+
+    filas = (
+        Clase.objects.en_rango(min(fechas), max(fechas))
+        .filter(rut_usuario_id__in=ruts)
+        .annotate(fecha=TruncDate("hora_inicio"))
+        .values("rut_usuario_id", "fecha", "disciplina_clase", "id_centro_id")
+        .annotate(
+            minutos=Sum("duracion"),
+            clases=Count("id_clase"),
+            alumnos=Sum("cantidad_alumnos"),
+        )
+        .order_by()
+    )
+    nuevos = [
+        ResumenDiarioInstructor(
+            rut_usuario_id=f["rut_usuario_id"],
+            fecha=f["fecha"],
+            disciplina_clase=f["disciplina_clase"],
+            id_centro_id=f["id_centro_id"],
+            minutos=f["minutos"] or 0,
+            clases=f["clases"],
+            alumnos=f["alumnos"] or 0,
+        )
+        for f in filas
+        if f["fecha"] in fechas
+    ]
+    with transaction.atomic():
+        ResumenDiarioInstructor.objects.filter(rut_usuario_id__in=ruts, fecha__in=fechas).delete()
+        ResumenDiarioInstructor.objects.bulk_create(nuevos)
+
+
+def reconstruir(desde=None, hasta=None):
+    """
+    Rearma el resumen completo (o solo entre los días desde y hasta) con una sola
+    agregación sobre Clase. Retorna la cantidad de filas creadas.
+    """
+    clases = Clase.objects.all()
+    resumen = ResumenDiarioInstructor.objects.all()
+    if desde and hasta:
+        clases = clases.en_rango(desde, hasta)
+        resumen = resumen.filter(fecha__gte=desde, fecha__lte=hasta)
+
+    filas = (
+        clases
+        .annotate(fecha=TruncDate("hora_inicio"))  # día local (TIME_ZONE del proyecto)
+        .values("rut_usuario_id", "fecha", "disciplina_clase", "id_centro_id")
+        .annotate(
+            minutos=Sum("duracion"),
+            clases=Count("id_clase"),
+            alumnos=Sum("cantidad_alumnos"),
+        )
+        .order_by()
+    )
+
+    with transaction.atomic():
+        resumen.delete()
+        creadas = ResumenDiarioInstructor.objects.bulk_create(
+            (
+                ResumenDiarioInstructor(
+                    rut_usuario_id=f["rut_usuario_id"],
+                    fecha=f["fecha"],
+                    disciplina_clase=f["disciplina_clase"],
+                    id_centro_id=f["id_centro_id"],
+                    minutos=f["minutos"] or 0,
+                    clases=f["clases"],
+                    alumnos=f["alumnos"] or 0,
+                )
+                for f in filas.iterator(chunk_size=2000)
+            ),
+            batch_size=1000,
+        )
+    return len(creadas)
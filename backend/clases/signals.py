@@ -0,0 +1,91 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils.timezone import localtime
+
+from centros.models import CentroDeEsqui
+from director.models import EstadoInstructor
+from usuarios.models import Usuario
+from . import cache_grilla, eventos, resumen
+from .models import Clase, ClaseEliminada
+
+
+def invalidar_clases(clases):
+    """
+    Invalida la grilla para cada (rut_instructor, hora_inicio, centro_id) afectado.
+    El centro es el de la clase: el instructor puede haberse cambiado de centro
+    después. Retorna los (centro_id, fecha) tocados.
+    """
+    tocados = {(centro_id, localtime(hora_inicio).date()) for _rut, hora_inicio, centro_id in clases}
+    for centro_id, fecha in tocados:
+        cache_grilla.invalidar_dia(centro_id, fecha)
+    return tocados
+
+
+def clases_cambiadas(clases, evento=None):
+    """
+    Todo lo que depende de Clase para cada (rut_instructor, hora_inicio, centro_id)
+    tocado: grilla cacheada, resumen diario y pantallas en vivo (por defecto se les
+    pide recargar). La usan las escrituras masivas (bulk_create / update no disparan señales).
+    """
+    clases = list(clases)
+    for centro_id, fecha in invalidar_clases(clases):
+        eventos.publicar(centro_id, fecha, evento or eventos.evento_recargar())
+    resumen.recalcular_dias((rut, localtime(hora_inicio).date()) for rut, hora_inicio, _centro in clases)
+
+
+@receiver([post_save, post_delete], sender=Clase)
+def invalidar_grilla_clase(sender, instance, **kwargs):
+    fecha = localtime(instance.hora_inicio).date()
+    centro_id = instance.id_centro_id
+    borrada = kwargs.get("signal") is post_delete
+
+    # si cambió de día o de centro, primero se saca de la grilla donde estaba
+    # (Clase.save deja la fila de antes en _grilla_anterior)
+    anterior = getattr(instance, "_grilla_anterior", None)
+    if anterior and anterior != (instance.rut_usuario_id, instance.hora_inicio, centro_id):
+        clases_cambiadas([anterior], eventos.evento_borrado(instance.pk))
+
+    cache_grilla.invalidar_dia(centro_id, fecha)
+    resumen.recalcular_dias([(instance.rut_usuario_id, fecha)])
+    eventos.publicar(
+        centro_id, fecha,
+        eventos.evento_borrado(instance.pk) if borrada else eventos.evento_clase(instance),
+    )
+
+    # la app del instructor que la tenía tiene que sacarla en su próxima sync
+    if borrada:
+        ClaseEliminada.objects.create(id_clase=instance.pk, rut_usuario=instance.rut_usuario_id)
+    elif anterior and anterior[0] != instance.rut_usuario_id:
+        ClaseEliminada.objects.create(id_clase=instance.pk, rut_usuario=anterior[0])
+
+
+@receiver([post_save, post_delete], sender=EstadoInstructor)
+def invalidar_grilla_estado(sender, instance, **kwargs):
+    centro_id = instance.id_centro_id
+    cache_grilla.invalidar_dia(centro_id, instance.fecha)
+    activo = instance.activo and kwargs.get("signal") is not post_delete
+    eventos.publicar(centro_id, instance.fecha, eventos.evento_estados({instance.instructor_id: activo}))
+
+
+@receiver(pre_save, sender=Usuario)
+def recordar_centro_anterior(sender, instance, update_fields=None, **kwargs):
+    # si el instructor se cambia de centro también sale de la grilla del centro de antes
+    instance._centro_anterior = instance.id_centro_id
+    if update_fields is None or "id_centro" in update_fields:
+        instance._centro_anterior = (
+            Usuario.objects.filter(pk=instance.pk).values_list("id_centro", flat=True).first()
+        )
+
+
+@receiver([post_save, post_delete], sender=Usuario)
+def invalidar_grilla_instructor(sender, instance, **kwargs):
+    cache_grilla.invalidar_centro(instance.id_centro_id)
+    anterior = getattr(instance, "_centro_anterior", instance.id_centro_id)
+    if anterior != instance.id_centro_id:
+        cache_grilla.invalidar_centro(anterior)
+
+
+@receiver(post_save, sender=CentroDeEsqui)
+def invalidar_grilla_centro(sender, instance, **kwargs):
+    # cambia horario de apertura / ancho de bloque
+    cache_grilla.invalidar_centro(instance.pk)
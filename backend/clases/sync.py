@@ -0,0 +1,93 @@
+import hashlib
+from datetime import datetime, timedelta
+
+from django.db.models import Count, Max
+from django.utils.timezone import now, localdate
+
+from .models import Clase, ClaseEliminada, limites_del_dia
+
+# Las filas se marcan con la hora del servidor al guardarse, pero una transacción
+# puede confirmarse un poco después de esa hora. Cada sincronización vuelve a
+# pedir este margen hacia atrás; la app aplica los cambios por id_clase, así que
+# recibir una clase dos veces no importa.
+MARGEN_SYNC = timedelta(seconds=30)
+
+# Las marcas de clases eliminadas se guardan este tiempo (ver purgar_clases_eliminadas).
+# Un token más viejo no puede saber qué se borró y recibe la agenda completa.
+RETENCION_ELIMINADAS = timedelta(days=30)
+
+
+def serializar_clase(c):
+    return {
+        "id_clase": c.id_clase,
+        "hora_inicio": c.hora_inicio.isoformat(),
+        "hora_fin": c.hora_fin.isoformat(),
+        "disciplina_clase": c.disciplina_clase,
+        "nivel_clase": c.nivel_clase,
+        "nombre_titular": c.nombre_titular,
+        "titular_telefono": c.titular_telefono,
+        "cantidad_alumnos": c.cantidad_alumnos,
+    }
+
+
+def leer_token(token):
+    """Token de sync -> datetime aware, o None si no viene o no es válido."""
+    if not token:
+        return None
+    try:
+        momento = datetime.fromisoformat(token)
+    except ValueError:
+        return None
+    return momento if momento.tzinfo else None
+
+
+def cambios_desde(rut, desde=None):
+    """
+    Cambios en la agenda del instructor desde el token `desde`.
+    Sin token retorna la agenda completa desde hoy (primera sincronización).
+    """
+    generado = now()
+    clases = Clase.objects.filter(rut_usuario_id=rut)
+    eliminadas = []
+
+    if desde is not None and desde < generado - RETENCION_ELIMINADAS:
+        desde = None
+
+    if desde is None:
+        inicio_hoy, _ = limites_del_dia(localdate())
+        clases = clases.filter(hora_inicio__gte=inicio_hoy)
+    else:
+        clases = clases.filter(actualizada_en__gte=desde - MARGEN_SYNC)
+        eliminadas = list(
+            ClaseEliminada.objects.filter(rut_usuario=rut, eliminada_en__gte=desde - MARGEN_SYNC)
+            .values_list("id_clase", flat=True)
+            .distinct()
+        )
+
+    vigentes = [serializar_clase(c) for c in clases.order_by("hora_inicio")]
+    # una clase puede volver al instructor después de reasignarla: manda la vigente
+    ids_vigentes = {c["id_clase"] for c in vigentes}
+    return {
+        "completo": desde is None,
+        "clases": vigentes,
+        "eliminadas": [i for i in eliminadas if i not in ids_vigentes],
+        "token": generado.isoformat(),
+    }
+
+
+async def aetag_del_dia(rut, fecha):
+    """
+    ETag de la agenda del instructor en un día: cambia si se crea, edita o saca
+    una clase de ese día. Cuesta dos agregados sobre índices en vez de serializar todo.
+    """
+    agregado = await (
+        Clase.objects.del_dia(fecha)
+        .filter(rut_usuario_id=rut)
+        .aaggregate(n=Count("id_clase"), ultima=Max("actualizada_en"), ids=Max("id_clase"))
+    )
+    ultima_baja = (
+        await ClaseEliminada.objects.filter(rut_usuario=rut)
+        .aaggregate(ultima=Max("eliminada_en"))
+    )["ultima"]
+    base = f"{rut}|{fecha}|{agregado['n']}|{agregado['ultima']}|{agregado['ids']}|{ultima_baja}"
+    return '"' + hashlib.sha1(base.encode()).hexdigest() + '"'
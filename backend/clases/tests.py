@@ -1,3 +1,494 @@
-from django.test import TestCase
+import io
+import json
+from datetime import datetime, time as dtime, timedelta
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase
+from django.utils.timezone import get_current_timezone, localdate, make_aware, now
+
+from api.authentication import tokens_para_usuario
+from backend_project.metricas import asertar_presupuesto
+from clases.grilla import GrillaHorario
+from clases import resumen
+from clases.models import Clase, ClaseEliminada, ResumenDiarioInstructor
+from clases.reservas import reservar_lote
+from clases.sync import MARGEN_SYNC, RETENCION_ELIMINADAS, leer_token
+from director.asistencia import guardar_asistencia
+from director.models import EstadoInstructor
+from director.tests import asertar_filtra_por_centro, entrar, medir_get, poblar_centro
+from usuarios.models import Usuario
+
+
+class PresupuestoConsultasClasesTests(TestCase):
+    """
+    Grilla de boletería, asignación, búsqueda de horarios y API del instructor:
+    cantidad fija de consultas sin importar instructores ni clases.
+    Ver PRESUPUESTO_CONSULTAS en settings.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hoy = localdate()
+        cls.centro, _director, cls.insts = poblar_centro("sur")
+        cls.boleteria = Usuario.objects.create(
+            rut_usuario="sur-bol", nombre="Bol", apellido="Sur",
+            tipo_de_usuario_id="boleteria", id_centro=cls.centro,
+        )
+        instructor = cls.insts[0]
+        instructor.user = User.objects.create_user(username="sur-0")
+        instructor.save(update_fields=["user"])
+        cls.token = tokens_para_usuario(instructor, instructor.user)["access"]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_grilla_boleteria(self):
+        entrar(self.client, self.boleteria)
+        r = self.client.get(f"/clases/del_dia/?fecha={self.hoy}")
+        self.assertEqual(r.status_code, 200)
+        asertar_presupuesto(self, r)
+
+    def test_asignacion_y_disponibilidad(self):
+        entrar(self.client, self.boleteria)
+        comunes = f"fecha={self.hoy}&duracion=60&disciplina=ski&nivel=1"
+        r = self.client.get(f"/clases/asignacion/?{comunes}&hora=10:00")
+        self.assertEqual(r.status_code, 200)
+        asertar_presupuesto(self, r)
+        r = self.client.get(f"/clases/disponibilidad/?{comunes}")
+        self.assertEqual(r.status_code, 200)
+        asertar_presupuesto(self, r)
+
+    def test_api_instructor(self):
+        cabeceras = {"Authorization": f"Bearer {self.token}"}
+        for url in (
+            f"/api/instructor/clases-dia/?fecha={self.hoy}",
+            "/api/instructor/clases/sync/",
+            f"/api/instructor/clases/rango/?desde={self.hoy}&hasta={self.hoy}",
+        ):
+            r = self.client.get(url, headers=cabeceras)
+            self.assertEqual(r.status_code, 200, url)
+            asertar_presupuesto(self, r)
+
+
+class AislamientoCentrosClasesTests(TestCase):
+    """Boletería y API solo leen y tocan datos de su centro, filtrando en SQL."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hoy = localdate()
+        cls.centro, _director, cls.insts = poblar_centro("este", instructores=10, clases=20)
+        cls.boleteria = Usuario.objects.create(
+            rut_usuario="este-bol", nombre="Bol", apellido="Este",
+            tipo_de_usuario_id="boleteria", id_centro=cls.centro,
+        )
+
+    def setUp(self):
+        entrar(self.client, self.boleteria)
+
+    def test_grilla_boleteria_no_depende_de_otros_centros(self):
+        url = f"/clases/del_dia/?fecha={self.hoy}"
+        antes, _ = medir_get(self, url)
+        poblar_centro("oeste", instructores=60, clases=240)
+
+        despues, sql = medir_get(self, url)
+        self.assertEqual(despues.metricas.consultas, antes.metricas.consultas)
+        self.assertEqual(len(despues.context["filas_tabla"]), len(self.insts))
+        self.assertNotContains(despues, "oeste-0")
+        asertar_filtra_por_centro(self, sql)
+
+    def test_no_reserva_ni_borra_en_otro_centro(self):
+        _otro, _dir, otros = poblar_centro("oeste", instructores=2, clases=2)
+        ajena = Clase.objects.filter(rut_usuario=otros[0]).first()
+
+        self.client.post("/clases/crear/", {
+            "fecha": self.hoy.isoformat(), "disciplina_clase": "ski", "nombre_titular": "X",
+            "titular_telefono": "0", "nivel_clase": 1, "hora_sola": "15:00", "duracion": 60,
+            "cantidad_alumnos": 1, "rut_usuario": otros[1].rut_usuario,
+        })
+        self.assertFalse(Clase.objects.filter(rut_usuario=otros[1], nombre_titular="X").exists())
+
+        self.assertEqual(self.client.post(f"/clases/eliminar/{ajena.pk}/").status_code, 404)
+        self.assertTrue(Clase.objects.filter(pk=ajena.pk).exists())
+
+    def test_centro_copiado_del_instructor(self):
+        _otro, _dir, otros = poblar_centro("oeste", instructores=1, clases=0)
+        clase = Clase.objects.filter(rut_usuario__in=self.insts).first()
+        self.assertEqual(clase.id_centro_id, self.centro.pk)
+
+        clase.rut_usuario_id = otros[0].pk
+        clase.save(update_fields=["rut_usuario"])
+        clase.refresh_from_db()
+        self.assertEqual(clase.id_centro_id, otros[0].id_centro_id)
+
+    def test_clase_conserva_su_centro_si_el_instructor_se_cambia(self):
+        otro, _dir, _otros = poblar_centro("oeste", instructores=0, clases=0)
+        clase = Clase.objects.filter(rut_usuario=self.insts[0]).first()
+        Usuario.objects.filter(pk=self.insts[0].pk).update(id_centro=otro)
+
+        clase.nombre_titular = "Otro titular"
+        clase.save()
+        clase.refresh_from_db()
+        self.assertEqual(clase.id_centro_id, self.centro.pk)
+
+    def test_resumen_queda_en_el_centro_de_la_clase(self):
+        otro, _dir, _otros = poblar_centro("oeste", instructores=0, clases=0)
+        inst = Usuario.objects.get(pk=self.insts[0].pk)
+        antes = Clase.objects.filter(rut_usuario=inst).aggregate(m=Sum("duracion"))["m"]
+        inst.id_centro = otro
+        inst.save()
+        inicio = Clase.objects.filter(rut_usuario=inst).latest("hora_inicio").hora_fin + timedelta(hours=1)
+        Clase.objects.create(
+            nombre_titular="Nueva", titular_telefono="0", nivel_clase=1, disciplina_clase="ski",
+            hora_inicio=inicio, hora_fin=inicio + timedelta(minutes=45), duracion=45,
+            cantidad_alumnos=1, rut_usuario=inst,
+        )
+
+        def minutos(centro):
+            return (
+                ResumenDiarioInstructor.objects.del_centro(centro).filter(rut_usuario=inst)
+                .aggregate(m=Sum("minutos"))["m"]
+            )
+        self.assertEqual(minutos(self.centro), antes)
+        self.assertEqual(minutos(otro), 45)
+
+    def test_agenda_del_instructor_no_depende_del_claim_de_centro(self):
+        otro, _dir, _otros = poblar_centro("oeste", instructores=0, clases=0)
+        inst = Usuario.objects.get(pk=self.insts[0].pk)
+        inst.user = User.objects.create_user(username="este-0")
+        inst.id_centro = otro
+        inst.save()
+        cabeceras = {"Authorization": f"Bearer {tokens_para_usuario(inst, inst.user)['access']}"}
+        propias = {c.pk for c in Clase.objects.filter(rut_usuario=inst)}
+        self.assertTrue(propias)
+
+        dia = self.client.get(f"/api/instructor/clases-dia/?fecha={self.hoy}", headers=cabeceras).json()
+        rango = self.client.get(
+            f"/api/instructor/clases/rango/?desde={self.hoy}&hasta={self.hoy}", headers=cabeceras,
+        ).json()
+        sync = self.client.get("/api/instructor/clases/sync/", headers=cabeceras).json()
+        self.assertEqual({c["id_clase"] for c in dia}, propias)
+        self.assertEqual({c["id_clase"] for c in rango["dias"][self.hoy.isoformat()]}, propias)
+        self.assertEqual({c["id_clase"] for c in sync["clases"]}, propias)
+
+    def test_cambio_de_centro_invalida_la_grilla_anterior(self):
+        otro, _dir, _otros = poblar_centro("oeste", instructores=1, clases=0)
+        url = f"/clases/del_dia/?fecha={self.hoy}"
+        cache.clear()
+        self.assertEqual(len(self.client.get(url).context["filas_tabla"]), len(self.insts))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            movido = Usuario.objects.get(pk=self.insts[0].pk)
+            movido.id_centro = otro
+            movido.save()
+        # la versión cambia recién al confirmarse la transacción
+        self.assertEqual(len(self.client.get(url).context["filas_tabla"]), len(self.insts))
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(self.client.get(url).context["filas_tabla"]), len(self.insts) - 1)
+
+
+class ReservasLoteTests(TestCase):
+    """Reserva de varias clases en una llamada (clases/reservas.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hoy = localdate()
+        cls.centro, _director, cls.insts = poblar_centro("lote", instructores=3, clases=0)
+        cls.boleteria = Usuario.objects.create(
+            rut_usuario="lote-bol", nombre="Bol", apellido="Lote",
+            tipo_de_usuario_id="boleteria", id_centro=cls.centro,
+        )
+        cls.dias = [cls.hoy + timedelta(days=d) for d in range(7)]
+        EstadoInstructor.objects.bulk_create([
+            EstadoInstructor(instructor=inst, id_centro=cls.centro, fecha=dia, activo=True)
+            for inst in cls.insts for dia in cls.dias[1:]
+        ])
+
+    def setUp(self):
+        entrar(self.client, self.boleteria)
+
+    def _reservar(self, reservas, **extra):
+        cuerpo = {
+            "comun": {
+                "disciplina_clase": "ski", "nombre_titular": "Familia Pérez", "titular_telefono": "0",
+                "nivel_clase": 1, "duracion": 120, "cantidad_alumnos": 3,
+            },
+            "reservas": reservas,
+            **extra,
+        }
+        return self.client.post("/clases/reservas/", json.dumps(cuerpo), content_type="application/json")
+
+    def _mañanas(self, dias, inst=0, hora="10:00"):
+        return [
+            {"fecha": dia.isoformat(), "hora_sola": hora, "rut_usuario": self.insts[inst].rut_usuario}
+            for dia in dias
+        ]
+
+    def test_paquete_de_cinco_dias_cuesta_lo_mismo_que_uno(self):
+        uno = self._reservar(self._mañanas(self.dias[:1]))
+        self.assertEqual(uno.json()["creadas"], 1)
+        cinco = self._reservar(self._mañanas(self.dias[1:6], inst=1))
+        self.assertEqual(cinco.status_code, 200)
+        self.assertEqual(cinco.json()["creadas"], 5)
+        asertar_presupuesto(self, cinco)
+        self.assertLessEqual(cinco.metricas.consultas, uno.metricas.consultas)
+
+        ids = [r["id_clase"] for r in cinco.json()["resultados"]]
+        clases = Clase.objects.filter(pk__in=ids)
+        self.assertEqual(clases.count(), 5)
+        self.assertTrue(all(c.id_centro_id == self.centro.pk for c in clases))
+        self.assertEqual(
+            ResumenDiarioInstructor.objects.filter(rut_usuario=self.insts[1]).count(), 5,
+        )
+
+    def test_resultado_por_reserva(self):
+        _otro, _dir, otros = poblar_centro("ajeno", instructores=1, clases=0)
+        existente = self._reservar(self._mañanas(self.dias[2:3], hora="11:00"))
+        self.assertEqual(existente.json()["creadas"], 1)
+
+        r = self._reservar([
+            *self._mañanas(self.dias[1:2]),                                   # ok
+            *self._mañanas(self.dias[1:2], hora="11:00"),                     # choca con la anterior del lote
+            *self._mañanas(self.dias[2:3], hora="10:00"),                     # choca con la existente
+            {"fecha": self.dias[3].isoformat(), "hora_sola": "10:00", "rut_usuario": otros[0].rut_usuario},
+            {"fecha": "mañana", "hora_sola": "10:00", "rut_usuario": self.insts[0].rut_usuario},
+            *self._mañanas([self.hoy + timedelta(days=30)]),                  # sin asistencia cargada
+        ]).json()
+
+        self.assertEqual(r["creadas"], 1)
+        ok = [res["ok"] for res in r["resultados"]]
+        self.assertEqual(ok, [True, False, False, False, False, False])
+        errores = [res.get("error", "") for res in r["resultados"]]
+        self.assertIn("mismo lote", errores[1])
+        self.assertIn("ya tiene una clase", errores[2])
+        self.assertIn("no encontrado", errores[3])
+        self.assertIn("Formato inválido", errores[4])
+        self.assertIn("no está activo", errores[5])
+
+    def test_asistencia_de_otro_centro_no_cuenta(self):
+        # la asistencia futura queda en el centro donde se planificó
+        nuevo, _dir, _otros = poblar_centro("nuevo", instructores=0, clases=0)
+        movido = Usuario.objects.get(pk=self.insts[2].pk)
+        movido.id_centro = nuevo
+        movido.save()
+        bol_nuevo = Usuario.objects.create(
+            rut_usuario="nuevo-bol", nombre="Bol", apellido="Nuevo",
+            tipo_de_usuario_id="boleteria", id_centro=nuevo,
+        )
+        entrar(self.client, bol_nuevo)
+
+        r = self._reservar(self._mañanas(self.dias[1:2], inst=2)).json()
+        self.assertEqual(r["creadas"], 0)
+        self.assertIn("no está activo", r["resultados"][0]["error"])
+
+        self.client.post("/clases/crear/", {
+            "fecha": self.dias[1].isoformat(), "disciplina_clase": "ski", "nombre_titular": "X",
+            "titular_telefono": "0", "nivel_clase": 1, "hora_sola": "15:00", "duracion": 60,
+            "cantidad_alumnos": 1, "rut_usuario": movido.rut_usuario,
+        })
+        self.assertFalse(Clase.objects.filter(rut_usuario=movido).exists())
+
+    def test_todo_o_nada(self):
+        reservas = self._mañanas(self.dias[1:4]) + self._mañanas([self.hoy + timedelta(days=30)])
+        r = self._reservar(reservas, todo_o_nada=True).json()
+        self.assertEqual(r["creadas"], 0)
+        self.assertFalse(Clase.objects.filter(rut_usuario=self.insts[0]).exists())
+
+    def test_cuerpo_invalido(self):
+        r = self.client.post("/clases/reservas/", "no es json", content_type="application/json")
+        self.assertEqual(r.status_code, 400)
+
+
+class GrillaHorarioTests(SimpleTestCase):
+    """Bloques de la grilla según apertura, cierre y ancho del bloque."""
+
+    def _hora(self, fecha, hh, mm):
+        return make_aware(datetime.combine(fecha, dtime(hh, mm)), timezone=get_current_timezone())
+
+    def test_bloque_que_divide_el_horario(self):
+        grilla = GrillaHorario(localdate())
+        self.assertEqual(len(grilla), 17)
+        self.assertEqual((grilla.horas[0], grilla.horas[-1]), ("09:00", "17:00"))
+
+    def test_bloque_que_no_divide_el_horario(self):
+        hoy = localdate()
+        grilla = GrillaHorario(hoy, minutos_bloque=45)
+        # el último bloque parte antes del cierre; no se agrega uno a las 17:15
+        self.assertEqual(len(grilla), 11)
+        self.assertEqual((grilla.horas[0], grilla.horas[-1]), ("09:00", "16:30"))
+        self.assertEqual(grilla.rango(self._hora(hoy, 16, 45), self._hora(hoy, 17, 30)), (10, 11))
+        self.assertIsNone(grilla.rango(self._hora(hoy, 17, 15), self._hora(hoy, 18, 0)))
+
+
+@skipUnless(connection.vendor == "postgresql", "la restricción de exclusión solo existe en PostgreSQL")
+class RestriccionSolapesTests(TestCase):
+    """clase_sin_solape_instructor (migración 0002): la base rechaza clases cruzadas de un instructor."""
+
+    def test_rechaza_solape_y_acepta_clases_seguidas(self):
+        centro, _dir, insts = poblar_centro("excl", instructores=1, clases=1)
+        clase = Clase.objects.get(rut_usuario=insts[0])
+
+        def copia(desplazamiento):
+            return Clase(
+                nombre_titular="Otra", titular_telefono="0", nivel_clase=1, disciplina_clase="ski",
+                hora_inicio=clase.hora_inicio + desplazamiento, hora_fin=clase.hora_fin + desplazamiento,
+                duracion=clase.duracion, cantidad_alumnos=1, rut_usuario=insts[0], id_centro=centro,
+            )
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Clase.objects.bulk_create([copia(timedelta(minutes=30))])
+        # rango [inicio, fin): una clase que parte cuando termina la otra no choca
+        Clase.objects.bulk_create([copia(clase.hora_fin - clase.hora_inicio)])
+        self.assertEqual(Clase.objects.filter(rut_usuario=insts[0]).count(), 2)
+
+
+class SincronizacionAppTests(TestCase):
+    """Sync incremental y ETag del día para la app (clases/sync.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mañana = localdate() + timedelta(days=1)
+        _centro, _dir, cls.insts = poblar_centro("sync", instructores=2, clases=0)
+        cls.cabeceras = []
+        for inst in cls.insts:
+            inst.user = User.objects.create_user(username=inst.rut_usuario)
+            inst.save(update_fields=["user"])
+            cls.cabeceras.append({"Authorization": f"Bearer {tokens_para_usuario(inst, inst.user)['access']}"})
+
+    def _clase(self, hora, inst=0):
+        inicio = make_aware(datetime.combine(self.mañana, dtime(hora, 0)), timezone=get_current_timezone())
+        return Clase.objects.create(
+            nombre_titular="Titular", titular_telefono="0", nivel_clase=1, disciplina_clase="ski",
+            hora_inicio=inicio, hora_fin=inicio + timedelta(hours=1), duracion=60,
+            cantidad_alumnos=1, rut_usuario=self.insts[inst],
+        )
+
+    def _sync(self, since=None, inst=0):
+        r = self.client.get("/api/instructor/clases/sync/", {"since": since} if since else {},
+                            headers=self.cabeceras[inst])
+        self.assertEqual(r.status_code, 200)
+        return r.json()
+
+    def test_delta_desde_el_token_con_margen(self):
+        dentro, fuera = self._clase(10), self._clase(12)
+        completo = self._sync()
+        self.assertTrue(completo["completo"])
+        self.assertEqual({c["id_clase"] for c in completo["clases"]}, {dentro.pk, fuera.pk})
+
+        # una escritura confirmada apenas antes del token igual llega (MARGEN_SYNC)
+        token = leer_token(completo["token"])
+        Clase.objects.filter(pk=dentro.pk).update(actualizada_en=token - MARGEN_SYNC / 2)
+        Clase.objects.filter(pk=fuera.pk).update(actualizada_en=token - MARGEN_SYNC * 2)
+        delta = self._sync(completo["token"])
+        self.assertFalse(delta["completo"])
+        self.assertEqual([c["id_clase"] for c in delta["clases"]], [dentro.pk])
+        self.assertEqual(delta["eliminadas"], [])
+
+    def test_reasignar_deja_marca_para_el_instructor_anterior(self):
+        clase = self._clase(10)
+        token = self._sync()["token"]
+        clase.rut_usuario = self.insts[1]
+        clase.save()
+
+        self.assertTrue(ClaseEliminada.objects.filter(id_clase=clase.pk, rut_usuario=self.insts[0].pk).exists())
+        delta = self._sync(token)
+        self.assertEqual(delta["clases"], [])
+        self.assertEqual(delta["eliminadas"], [clase.pk])
+        self.assertEqual([c["id_clase"] for c in self._sync(token, inst=1)["clases"]], [clase.pk])
+
+    def test_token_vencido_o_invalido(self):
+        self._clase(10)
+        vencido = (now() - RETENCION_ELIMINADAS - timedelta(days=1)).isoformat()
+        r = self._sync(vencido)
+        self.assertTrue(r["completo"])
+        self.assertEqual(len(r["clases"]), 1)
+
+        r = self.client.get("/api/instructor/clases/sync/", {"since": "ayer"}, headers=self.cabeceras[0])
+        self.assertEqual(r.status_code, 400)
+
+    def test_purgar_marcas_viejas(self):
+        vieja = ClaseEliminada.objects.create(id_clase=1, rut_usuario=self.insts[0].pk)
+        ClaseEliminada.objects.filter(pk=vieja.pk).update(eliminada_en=now() - RETENCION_ELIMINADAS - timedelta(days=1))
+        reciente = ClaseEliminada.objects.create(id_clase=2, rut_usuario=self.insts[0].pk)
+
+        call_command("purgar_clases_eliminadas", stdout=io.StringIO())
+        self.assertEqual(list(ClaseEliminada.objects.values_list("pk", flat=True)), [reciente.pk])
+
+    def test_etag_del_dia(self):
+        clase = self._clase(10)
+        url = f"/api/instructor/clases-dia/?fecha={self.mañana}"
+        r = self.client.get(url, headers=self.cabeceras[0])
+        self.assertEqual(r.status_code, 200)
+        etag = r["ETag"]
+
+        r = self.client.get(url, headers={**self.cabeceras[0], "If-None-Match": etag})
+        self.assertEqual(r.status_code, 304)
+
+        clase.cantidad_alumnos = 4
+        clase.save()
+        r = self.client.get(url, headers={**self.cabeceras[0], "If-None-Match": etag})
+        self.assertEqual(r.status_code, 200)
+        self.assertNotEqual(r["ETag"], etag)
+        self.assertEqual(r.json()[0]["cantidad_alumnos"], 4)
+
+
+class ResumenDiarioTests(TestCase):
+    """El resumen que mantienen las señales y los caminos masivos es igual a rearmarlo desde Clase."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hoy = localdate()
+        cls.centro, _dir, cls.insts = poblar_centro("resumen", instructores=2, clases=6)
+
+    def asertar_igual_a_reconstruir(self, paso):
+        def filas():
+            return sorted(ResumenDiarioInstructor.objects.values_list(
+                "rut_usuario", "fecha", "disciplina_clase", "id_centro", "minutos", "clases", "alumnos",
+            ))
+        mantenido = filas()
+        resumen.reconstruir()
+        self.assertEqual(mantenido, filas(), paso)
+
+    def test_resumen_sigue_a_las_clases(self):
+        self.asertar_igual_a_reconstruir("alta")
+        clases = list(Clase.objects.filter(rut_usuario=self.insts[0]).order_by("hora_inicio"))
+
+        clases[0].duracion = 90
+        clases[0].hora_fin = clases[0].hora_inicio + timedelta(minutes=90)
+        clases[0].save()
+        self.asertar_igual_a_reconstruir("duración")
+
+        clases[1].hora_inicio += timedelta(days=1)
+        clases[1].hora_fin += timedelta(days=1)
+        clases[1].save()
+        self.asertar_igual_a_reconstruir("cambio de día")
+
+        clases[2].rut_usuario = self.insts[1]
+        clases[2].hora_inicio += timedelta(hours=6)
+        clases[2].hora_fin += timedelta(hours=6)
+        clases[2].save()
+        self.asertar_igual_a_reconstruir("cambio de instructor")
+
+        clases[0].delete()
+        self.asertar_igual_a_reconstruir("borrado")
+
+        reservas = [
+            {
+                "fecha": self.hoy.isoformat(), "hora_sola": hora, "duracion": 45, "nivel_clase": 1,
+                "cantidad_alumnos": 2, "disciplina_clase": "snow", "nombre_titular": "Lote",
+                "titular_telefono": "0", "rut_usuario": self.insts[0].rut_usuario,
+            }
+            for hora in ("15:00", "16:00")
+        ]
+        resultados = reservar_lote(self.centro, reservas)
+        self.assertTrue(all(r["ok"] for r in resultados), resultados)
+        self.asertar_igual_a_reconstruir("reserva en lote")
+
+        guardar_asistencia(self.centro, self.hoy, [])
+        self.asertar_igual_a_reconstruir("asistencia masiva")
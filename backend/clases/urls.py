@@ -3,7 +3,11 @@ from . import views
 
 urlpatterns = [
     path("crear/", views.crear_clase, name="crear_clase"),
+    path("reservas/", views.reservar_clases, name="reservar_clases"),
+    path("asignacion/", views.sugerir_instructor, name="sugerir_instructor"),
+    path("disponibilidad/", views.horarios_libres, name="horarios_libres"),
     path("del_dia/", views.clases_del_dia, name="clases_del_dia"),
+    path("eventos/", views.eventos_grilla, name="eventos_grilla"),
     path("editar/<int:id_clase>/", views.editar_clase, name="editar_clase"),
     path("eliminar/<int:id_clase>/", views.eliminar_clase, name="eliminar_clase"),
 ]
@@ -1,15 +1,27 @@
+import asyncio
+import json
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from datetime import datetime, timedelta, time as dtime
+from django.db import IntegrityError
 from django.db.models import Q
-from django.utils.timezone import now, make_aware, get_current_timezone, localdate
+from django.utils.timezone import now, make_aware, get_current_timezone, localdate, localtime
 from django.contrib import messages
 from usuarios.models import Usuario
 from .models import Clase
+from .grilla import GrillaHorario
+from .cache_grilla import agrilla_cacheada
+from .conflictos import hay_solape
+from .asignacion import sugerir_instructores, CANDIDATOS_POR_DEFECTO
+from .disponibilidad import buscar_horarios, HORARIOS_POR_DEFECTO
+from .reservas import reservar_lote, MAX_RESERVAS_POR_LOTE
 from director.models import EstadoInstructor  # activos del director
-from backend_project.utils import centro_del_sesion
-from django.db.models import Sum
-from django.http import HttpResponse
+from backend_project.utils import centro_del_sesion, acentro_del_sesion, ausuario_actual
+from . import eventos
+from django.http import HttpResponse, StreamingHttpResponse, JsonResponse
+from django.views.decorators.http import require_GET, require_POST
+from director.decorators import role_required
+from django.core.handlers.asgi import ASGIRequest
 from urllib.parse import urlencode 
 
 
@@ -20,26 +32,19 @@ def _parse_fecha(value: str):
         return localdate()  # SIEMPRE fecha local por defecto
 
 
-def clases_del_dia(request):
+async def _adatos_boleteria(centro, fecha):
     """
-    Boletería: muestra solo los instructores ACTIVOS en la fecha seleccionada
-    y del mismo centro de ski que la boletería.
+    Instructores activos del centro en la fecha y sus clases ubicadas por bloque.
     """
-    # 1) Fecha (por defecto: local)
-    fecha_str = request.GET.get("fecha")
-    fecha = _parse_fecha(fecha_str) if fecha_str else localdate()
-
-    # 2) Centro de la boletería (guardado en la sesión)
-    centro = centro_del_sesion(request)  # puede ser None
-
-    # 3) Instructores activos ese día (si no hay estado cargado, no muestra nadie)
-    activos_ids = list(
-        EstadoInstructor.objects
+    # Instructores activos ese día (si no hay estado cargado, no muestra nadie)
+    activos_ids = [
+        rut async for rut in
+        EstadoInstructor.objects.del_centro(centro)
         .filter(fecha=fecha, activo=True)
-        .values_list("instructor__rut_usuario", flat=True)
-    )
+        .values_list("instructor_id", flat=True)
+    ]
 
-    # 4) Instructores del centro Y activos
+    # Instructores del centro Y activos
     instructores_qs = Usuario.objects.filter(
         tipo_de_usuario__tipo_de_usuario__iexact="Instructor",
         rut_usuario__in=activos_ids if activos_ids else ["__NONE__"],
@@ -48,66 +53,197 @@ def clases_del_dia(request):
     if centro is not None:
         instructores_qs = instructores_qs.filter(id_centro=centro)
 
-    instructores = instructores_qs.order_by("apellido", "nombre")
-
-    # 5) Slots 30 min (09-17)
-    HORAS = []
-    start_dt = datetime.strptime(f"{fecha} 09:00", "%Y-%m-%d %H:%M")
-    end_dt   = datetime.strptime(f"{fecha} 17:00", "%Y-%m-%d %H:%M")
-    cur = start_dt
-    while cur <= end_dt:
-        HORAS.append(cur.strftime("%H:%M"))
-        cur += timedelta(minutes=30)
-
-    # 6) Clases del día
-    clases_hoy = (
-        Clase.objects.filter(hora_inicio__date=fecha)
-        .select_related("rut_usuario")
+    instructores = [inst async for inst in instructores_qs.order_by("apellido", "nombre")]
+
+    # Grilla del día según el horario del centro (09-17 cada 30 min por defecto)
+    grilla = GrillaHorario.para_centro(fecha, centro)
+
+    # Clases del día del centro, ubicadas en sus bloques (si el inst no está activo, se ignora)
+    clases_hoy = [
+        c async for c in
+        Clase.objects.del_centro(centro).del_dia(fecha)
         .order_by("hora_inicio")
+    ]
+    horario = grilla.celdas([inst.rut_usuario for inst in instructores], clases_hoy)
+
+    return {
+        "horas": grilla.horas,
+        "inicio_grilla": grilla.inicio,
+        "minutos_bloque": grilla.minutos_bloque,
+        "instructores": instructores,
+        "horario": horario,
+    }
+
+
+async def clases_del_dia(request):
+    """
+    Boletería: muestra solo los instructores ACTIVOS en la fecha seleccionada
+    y del mismo centro de ski que la boletería.
+    Es async (ORM y cache async): bajo ASGI un worker atiende muchas boleterías a la vez.
+    """
+    # 1) Fecha (por defecto: local)
+    fecha_str = request.GET.get("fecha")
+    fecha = _parse_fecha(fecha_str) if fecha_str else localdate()
+
+    # 2) Centro de la boletería (guardado en la sesión)
+    centro = await acentro_del_sesion(request)  # puede ser None
+
+    # 3) Datos de la grilla (cacheados por centro y fecha)
+    datos = await agrilla_cacheada(
+        "boleteria", getattr(centro, "pk", None), fecha,
+        lambda: _adatos_boleteria(centro, fecha),
     )
 
-    # 7) Grilla base
-    horario = {inst.rut_usuario: {slot: None for slot in HORAS} for inst in instructores}
-    tz = get_current_timezone()
-
-    for clase in clases_hoy:
-        inst_id = clase.rut_usuario.rut_usuario
-        if inst_id not in horario:
-            continue  # si el inst no está activo / no es de este centro, lo ignoramos
-        inicio, fin = clase.hora_inicio, clase.hora_fin
-        for slot_str in HORAS:
-            slot_naive = datetime.strptime(f"{fecha} {slot_str}", "%Y-%m-%d %H:%M")
-            slot_inicio = make_aware(slot_naive, timezone=tz)
-            slot_fin = slot_inicio + timedelta(minutes=30)
-            if (slot_inicio < fin) and (slot_fin > inicio):
-                horario[inst_id][slot_str] = clase
-
-    # 8) Armar filas_tabla (OJO: el return va FUERA del for)
+    # 4) Armar filas_tabla
     filas_tabla = []
-    for inst in instructores:
-        celdas = []
-        for slot in HORAS:
-            celdas.append({
-                "hora": slot,
-                "clase": horario[inst.rut_usuario][slot],
-            })
+    for inst in datos["instructores"]:
+        celdas = [
+            {"hora": hora, "clase": clase}
+            for hora, clase in zip(datos["horas"], datos["horario"][inst.rut_usuario])
+        ]
         filas_tabla.append({
             "instructor": inst,
             "activo": True,  # ya están filtrados por activos
             "celdas": celdas,
         })
 
-    # 9) Contexto y render
+    # 5) Contexto y render
     context = {
         "fecha": fecha,
-        "horas": HORAS,
+        "horas": datos["horas"],
+        "inicio_grilla": datos["inicio_grilla"],
+        "minutos_bloque": datos["minutos_bloque"],
         "filas_tabla": filas_tabla,
-        "error_crear": request.session.pop("error_crear", None),
+        "error_crear": await request.session.apop("error_crear", None),
     }
     return render(request, "clases/clases_del_dia.html", context)
 
 
 
+# Cada cuánto se manda un comentario vacío para que proxies no corten la conexión
+LATIDO_SSE = 20  # segundos
+
+
+async def _flujo_eventos(canal):
+    b = eventos.broker()
+    suscripcion = b.suscribir(canal)
+    _loop, cola = suscripcion
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                evento = await asyncio.wait_for(cola.get(), LATIDO_SSE)
+            except asyncio.TimeoutError:
+                yield ": latido\n\n"
+                continue
+            yield eventos.formato_sse(evento)
+    finally:
+        # la conexión se cerró (ASGI cancela el generador)
+        b.desuscribir(canal, suscripcion)
+
+
+async def eventos_grilla(request):
+    """
+    Server-Sent Events con los cambios de la grilla del centro en ?fecha=YYYY-MM-DD
+    (ver clases/eventos.py y static/js/grilla_en_vivo.js).
+    Solo bajo ASGI: con WSGI cada conexión abierta ocuparía un hilo para siempre,
+    así que responde 204 y el navegador deja de intentar (la grilla sigue funcionando
+    recargando la página).
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    usuario = await ausuario_actual(request)
+    if usuario is None:
+        return HttpResponse(status=403)
+
+    fecha = _parse_fecha(request.GET.get("fecha", ""))
+    respuesta = StreamingHttpResponse(
+        _flujo_eventos(eventos.canal(usuario.id_centro_id, fecha)),
+        content_type="text/event-stream",
+    )
+    respuesta["Cache-Control"] = "no-cache"
+    respuesta["X-Accel-Buffering"] = "no"  # nginx: no juntar los eventos
+    return respuesta
+
+
+def _inicio_en_dia(dia, hora_sola):
+    """"HH:MM" del día `dia` -> datetime aware en la TZ del proyecto (ValueError si no es válida)."""
+    try:
+        hh, mm = map(int, hora_sola.split(":"))
+        return make_aware(datetime.combine(dia, dtime(hh, mm)), timezone=get_current_timezone())
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError(f"Hora inválida: {hora_sola!r}")
+
+
+@role_required("boleteria", "director", "jefe_centro")
+@require_GET
+def sugerir_instructor(request):
+    """
+    Motor de asignación: mejores instructores activos y libres del centro para una
+    clase (?fecha=YYYY-MM-DD&hora=HH:MM&duracion=&disciplina=&nivel=[&idioma=][&cantidad=]).
+    Lo usa el modal de nueva clase; ver clases/asignacion.py.
+    """
+    fecha = _parse_fecha(request.GET.get("fecha", ""))
+    try:
+        duracion = int(request.GET["duracion"])
+        nivel = int(request.GET["nivel"])
+        disciplina = request.GET["disciplina"]
+        inicio = _inicio_en_dia(fecha, request.GET["hora"])
+        cantidad = min(int(request.GET.get("cantidad", CANDIDATOS_POR_DEFECTO)), 50)
+    except KeyError as e:
+        return JsonResponse({"error": f"Falta el parámetro {e.args[0]}."}, status=400)
+    except ValueError:
+        return JsonResponse({"error": "Formato inválido en hora/duración/nivel/cantidad."}, status=400)
+    if duracion <= 0 or cantidad <= 0:
+        return JsonResponse({"error": "La duración y la cantidad deben ser positivas."}, status=400)
+
+    candidatos = sugerir_instructores(
+        centro_del_sesion(request), fecha, disciplina, nivel,
+        inicio, inicio + timedelta(minutes=duracion),
+        idioma=request.GET.get("idioma") or None, cantidad=cantidad,
+    )
+    return JsonResponse({"candidatos": candidatos})
+
+
+def _hora_opcional(texto):
+    """"HH:MM" -> time, None si viene vacío (ValueError si no es válida)."""
+    if not texto:
+        return None
+    return datetime.strptime(texto, "%H:%M").time()
+
+
+@role_required("boleteria", "director", "jefe_centro")
+@require_GET
+def horarios_libres(request):
+    """
+    Búsqueda de horarios: ¿quién está libre y desde qué hora para una clase de
+    ?duracion= minutos (&disciplina=&nivel=[&idioma=])? ?desde= / ?hasta= (HH:MM)
+    acotan la hora de inicio; "a las 11:00" es desde=11:00&hasta=11:00.
+    Retorna los primeros horarios posibles; ver clases/disponibilidad.py.
+    """
+    fecha = _parse_fecha(request.GET.get("fecha", ""))
+    try:
+        duracion = int(request.GET["duracion"])
+        nivel = int(request.GET["nivel"])
+        disciplina = request.GET["disciplina"]
+        desde = _hora_opcional(request.GET.get("desde"))
+        hasta = _hora_opcional(request.GET.get("hasta"))
+        cantidad = min(int(request.GET.get("cantidad", HORARIOS_POR_DEFECTO)), 100)
+    except KeyError as e:
+        return JsonResponse({"error": f"Falta el parámetro {e.args[0]}."}, status=400)
+    except ValueError:
+        return JsonResponse({"error": "Formato inválido en duración/nivel/desde/hasta/cantidad."}, status=400)
+    if duracion <= 0 or cantidad <= 0:
+        return JsonResponse({"error": "La duración y la cantidad deben ser positivas."}, status=400)
+
+    horarios = buscar_horarios(
+        centro_del_sesion(request), fecha, duracion, disciplina, nivel,
+        idioma=request.GET.get("idioma") or None, desde=desde, hasta=hasta, cantidad=cantidad,
+    )
+    return JsonResponse({"fecha": fecha.isoformat(), "horarios": horarios})
+
+
 def _render_error(request, msg, fecha=None):
     request.session["error_crear"] = msg
     if fecha:
@@ -138,66 +274,130 @@ def crear_clase(request):
         return _render_error(request, "Formato inválido en nivel/duración/alumnos.", dia_obj)
 
     # Convertir "HH:MM" a aware en la TZ del proyecto, usando la FECHA elegida
-    tz = get_current_timezone()
     try:
-        hh, mm = map(int, hora_sola.split(":"))
-    except Exception:
+        hora_inicio = _inicio_en_dia(dia_obj, hora_sola)
+    except ValueError:
         return _render_error(request, "Hora inválida.", dia_obj)
-
-    inicio_local_naive = datetime.combine(dia_obj, dtime(hh, mm))
-    hora_inicio = make_aware(inicio_local_naive, timezone=tz)
     hora_fin = hora_inicio + timedelta(minutes=duracion)
 
-    # Validar instructor
+    centro = centro_del_sesion(request)
+
+    # "auto": el motor de asignación elige el mejor instructor libre
+    if rut_usuario == "auto":
+        sugeridos = sugerir_instructores(
+            centro, dia_obj, disciplina, nivel_clase,
+            hora_inicio, hora_fin, idioma=request.POST.get("idioma") or None, cantidad=1,
+        )
+        if not sugeridos:
+            return _render_error(request, "No hay instructores disponibles para esa clase en ese horario.", dia_obj)
+        rut_usuario = sugeridos[0]["rut"]
+
+    # Validar instructor (tiene que ser del centro de la boletería)
     try:
-        instructor = Usuario.objects.get(rut_usuario=rut_usuario)
+        instructor = Usuario.objects.del_centro(centro).get(rut_usuario=rut_usuario)
     except Usuario.DoesNotExist:
         return _render_error(request, "Instructor no encontrado.", dia_obj)
 
-    # Debe estar activo ese día
-    if not EstadoInstructor.objects.filter(
+    # Debe estar activo ese día en este centro (la asistencia futura queda en el
+    # centro donde se planificó aunque el instructor se cambie)
+    if not EstadoInstructor.objects.del_centro(centro).filter(
         fecha=dia_obj, instructor=instructor, activo=True
     ).exists():
         return _render_error(request, f"El instructor {instructor.nombre} no está activo ese día.", dia_obj)
 
     # Validar solape
-    if Clase.objects.filter(
-        rut_usuario=instructor,
-        hora_inicio__lt=hora_fin,
-        hora_fin__gt=hora_inicio,
-    ).exists():
+    if hay_solape(instructor.rut_usuario, hora_inicio, hora_fin):
         return _render_error(request, "Ese instructor ya tiene una clase en ese horario.", dia_obj)
 
-    # Crear
-    Clase.objects.create(
-        nombre_titular=nombre_titular,
-        titular_telefono=titular_telefono,
-        nivel_clase=nivel_clase,
-        disciplina_clase=disciplina,
-        hora_inicio=hora_inicio,
-        hora_fin=hora_fin,
-        duracion=duracion,
-        cantidad_alumnos=cantidad_alumnos,
-        rut_usuario=instructor,
-    )
+    # Crear (en PostgreSQL la restricción de exclusión cubre la carrera entre dos boleterías)
+    try:
+        Clase.objects.create(
+            nombre_titular=nombre_titular,
+            titular_telefono=titular_telefono,
+            nivel_clase=nivel_clase,
+            disciplina_clase=disciplina,
+            hora_inicio=hora_inicio,
+            hora_fin=hora_fin,
+            duracion=duracion,
+            cantidad_alumnos=cantidad_alumnos,
+            rut_usuario=instructor,
+        )
+    except IntegrityError:
+        return _render_error(request, "Ese instructor ya tiene una clase en ese horario.", dia_obj)
     messages.success(request, "Clase creada correctamente.")
     return redirect(f"{reverse('clases_del_dia')}?fecha={dia_obj.strftime('%Y-%m-%d')}")
 
 
-from django.urls import reverse
+@role_required("boleteria", "director", "jefe_centro")
+@require_POST
+def reservar_clases(request):
+    """
+    Reserva varias clases en una llamada (paquetes de varios días, grupos).
+    Cuerpo JSON: {"reservas": [...], "comun": {...}, "todo_o_nada": false}; cada
+    reserva lleva los campos del formulario de crear_clase y "comun" los que se
+    repiten (titular, disciplina, duración...). Responde un resultado por
+    reserva, en el mismo orden; ver clases/reservas.py.
+    """
+    try:
+        cuerpo = json.loads(request.body)
+        comun = cuerpo.get("comun") or {}
+        reservas = [{**comun, **r} for r in cuerpo["reservas"]]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return JsonResponse({"error": "Cuerpo inválido: se espera JSON con una lista de reservas."}, status=400)
+    if not reservas:
+        return JsonResponse({"error": "No hay reservas."}, status=400)
+    if len(reservas) > MAX_RESERVAS_POR_LOTE:
+        return JsonResponse({"error": f"Máximo {MAX_RESERVAS_POR_LOTE} reservas por lote."}, status=400)
+
+    resultados = reservar_lote(
+        centro_del_sesion(request), reservas, todo_o_nada=bool(cuerpo.get("todo_o_nada")),
+    )
+    return JsonResponse({
+        "creadas": sum(1 for r in resultados if r["ok"]),
+        "resultados": resultados,
+    })
+
+
+def _error_edicion(request, msg, fecha):
+    if request.POST.get('origen') == 'director':
+        messages.error(request, msg)
+        return redirect(_redir_director_desde_post(request))
+    return _render_error(request, msg, fecha)
+
 
 def editar_clase(request, id_clase):
-    clase = get_object_or_404(Clase, pk=id_clase)
+    centro = centro_del_sesion(request)
+    clase = get_object_or_404(Clase.objects.del_centro(centro), pk=id_clase)
 
     if request.method == 'POST':
+        dia_obj = localtime(clase.hora_inicio).date()
+
+        try:
+            nivel_clase = int(request.POST.get('nivel_clase'))
+            cantidad_alumnos = int(request.POST.get('cantidad_alumnos'))
+            duracion = int(request.POST.get('duracion'))
+        except (TypeError, ValueError):
+            return _error_edicion(request, "Formato inválido en nivel/duración/alumnos.", dia_obj)
+
         clase.disciplina_clase = request.POST.get('disciplina_clase')
         clase.nombre_titular = request.POST.get('nombre_titular')
         clase.titular_telefono = request.POST.get('titular_telefono')
-        clase.nivel_clase = request.POST.get('nivel_clase')
-        clase.cantidad_alumnos = request.POST.get('cantidad_alumnos')
-        clase.duracion = request.POST.get('duracion')
+        clase.nivel_clase = nivel_clase
+        clase.cantidad_alumnos = cantidad_alumnos
+        clase.duracion = duracion
+        clase.hora_fin = clase.hora_inicio + timedelta(minutes=duracion)
         clase.rut_usuario_id = request.POST.get('rut_usuario')
-        clase.save()
+        if not Usuario.objects.del_centro(centro).filter(rut_usuario=clase.rut_usuario_id).exists():
+            return _error_edicion(request, "Instructor no encontrado.", dia_obj)
+
+        # Validar solape con las demás clases del instructor (sin contar esta misma)
+        if hay_solape(clase.rut_usuario_id, clase.hora_inicio, clase.hora_fin, excluir_id=clase.pk):
+            return _error_edicion(request, "Ese instructor ya tiene una clase en ese horario.", dia_obj)
+
+        try:
+            clase.save()
+        except IntegrityError:
+            return _error_edicion(request, "Ese instructor ya tiene una clase en ese horario.", dia_obj)
 
         origen = request.POST.get('origen')
 
@@ -214,7 +414,7 @@ def editar_clase(request, id_clase):
 
 
 def eliminar_clase(request, id_clase):
-    clase = get_object_or_404(Clase, pk=id_clase)
+    clase = get_object_or_404(Clase.objects.del_centro(centro_del_sesion(request)), pk=id_clase)
 
     if request.method == 'POST':
         clase.delete()
@@ -227,121 +427,6 @@ def eliminar_clase(request, id_clase):
             return redirect('clases_del_dia')
 
 
-
-
-def director_reportes(request):
-    # ---- 1) Leer filtros del GET ----
-    instructor_id = request.GET.get("instructor")  # rut_usuario o vacío
-    disciplina_flt = request.GET.get("disciplina")  # 'ski', 'snow' o ''
-    desde_str = request.GET.get("desde")
-    hasta_str = request.GET.get("hasta")
-
-    hoy = localdate()
-
-    # Parsear fechas con valores por defecto
-    def _parse_fecha(value, default):
-        try:
-            return datetime.strptime(value, "%Y-%m-%d").date()
-        except Exception:
-            return default
-
-    fecha_hasta = _parse_fecha(hasta_str, hoy)
-    # por defecto, desde el primer día del mes actual
-    fecha_desde = _parse_fecha(desde_str, hoy.replace(day=1))
-
-    # ---- 2) Query base de clases en ese rango ----
-    clases_qs = Clase.objects.filter(
-        hora_inicio__date__gte=fecha_desde,
-        hora_inicio__date__lte=fecha_hasta,
-    )
-
-    if disciplina_flt:
-        clases_qs = clases_qs.filter(disciplina_clase=disciplina_flt)
-
-    # ---- 3) Detalle de un instructor específico (si se eligió) ----
-    instructor_seleccionado = None
-    clases_instructor = []
-    total_horas_instructor = 0
-
-    if instructor_id:
-        clases_instructor = (
-            clases_qs
-            .filter(rut_usuario_id=instructor_id)
-            .order_by("hora_inicio")
-        )
-        instructor_seleccionado = (
-            Usuario.objects.filter(rut_usuario=instructor_id).first()
-        )
-
-        total_min = clases_instructor.aggregate(
-            total=Sum("duracion")
-        )["total"] or 0
-        total_horas_instructor = round(total_min / 60, 2)
-
-    # ---- 4) Resumen por instructor (todas las clases del período) ----
-    resumen_raw = (
-        clases_qs
-        .values("rut_usuario_id", "rut_usuario__nombre", "rut_usuario__apellido")
-        .annotate(total_min=Sum("duracion"))
-        .order_by("rut_usuario__apellido", "rut_usuario__nombre")
-    )
-
-    resumen_por_instructor = [
-        {
-            "rut": r["rut_usuario_id"],
-            "nombre": r["rut_usuario__nombre"],
-            "apellido": r["rut_usuario__apellido"],
-            "horas": round((r["total_min"] or 0) / 60, 2),
-        }
-        for r in resumen_raw
-    ]
-
-    total_general_horas = sum(item["horas"] for item in resumen_por_instructor)
-
-    # ---- 5) Lista de instructores para el <select> ----
-    instructores = (
-        Usuario.objects
-        .filter(tipo_de_usuario__tipo_de_usuario__iexact="Instructor")
-        .order_by("apellido", "nombre")
-    )
-
-    # ---- 6) Exportar CSV si se pide ----
-    if request.GET.get("export") == "resumen":
-        # armamos un CSV simple: Instructor, Horas
-        import csv
-        response = HttpResponse(content_type="text/csv")
-        filename = f"resumen_instructores_{fecha_desde}_{fecha_hasta}.csv"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-        writer = csv.writer(response)
-        writer.writerow(["Apellido", "Nombre", "Horas en período"])
-        for r in resumen_por_instructor:
-            writer.writerow([r["apellido"], r["nombre"], r["horas"]])
-        writer.writerow([])
-        writer.writerow(["TOTAL GENERAL HORAS", "", total_general_horas])
-
-        return response
-
-    # ---- 7) Contexto para el template ----
-    context = {
-        "instructores": instructores,
-        "instructor_id": instructor_id,
-        "instructor_seleccionado": instructor_seleccionado,
-
-        "fecha_desde": fecha_desde,
-        "fecha_hasta": fecha_hasta,
-        "disciplina_flt": disciplina_flt,
-
-        "clases_instructor": clases_instructor,
-        "total_horas_instructor": total_horas_instructor,
-
-        "resumen_por_instructor": resumen_por_instructor,
-        "total_general_horas": total_general_horas,
-    }
-    return render(request, "director/reportes.html", context)
-
-
-
 def _redir_director_desde_post(request):
     fecha = request.POST.get("fecha")
     solo_activos = request.POST.get("solo_activos")
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.db import transaction
+
+from clases import cache_grilla, eventos
+from usuarios.models import Usuario
+from .models import EstadoInstructor
+
+
+def instructores_del_centro(centro):
+    return Usuario.objects.filter(
+        tipo_de_usuario__tipo_de_usuario__iexact="instructor",
+        id_centro=centro,
+    )
+
+
+def guardar_asistencia(centro, fecha, activos):
+    """
+    Guarda el estado activo/inactivo del día para todos los instructores del centro.
+    Un upsert masivo sobre (instructor, fecha): cantidad constante de consultas
+    sin importar el tamaño de la plantilla.
+    """
+    activos = set(activos)
+    ruts = list(instructores_del_centro(centro).values_list("rut_usuario", flat=True))
+
+    estados = [
+        EstadoInstructor(instructor_id=rut, id_centro=centro, fecha=fecha, activo=rut in activos)
+        for rut in ruts
+    ]
+    with transaction.atomic():
+        EstadoInstructor.objects.bulk_create(
+            estados,
+            update_conflicts=True,
+            unique_fields=["instructor", "fecha"],
+            update_fields=["activo", "id_centro"],
+        )
+    # bulk_create no dispara señales: se invalida la grilla y se avisa a las pantallas a mano
+    cache_grilla.invalidar_dia(centro.pk, fecha)
+    eventos.publicar(centro.pk, fecha, eventos.evento_estados({e.instructor_id: e.activo for e in estados}))
+    return len(estados)
+
+
+# máximo de días que se pueden planificar en una sola operación (una temporada holgada)
+MAX_DIAS_PLANIFICACION = 366
+
+
+def fechas_del_patron(desde, hasta, dias_semana):
+    """Fechas entre desde y hasta (inclusive) cuyo weekday() está en dias_semana (0=lunes)."""
+    dias_semana = set(dias_semana)
+    fechas = []
+    actual = desde
+    while actual <= hasta:
+        if actual.weekday() in dias_semana:
+            fechas.append(actual)
+        actual += timedelta(days=1)
+    return fechas
+
+
+def planificar_asistencia(centro, desde, hasta, activo, dias_semana, ruts=None):
+    """
+    Aplica un patrón de asistencia (rango de fechas + días de semana) a varios
+    instructores del centro con un único upsert masivo.
+    Si ruts es vacío se aplica a todos los instructores del centro. Los días de
+    semana son obligatorios (todos los días = los 7): sin días y sin ruts se
+    reescribiría la asistencia de todo el centro en todo el rango.
+    Retorna la cantidad de registros escritos.
+    """
+    if not dias_semana:
+        raise ValueError("Elige al menos un día de la semana.")
+    if desde > hasta:
+        desde, hasta = hasta, desde
+    if (hasta - desde).days + 1 > MAX_DIAS_PLANIFICACION:
+        raise ValueError(f"El rango no puede superar {MAX_DIAS_PLANIFICACION} días.")
+
+    instructores = instructores_del_centro(centro)
+    if ruts:
+        instructores = instructores.filter(rut_usuario__in=ruts)
+    ruts_validos = list(instructores.values_list("rut_usuario", flat=True))
+
+    fechas = fechas_del_patron(desde, hasta, dias_semana)
+    estados = [
+        EstadoInstructor(instructor_id=rut, id_centro=centro, fecha=fecha, activo=activo)
+        for rut in ruts_validos
+        for fecha in fechas
+    ]
+    with transaction.atomic():
+        EstadoInstructor.objects.bulk_create(
+            estados,
+            update_conflicts=True,
+            unique_fields=["instructor", "fecha"],
+            update_fields=["activo", "id_centro"],
+        )
+    cambios = eventos.evento_estados({rut: activo for rut in ruts_validos})
+    for fecha in fechas:
+        cache_grilla.invalidar_dia(centro.pk, fecha)
+        eventos.publicar(centro.pk, fecha, cambios)
+    return len(estados)
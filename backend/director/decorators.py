@@ -1,12 +1,26 @@
 # backend_project/decorators.py
 from functools import wraps
+from asgiref.sync import iscoroutinefunction
 from django.shortcuts import redirect
+from backend_project.utils import usuario_actual, ausuario_actual
 
 def role_required(*roles_permitidos):
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                usuario = await ausuario_actual(request)
+                tipo = usuario.tipo_de_usuario_id if usuario else None
+                if tipo in roles_permitidos:
+                    return await view_func(request, *args, **kwargs)
+                return redirect('login')
+            return async_wrapper
+
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
-            tipo = request.session.get("tipo")
+            # el tipo sale del Usuario de la sesión (ya memoizado en request.usuario)
+            usuario = usuario_actual(request)
+            tipo = usuario.tipo_de_usuario_id if usuario else None
             if tipo in roles_permitidos:
                 return view_func(request, *args, **kwargs)
             return redirect('login')
@@ -0,0 +1,98 @@
+import csv
+import tempfile
+
+from django.http import StreamingHttpResponse, FileResponse
+from django.utils.timezone import localtime
+
+# Filas que se traen de la base por vuelta al exportar (memoria constante)
+CHUNK_EXPORTACION = 2000
+
+ENCABEZADOS_DETALLE = [
+    "Fecha", "Inicio", "Fin", "RUT instructor", "Apellido", "Nombre",
+    "Disciplina", "Nivel", "Titular", "Teléfono titular", "Alumnos", "Duración (min)",
+]
+
+ENCABEZADOS_RESUMEN = ["RUT", "Apellido", "Nombre", "Total minutos", "Total horas", "Total clases"]
+
+
+class _Eco:
+    """Pseudo-archivo para csv.writer: devuelve la línea en vez de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def respuesta_csv(nombre_archivo, encabezados, filas):
+    writer = csv.writer(_Eco())
+
+    def generar():
+        yield writer.writerow(encabezados)
+        for fila in filas:
+            yield writer.writerow(fila)
+
+    response = StreamingHttpResponse(generar(), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{nombre_archivo}.csv"'
+    return response
+
+
+def respuesta_xlsx(nombre_archivo, encabezados, filas):
+    """
+    XLSX con openpyxl en modo write_only: las filas se van escribiendo a disco,
+    no se arma la planilla completa en memoria. Requiere openpyxl.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Reporte")
+    ws.append(encabezados)
+    for fila in filas:
+        ws.append(list(fila))
+
+    archivo = tempfile.TemporaryFile()
+    wb.save(archivo)
+    archivo.seek(0)
+    return FileResponse(
+        archivo,
+        as_attachment=True,
+        filename=f"{nombre_archivo}.xlsx",
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+def exportar(formato, nombre_archivo, encabezados, filas):
+    if formato == "xlsx":
+        return respuesta_xlsx(nombre_archivo, encabezados, filas)
+    return respuesta_csv(nombre_archivo, encabezados, filas)
+
+
+def filas_detalle(clases_qs):
+    """Una fila por clase, iterando la consulta por bloques."""
+    valores = (
+        clases_qs
+        .order_by("hora_inicio", "id_clase")
+        .values_list(
+            "hora_inicio", "hora_fin",
+            "rut_usuario_id", "rut_usuario__apellido", "rut_usuario__nombre",
+            "disciplina_clase", "nivel_clase", "nombre_titular", "titular_telefono",
+            "cantidad_alumnos", "duracion",
+        )
+        .iterator(chunk_size=CHUNK_EXPORTACION)
+    )
+    for inicio, fin, *resto in valores:
+        inicio = localtime(inicio)
+        yield [
+            inicio.strftime("%Y-%m-%d"),
+            inicio.strftime("%H:%M"),
+            localtime(fin).strftime("%H:%M"),
+            *resto,
+        ]
+
+
+def filas_resumen(resumen_qs):
+    """Una fila por instructor a partir del .values().annotate() de reportes."""
+    for r in resumen_qs.iterator(chunk_size=CHUNK_EXPORTACION):
+        minutos = r["total_minutos"] or 0
+        yield [
+            r["rut_usuario__rut_usuario"], r["rut_usuario__apellido"], r["rut_usuario__nombre"],
+            minutos, round(minutos / 60.0, 2), r["total_clases"],
+        ]
@@ -1,5 +1,5 @@
 from django import forms
-from usuarios.models import Usuario, Identificador
+from usuarios.models import Usuario, Identificador, normalizar_correo
 from django.contrib.auth.hashers import make_password
 
 class InstructorForm(forms.ModelForm):
@@ -13,6 +13,9 @@ class InstructorForm(forms.ModelForm):
             'disciplina', 'nivel_instructor', 'idioma'
         ]
 
+    def clean_correo(self):
+        return normalizar_correo(self.cleaned_data.get("correo"))
+
     def save(self, commit=True, center=None):
         inst = super().save(commit=False)
         inst.tipo_de_usuario = Identificador.objects.get(pk='instructor')
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copiar_centro_del_instructor(apps, schema_editor):
+    # un solo UPDATE con subconsulta: no trae filas a Python
+    EstadoInstructor = apps.get_model("director", "EstadoInstructor")
+    Usuario = apps.get_model("usuarios", "Usuario")
+    EstadoInstructor.objects.update(id_centro=Subquery(
+        Usuario.objects.filter(pk=OuterRef("instructor")).values("id_centro")[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('centros', '0002_horario_grilla'),
+        ('director', '0002_alter_estadoinstructor_fecha_and_more'),
+        ('usuarios', '0008_correo_normalizado_unico'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='estadoinstructor',
+            name='id_centro',
+            field=models.ForeignKey(blank=True, db_column='Id_Centro', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='estados_instructores', to='centros.centrodeesqui'),
+        ),
+        migrations.RunPython(copiar_centro_del_instructor, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='estadoinstructor',
+            index=models.Index(fields=['id_centro', 'fecha', 'activo'], name='estado_centro_fecha_idx'),
+        ),
+    ]
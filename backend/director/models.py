@@ -1,6 +1,13 @@
 # director/models.py
 from django.db import models
-from usuarios.models import Usuario
+
+from centros.models import CentroDeEsqui, PorCentroQuerySet
+from usuarios.models import Usuario, copiar_centro
+
+
+class EstadoInstructorQuerySet(PorCentroQuerySet):
+    campo_centro = "id_centro"
+
 
 class EstadoInstructor(models.Model):
     instructor = models.ForeignKey(
@@ -11,9 +18,35 @@ class EstadoInstructor(models.Model):
     fecha = models.DateField(db_index=True)
     activo = models.BooleanField(default=True)
 
+    # Centro del instructor, copiado al guardar (activos de un centro en un día
+    # salen del índice (id_centro, fecha, activo) sin join con Usuario)
+    id_centro = models.ForeignKey(
+        CentroDeEsqui,
+        on_delete=models.PROTECT,
+        db_column="Id_Centro",
+        null=True,
+        blank=True,
+        related_name="estados_instructores",
+    )
+
+    objects = EstadoInstructorQuerySet.as_manager()
+
     class Meta:
         unique_together = (("instructor", "fecha"),)
-        indexes = [models.Index(fields=["instructor", "fecha"])]
+        indexes = [
+            models.Index(fields=["instructor", "fecha"]),
+            models.Index(fields=["id_centro", "fecha", "activo"], name="estado_centro_fecha_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        guardado = None
+        if self.pk is not None and self.id_centro_id is not None:
+            guardado = (
+                EstadoInstructor.objects.filter(pk=self.pk)
+                .values_list("instructor_id", flat=True).first()
+            )
+        copiar_centro(self, "instructor", kwargs, guardado)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.instructor} — {'Activo' if self.activo else 'Inactivo'} — {self.fecha}"
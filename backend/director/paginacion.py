@@ -0,0 +1,42 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def codificar_cursor(clase):
+    """Cursor opaco con la posición (hora_inicio, id_clase) de la última fila de la página."""
+    crudo = f"{clase.hora_inicio.isoformat()}|{clase.id_clase}"
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor):
+    """Retorna (hora_inicio, id_clase) o None si el cursor no es válido."""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        crudo = base64.urlsafe_b64decode(cursor + relleno).decode()
+        hora, id_clase = crudo.split("|")
+        return datetime.fromisoformat(hora), int(id_clase)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def pagina_keyset(clases_qs, cursor=None, tamano=50):
+    """
+    Página de clases de la más nueva a la más antigua, paginando por (hora_inicio, id_clase).
+    A diferencia de OFFSET, cada página cuesta lo mismo sin importar cuántas
+    temporadas haya guardadas. Retorna (clases, cursor_siguiente o None).
+    """
+    qs = clases_qs.order_by("-hora_inicio", "-id_clase")
+
+    posicion = decodificar_cursor(cursor) if cursor else None
+    if posicion:
+        hora, id_clase = posicion
+        qs = qs.filter(Q(hora_inicio__lt=hora) | Q(hora_inicio=hora, id_clase__lt=id_clase))
+
+    # una fila extra para saber si hay página siguiente
+    filas = list(qs[:tamano + 1])
+    if len(filas) > tamano:
+        filas = filas[:tamano]
+        return filas, codificar_cursor(filas[-1])
+    return filas, None
@@ -1,3 +1,203 @@
-from django.test import TestCase
+from datetime import datetime, time, timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import localdate, make_aware
+
+from backend_project.metricas import asertar_presupuesto
+from centros.models import CentroDeEsqui
+from clases.models import Clase
+from usuarios.models import Usuario, Identificador
+from .models import EstadoInstructor
+
+
+def poblar_centro(nombre, instructores=30, clases=60, fecha=None):
+    """Centro con un director, instructores activos en `fecha` y clases repartidas ese día."""
+    fecha = fecha or localdate()
+    for tipo in ("instructor", "boleteria", "director", "jefe_centro"):
+        Identificador.objects.get_or_create(tipo_de_usuario=tipo)
+
+    centro = CentroDeEsqui.objects.create(nombre_centro=nombre, ubicacion=nombre)
+    director = Usuario.objects.create(
+        rut_usuario=f"{nombre}-dir", nombre="Dir", apellido=nombre,
+        tipo_de_usuario_id="director", id_centro=centro,
+    )
+    insts = Usuario.objects.bulk_create([
+        Usuario(rut_usuario=f"{nombre}-{i}", nombre="Inst", apellido=f"{nombre}{i:03d}",
+                tipo_de_usuario_id="instructor", id_centro=centro,
+                disciplina="ambos", nivel_instructor=3, idioma="español")
+        for i in range(instructores)
+    ])
+    EstadoInstructor.objects.bulk_create([
+        EstadoInstructor(instructor=inst, id_centro=centro, fecha=fecha, activo=True) for inst in insts
+    ])
+    for n in range(clases):
+        inicio = make_aware(datetime.combine(fecha, time(9 + n // instructores, 0)))
+        Clase.objects.create(
+            nombre_titular=f"Titular {n}", titular_telefono="0",
+            nivel_clase=1, disciplina_clase="ski",
+            hora_inicio=inicio, hora_fin=inicio + timedelta(minutes=60), duracion=60,
+            cantidad_alumnos=1, rut_usuario=insts[n % instructores],
+        )
+    return centro, director, insts
+
+
+def asertar_filtra_por_centro(testcase, sentencias):
+    """
+    Toda lectura de clases, asistencia o resumen capturada filtra por su propia columna
+    de centro (la del índice por centro, sin join con Usuario).
+    """
+    lecturas = 0
+    for sql in sentencias:
+        if not sql.startswith("SELECT"):
+            continue
+        for tabla in ('"clases_clase"', '"director_estadoinstructor"', '"clases_resumendiarioinstructor"'):
+            if f"FROM {tabla}" in sql:
+                lecturas += 1
+                testcase.assertIn(f'{tabla}."Id_Centro" =', sql, f"Consulta sin filtro de centro: {sql}")
+    testcase.assertTrue(lecturas, "No se capturó ninguna lectura de clases o asistencia.")
+
+
+def medir_get(testcase, url):
+    """GET con la cache vacía; retorna la respuesta y el SQL que corrió."""
+    cache.clear()
+    with CaptureQueriesContext(connection) as capturadas:
+        r = testcase.client.get(url)
+    testcase.assertEqual(r.status_code, 200, url)
+    return r, [q["sql"] for q in capturadas]
+
+
+def entrar(client, usuario):
+    """Sesión como la que deja login_view (sin pasar por el hash de la contraseña)."""
+    session = client.session
+    session["usuario_id"] = usuario.rut_usuario
+    session["nombre"] = usuario.nombre
+    session["tipo"] = usuario.tipo_de_usuario_id
+    session.save()
+
+
+class PresupuestoConsultasDirectorTests(TestCase):
+    """
+    Las vistas del director hacen una cantidad fija de consultas: no crece con
+    instructores ni clases (un N+1 nuevo hace fallar estos tests).
+    Ver PRESUPUESTO_CONSULTAS en settings.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hoy = localdate()
+        cls.centro, cls.director, cls.insts = poblar_centro("norte")
+
+    def setUp(self):
+        cache.clear()  # peor caso: grilla y usuario de sesión sin cache
+        entrar(self.client, self.director)
+
+    def test_dashboard(self):
+        asertar_presupuesto(self, self.client.get("/director/dashboard/"))
+
+    def test_dashboard_json_sin_y_con_cache(self):
+        url = f"/director/dashboard/json/?fecha={self.hoy}"
+        primera = self.client.get(url)
+        self.assertEqual(primera.status_code, 200)
+        asertar_presupuesto(self, primera)
+        segunda = self.client.get(url)
+        asertar_presupuesto(self, segunda)
+        self.assertLess(segunda.metricas.consultas, primera.metricas.consultas)
+
+    def test_reportes_todos(self):
+        asertar_presupuesto(self, self.client.get("/director/reportes/?inst=todos"))
+
+    def test_reportes_un_instructor(self):
+        r = self.client.get(f"/director/reportes/?inst={self.insts[0].rut_usuario}")
+        self.assertEqual(r.status_code, 200)
+        asertar_presupuesto(self, r)
+
+    def test_historial(self):
+        asertar_presupuesto(self, self.client.get("/director/historial/"))
+        asertar_presupuesto(self, self.client.get("/director/historial/json/"))
+
+    @override_settings(METRICAS_SERVER_TIMING=True)
+    def test_server_timing_y_estadisticas(self):
+        r = self.client.get("/director/dashboard/")
+        self.assertIn("db;dur=", r["Server-Timing"])
+        self.assertIn("total;dur=", r["Server-Timing"])
+
+        stats = self.client.get("/director/metricas/").json()
+        self.assertGreaterEqual(stats["director_dashboard"]["requests"], 1)
+        self.assertIsNotNone(stats["director_dashboard"]["presupuesto_consultas"])
+
+    @override_settings(METRICAS_SERVER_TIMING=False)
+    def test_sin_server_timing(self):
+        r = self.client.get("/director/dashboard/")
+        self.assertNotIn("Server-Timing", r)
+        asertar_presupuesto(self, r)
+
+
+class AislamientoCentrosDirectorTests(TestCase):
+    """
+    La grilla de un centro cuesta lo mismo con o sin un centro vecino grande:
+    clases y asistencia se filtran por centro en SQL, no en Python.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hoy = localdate()
+        cls.centro, cls.director, cls.insts = poblar_centro("este", instructores=10, clases=20)
+
+    def setUp(self):
+        entrar(self.client, self.director)
+
+    def test_dashboard_json_no_depende_de_otros_centros(self):
+        url = f"/director/dashboard/json/?fecha={self.hoy}"
+        antes, _ = medir_get(self, url)
+        _otro, _dir, otros = poblar_centro("oeste", instructores=60, clases=240)
+        EstadoInstructor.objects.filter(instructor__in=otros).update(activo=False)
+
+        despues, sql = medir_get(self, url)
+        self.assertEqual(despues.metricas.consultas, antes.metricas.consultas)
+        self.assertEqual(despues.json(), antes.json())
+        self.assertEqual(len(despues.json()["clases"]), 20)
+        self.assertEqual(despues.json()["resumen_horas"], 20.0)  # solo las horas del centro
+        asertar_filtra_por_centro(self, sql)
+
+    def test_reportes_e_historial_filtran_en_sql(self):
+        poblar_centro("oeste", instructores=5, clases=10)
+        for url in ("/director/reportes/?inst=todos", "/director/historial/json/"):
+            _r, sql = medir_get(self, url)
+            asertar_filtra_por_centro(self, sql)
+
+
+class PlanificarAsistenciaTests(TestCase):
+    """Planificación por rango de fechas (director/asistencia.py: planificar_asistencia)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hoy = localdate()
+        cls.centro, cls.director, cls.insts = poblar_centro("plan", instructores=3, clases=0)
+
+    def setUp(self):
+        entrar(self.client, self.director)
+
+    def _planificar(self, dias, instructores=()):
+        hasta = self.hoy + timedelta(days=13)
+        return self.client.post("/director/asistencia/rango/", {
+            "desde": self.hoy.isoformat(), "hasta": hasta.isoformat(),
+            "dias": dias, "instructores": list(instructores), "activo": "0",
+        })
+
+    def test_sin_dias_no_escribe_nada(self):
+        antes = EstadoInstructor.objects.count()
+        r = self._planificar([])
+        self.assertEqual(r.status_code, 400)
+        self.assertIn("al menos un día", r.json()["error"])
+        self.assertEqual(EstadoInstructor.objects.count(), antes)
+
+    def test_dias_elegidos(self):
+        r = self._planificar([5, 6], [self.insts[0].rut_usuario])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()["registros"], 4)  # dos fines de semana
+        inactivos = EstadoInstructor.objects.filter(activo=False)
+        self.assertEqual({e.fecha.weekday() for e in inactivos}, {5, 6})
+        self.assertEqual({e.instructor_id for e in inactivos}, {self.insts[0].rut_usuario})
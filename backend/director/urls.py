@@ -3,9 +3,14 @@ from . import views
 
 urlpatterns = [
     path('dashboard/', views.director_dashboard, name='director_dashboard'),
+    path('dashboard/json/', views.director_dashboard_json, name='director_dashboard_json'),
     path('asistencia/', views.director_asistencia, name='director_asistencia'),
+    path('asistencia/rango/', views.director_asistencia_rango, name='director_asistencia_rango'),
     path('reportes/', views.director_reportes, name='director_reportes'),
     path('historial/', views.director_historial, name='director_historial'),
+    path('historial/json/', views.director_historial_json, name='director_historial_json'),
+    path('cache/grilla/', views.director_cache_grilla, name='director_cache_grilla'),
+    path('metricas/', views.director_metricas, name='director_metricas'),
     path('instructores/crear/', views.director_crear_instructor, name='director_crear_instructor'),
     path('instructores/eliminar/<str:rut>/', views.director_eliminar_instructor, name='director_eliminar_instructor'),
 ]
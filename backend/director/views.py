@@ -1,17 +1,31 @@
+import hashlib
+import json
+
 from django.shortcuts import render
-from django.db.models import Sum, Count
-from django.utils.timezone import now, get_current_timezone, make_aware
+from django.db.models import Q, Sum
+from django.utils.timezone import now
 from datetime import timedelta, datetime, date
-from clases.models import Clase
+from clases.models import Clase, ResumenDiarioInstructor
+from clases.grilla import GrillaHorario
+from clases import cache_grilla
+from clases.cache_grilla import agrilla_cacheada
+from clases.eventos import evento_clase
 from usuarios.models import Usuario
 from .models import EstadoInstructor
 from .decorators import role_required
-from django.http import JsonResponse
+from .paginacion import pagina_keyset
+from .asistencia import guardar_asistencia, planificar_asistencia
+from django.http import JsonResponse, HttpResponse, HttpResponseNotModified
+from django.core.serializers.json import DjangoJSONEncoder
 from django.views.decorators.http import require_POST
 from .forms import InstructorForm
+from .exportar import (
+    exportar, filas_detalle, filas_resumen, ENCABEZADOS_DETALLE, ENCABEZADOS_RESUMEN,
+)
 from django.shortcuts import render
 from django.contrib import messages
-from backend_project.utils import centro_del_sesion
+from backend_project.utils import centro_del_sesion, acentro_del_sesion
+from backend_project import metricas
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.utils.timezone import localdate
@@ -25,12 +39,88 @@ def _parse_fecha(value: str, default: date):
         return datetime.strptime(value, "%Y-%m-%d").date()
     except Exception:
         return default
+
+
+async def _adatos_dashboard(centro, fecha):
+    """
+    Datos compactos de la grilla del director para un día: configuración de
+    bloques, instructores del centro con su estado y las clases como intervalos.
+    No se expande por bloque: el tamaño crece con las clases, no con
+    instructores × bloques (el navegador ubica cada clase, ver dashboard_grilla.js).
+    """
+    instructores = [
+        inst async for inst in
+        Usuario.objects.filter(
+            tipo_de_usuario__tipo_de_usuario__iexact="instructor",
+            id_centro=centro
+        ).order_by("apellido", "nombre")
+    ]
+
+    # Estado activo/inactivo del día (solo filas del centro)
+    estados_map = {
+        rut: activo async for rut, activo in
+        EstadoInstructor.objects.del_centro(centro).filter(fecha=fecha)
+        .values_list("instructor_id", "activo")
+    }
+
+    # Grilla según el horario del centro (9:00 a 17:00 cada 30 min por defecto)
+    grilla = GrillaHorario.para_centro(fecha, centro)
+
+    # Clases del día del centro (el total de horas es del centro, no de todos)
+    ruts = {inst.rut_usuario for inst in instructores}
+    clases = []
+    minutos_totales = 0
+    async for c in Clase.objects.del_centro(centro).del_dia(fecha).order_by("hora_inicio"):
+        minutos_totales += c.duracion
+        if c.rut_usuario_id in ruts and grilla.rango(c.hora_inicio, c.hora_fin):
+            clase = evento_clase(c)
+            del clase["tipo"]
+            clases.append(clase)
+
+    return {
+        "fecha": fecha.isoformat(),
+        "inicio": grilla.inicio.isoformat(),
+        "minutos_bloque": grilla.minutos_bloque,
+        "horas": grilla.horas,
+        "instructores": [
+            {
+                "rut": inst.rut_usuario,
+                "nombre": inst.nombre,
+                "apellido": inst.apellido,
+                "edad": inst.edad,
+                "nivel": inst.nivel_instructor,
+                "disciplina": inst.disciplina,
+                "idioma": inst.idioma,
+                "activo": estados_map.get(inst.rut_usuario, False),
+            }
+            for inst in instructores
+        ],
+        "clases": clases,
+        "resumen_horas": round(minutos_totales / 60.0, 2),
+    }
+
+
+async def _agrilla_json(centro, fecha):
+    """
+    Cuerpo JSON de la grilla ya serializado, con su ETag. Se cachea serializado
+    para que un hit no vuelva a pasar por json.dumps.
+    """
+    async def aconstruir():
+        datos = await _adatos_dashboard(centro, fecha)
+        cuerpo = json.dumps(datos, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+        return {"cuerpo": cuerpo, "etag": '"%s"' % hashlib.md5(cuerpo).hexdigest()}
+
+    return await agrilla_cacheada("dashboard_json", getattr(centro, "pk", None), fecha, aconstruir)
+
+
 # 🔹 DASHBOARD: vista principal del director
 @role_required('director', 'jefe_centro')
-def director_dashboard(request):
+async def director_dashboard(request):
     """
     Muestra el calendario diario con instructores activos/inactivos.
-    Permite navegar por fechas (?fecha=YYYY-MM-DD) y filtrar solo activos (?solo_activos=1).
+    Solo entrega la página: la grilla la arma el navegador desde
+    director_dashboard_json, y cambiar de fecha (?fecha=YYYY-MM-DD) o el filtro
+    solo activos (?solo_activos=1) no recarga la página.
     """
     # 1️⃣ Fecha seleccionada
     try:
@@ -39,86 +129,33 @@ def director_dashboard(request):
     except Exception:
         fecha = now().date()
 
-    solo_activos = request.GET.get("solo_activos") == "1"
-
-    # 2️⃣ Instructores base
-    centro = centro_del_sesion(request)
-
-    instructores_qs = Usuario.objects.filter(
-        tipo_de_usuario__tipo_de_usuario__iexact="instructor",
-        id_centro=centro
-    ).order_by("apellido", "nombre")
-
-    estados_qs = EstadoInstructor.objects.filter(fecha=fecha, instructor__id_centro=centro)
-
-
-    # 3️⃣ Estado activo/inactivo del día
-    estados_qs = EstadoInstructor.objects.filter(fecha=fecha)
-    estados_map = {e.instructor.rut_usuario: e.activo for e in estados_qs}
-
-    if solo_activos:
-        activos_rut = [rut for rut, act in estados_map.items() if act]
-        if activos_rut:
-            instructores_qs = instructores_qs.filter(rut_usuario__in=activos_rut)
-
-    # 4️⃣ Horarios de 30 minutos (9:00 a 17:00)
-    start_hour, end_hour = 9, 17
-    HORAS = []
-    cur = datetime.strptime(f"{fecha} {start_hour:02d}:00", "%Y-%m-%d %H:%M")
-    limit = datetime.strptime(f"{fecha} {end_hour:02d}:00", "%Y-%m-%d %H:%M")
-    while cur <= limit:
-        HORAS.append(cur.strftime("%H:%M"))
-        cur += timedelta(minutes=30)
-
-    # 5️⃣ Clases del día
-    clases_hoy = (
-        Clase.objects
-        .filter(hora_inicio__date=fecha)
-        .select_related("rut_usuario")
-        .order_by("hora_inicio")
-    )
-
-    # 6️⃣ Mapa horario vacío
-    horario = {inst.rut_usuario: {slot: None for slot in HORAS} for inst in instructores_qs}
-    tz = get_current_timezone()
-
-    # 7️⃣ Rellenar celdas
-    for clase in clases_hoy:
-        inst_id = clase.rut_usuario.rut_usuario
-        inicio, fin = clase.hora_inicio, clase.hora_fin
-        if inst_id not in horario:
-            continue
-        for slot_str in HORAS:
-            slot_naive = datetime.strptime(f"{fecha} {slot_str}", "%Y-%m-%d %H:%M")
-            slot_inicio = make_aware(slot_naive, timezone=tz)
-            slot_fin = slot_inicio + timedelta(minutes=30)
-            if (slot_inicio < fin) and (slot_fin > inicio):
-                horario[inst_id][slot_str] = clase
-
-    # 8️⃣ Filas renderizables
-    filas_tabla = []
-    for inst in instructores_qs:
-        fila = {
-            "instructor": inst,
-            "activo": estados_map.get(inst.rut_usuario, False),
-            "celdas": [horario[inst.rut_usuario][slot] for slot in HORAS],
-        }
-        filas_tabla.append(fila)
-
-    # 9️⃣ Resumen simple
-    minutos_totales = clases_hoy.aggregate(m=Sum("duracion"))["m"] or 0
-    horas_totales = round(minutos_totales / 60.0, 2)
-
     context = {
         "fecha": fecha,
-        "horas": HORAS,
-        "filas_tabla": filas_tabla,
-        "solo_activos": solo_activos,
-        "resumen_horas": horas_totales,
+        "solo_activos": request.GET.get("solo_activos") == "1",
     }
     return render(request, "director/dashboard.html", context)
 
 
+# 🔹 DASHBOARD: grilla del día en JSON
+@role_required('director', 'jefe_centro')
+async def director_dashboard_json(request):
+    """
+    Grilla de ?fecha=YYYY-MM-DD en JSON: horas, instructores (con activo) y clases
+    como intervalos. Responde 304 si el navegador ya tiene esa versión (ETag).
+    """
+    fecha = _parse_fecha(request.GET.get("fecha", ""), now().date())
+    centro = await acentro_del_sesion(request)
+    grilla = await _agrilla_json(centro, fecha)
+
+    if request.headers.get("If-None-Match") == grilla["etag"]:
+        respuesta = HttpResponseNotModified()
+    else:
+        respuesta = HttpResponse(grilla["cuerpo"], content_type="application/json")
+    respuesta["ETag"] = grilla["etag"]
+    respuesta["Cache-Control"] = "private, no-cache"
+    return respuesta
+
+
 # 🔹 ASISTENCIA DIARIA (toggle activo/inactivo)
 @role_required('director', 'jefe_centro')
 @require_POST
@@ -135,19 +172,112 @@ def director_asistencia(request):
     except Exception:
         fecha = now().date()
 
-    activos = set(request.POST.getlist("activos"))  # lista de ruts activos
+    centro = centro_del_sesion(request)
+    if not centro:
+        return JsonResponse({"ok": False, "error": "No se pudo determinar tu centro."}, status=400)
 
-    instructores = Usuario.objects.filter(
-        tipo_de_usuario__tipo_de_usuario__iexact="instructor"
+    activos = request.POST.getlist("activos")  # lista de ruts activos
+    guardar_asistencia(centro, fecha, activos)
+
+    return JsonResponse({"ok": True})
+
+
+# 🔹 ESTADÍSTICAS DEL CACHE DE GRILLAS (hits / misses)
+@role_required('director', 'jefe_centro')
+def director_cache_grilla(request):
+    return JsonResponse(cache_grilla.estadisticas())
+
+
+# 🔹 MÉTRICAS POR VISTA (consultas, tiempos y presupuestos; ver backend_project/metricas.py)
+@role_required('director', 'jefe_centro')
+def director_metricas(request):
+    if request.method == "POST":
+        metricas.reiniciar()
+    return JsonResponse(metricas.estadisticas())
+
+
+# 🔹 PLANIFICACIÓN DE ASISTENCIA (rango de fechas + días de semana)
+@role_required('director', 'jefe_centro')
+@require_POST
+def director_asistencia_rango(request):
+    """
+    Marca activos/inactivos a varios instructores para todo un rango de fechas y retorna JSON.
+    Espera:
+      - desde, hasta: YYYY-MM-DD (inclusive)
+      - dias: lista de días de semana 0-6 (0 = lunes); al menos uno (todos = los 7)
+      - instructores: lista de ruts; vacío = todos los del centro
+      - activo: "1" activo, "0" inactivo
+    """
+    centro = centro_del_sesion(request)
+    if not centro:
+        return JsonResponse({"ok": False, "error": "No se pudo determinar tu centro."}, status=400)
+
+    try:
+        desde = datetime.strptime(request.POST.get("desde", ""), "%Y-%m-%d").date()
+        hasta = datetime.strptime(request.POST.get("hasta", ""), "%Y-%m-%d").date()
+        dias = [int(d) for d in request.POST.getlist("dias")]
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "Fechas o días inválidos."}, status=400)
+
+    if any(d < 0 or d > 6 for d in dias):
+        return JsonResponse({"ok": False, "error": "Días de semana inválidos."}, status=400)
+
+    activo = request.POST.get("activo", "1") in ("1", "true", "True")
+    ruts = request.POST.getlist("instructores")
+
+    try:
+        registros = planificar_asistencia(
+            centro, desde, hasta, activo, dias_semana=dias, ruts=ruts
+        )
+    except ValueError as e:
+        return JsonResponse({"ok": False, "error": str(e)}, status=400)
+
+    return JsonResponse({"ok": True, "registros": registros})
+
+
+def _resumen_del_periodo(centro, desde, hasta):
+    """Filas del resumen diario (instructor × día × disciplina) del período y centro."""
+    return ResumenDiarioInstructor.objects.del_centro(centro).filter(fecha__gte=desde, fecha__lte=hasta)
+
+
+def _resumen_por_instructor(resumen_qs):
+    # suma el resumen diario: O(días × instructores) en vez de recorrer todas las clases
+    return (
+        resumen_qs
+        .values(
+            "rut_usuario__rut_usuario",
+            "rut_usuario__nombre",
+            "rut_usuario__apellido",
+        )
+        .annotate(
+            total_minutos=Sum("minutos"),
+            total_clases=Sum("clases"),
+        )
+        .order_by("-total_minutos")
     )
 
-    for inst in instructores:
-        activo = inst.rut_usuario in activos
-        EstadoInstructor.objects.update_or_create(
-            instructor=inst, fecha=fecha, defaults={"activo": activo}
+
+def _exportar_reporte(export, formato, centro, inst_id, desde, hasta):
+    """
+    Descarga del reporte: 'detalle' (una fila por clase) o 'resumen' (una por instructor).
+    Las filas salen de la base por bloques, así la memoria no crece con el rango.
+    """
+    if export == "detalle":
+        clases_qs = Clase.objects.del_centro(centro).en_rango(desde, hasta)
+        if inst_id and inst_id != "todos":
+            clases_qs = clases_qs.filter(rut_usuario_id=inst_id)
+        return exportar(
+            formato, f"detalle_clases_{desde}_{hasta}",
+            ENCABEZADOS_DETALLE, filas_detalle(clases_qs),
         )
 
-    return JsonResponse({"ok": True})
+    resumen_qs = _resumen_del_periodo(centro, desde, hasta)
+    if inst_id and inst_id != "todos":
+        resumen_qs = resumen_qs.filter(rut_usuario_id=inst_id)
+    return exportar(
+        formato, f"resumen_instructores_{desde}_{hasta}",
+        ENCABEZADOS_RESUMEN, filas_resumen(_resumen_por_instructor(resumen_qs)),
+    )
 
 
 # 🔹 REPORTES MENSUALES
@@ -201,6 +331,13 @@ def director_reportes(request):
     if desde > hasta:
         desde, hasta = hasta, desde
 
+    # ================== EXPORTAR (CSV / XLSX en streaming) ==================
+    export = request.GET.get("export")  # "detalle" o "resumen"
+    if export in ("detalle", "resumen"):
+        return _exportar_reporte(
+            export, request.GET.get("formato", "csv"), centro, inst_id, desde, hasta
+        )
+
     # Determinar modo según valor de inst
     if inst_id == "todos":
         modo = "todos"
@@ -226,39 +363,21 @@ def director_reportes(request):
         instructor_sel = get_object_or_404(Usuario, **filtros_instructor)
 
         clases = (
-            Clase.objects.filter(
-                rut_usuario=instructor_sel,
-                hora_inicio__date__gte=desde,
-                hora_inicio__date__lte=hasta,
-            )
+            Clase.objects.en_rango(desde, hasta)
+            .filter(rut_usuario=instructor_sel)
             .order_by("hora_inicio")
         )
 
-        agg = clases.aggregate(total=Sum("duracion"))
+        agg = (
+            _resumen_del_periodo(centro, desde, hasta)
+            .filter(rut_usuario=instructor_sel)
+            .aggregate(total=Sum("minutos"))
+        )
         total_minutos = agg["total"] or 0
 
     # ================== MODO: TODOS LOS INSTRUCTORES ==================
     elif modo == "todos":
-        clases_qs = Clase.objects.filter(
-            hora_inicio__date__gte=desde,
-            hora_inicio__date__lte=hasta,
-        )
-        if centro:
-            clases_qs = clases_qs.filter(rut_usuario__id_centro=centro)
-
-        resumen_qs = (
-            clases_qs
-            .values(
-                "rut_usuario__rut_usuario",
-                "rut_usuario__nombre",
-                "rut_usuario__apellido",
-            )
-            .annotate(
-                total_minutos=Sum("duracion"),
-                total_clases=Count("id_clase"),
-            )
-            .order_by("-total_minutos")
-        )
+        resumen_qs = _resumen_por_instructor(_resumen_del_periodo(centro, desde, hasta))
 
         resumen = []
         for row in resumen_qs:
@@ -291,28 +410,92 @@ def director_reportes(request):
 
 
 # 🔹 HISTORIAL DE CLASES
-@role_required('jefe_centro', 'director')
-def director_historial(request):
+HISTORIAL_POR_PAGINA = 50
+
+
+def _historial_filtrado(request, centro):
+    """Clases del centro con los filtros del GET (desde/hasta/instructor)."""
     fecha_inicio = request.GET.get("desde")
     fecha_fin = request.GET.get("hasta")
 
-    clases = Clase.objects.all()
+    clases = Clase.objects.del_centro(centro).select_related("rut_usuario")
+
     if fecha_inicio and fecha_fin:
-        clases = clases.filter(hora_inicio__date__range=[fecha_inicio, fecha_fin])
+        desde = _parse_fecha(fecha_inicio, None)
+        hasta = _parse_fecha(fecha_fin, None)
+        if desde and hasta:
+            clases = clases.en_rango(desde, hasta)
 
     instructor = request.GET.get("instructor")
     if instructor:
         clases = clases.filter(rut_usuario_id=instructor)
 
+    return clases
+
+
+@role_required('jefe_centro', 'director')
+def director_historial(request):
+    centro = centro_del_sesion(request)
+    clases = _historial_filtrado(request, centro)
+
+    # Descarga del historial filtrado (?export=csv o ?export=xlsx)
+    formato = request.GET.get("export")
+    if formato in ("csv", "xlsx"):
+        return exportar(formato, "historial_clases", ENCABEZADOS_DETALLE, filas_detalle(clases))
+
+    pagina, siguiente = pagina_keyset(clases, request.GET.get("cursor"), HISTORIAL_POR_PAGINA)
+
     instructores = Usuario.objects.filter(
-        tipo_de_usuario__tipo_de_usuario__iexact="instructor"
-    )
+        tipo_de_usuario__tipo_de_usuario__iexact="instructor",
+        id_centro=centro,
+    ).order_by("apellido", "nombre")
+
+    # filtros actuales para armar el link a la página siguiente
+    filtros = request.GET.copy()
+    filtros.pop("cursor", None)
+    url_siguiente = None
+    if siguiente:
+        filtros["cursor"] = siguiente
+        url_siguiente = f"?{filtros.urlencode()}"
 
     return render(request, "director/historial.html", {
-        "clases": clases.order_by("-hora_inicio"),
+        "clases": pagina,
         "instructores": instructores,
+        "url_siguiente": url_siguiente,
+        "es_primera_pagina": not request.GET.get("cursor"),
+        "desde": request.GET.get("desde", ""),
+        "hasta": request.GET.get("hasta", ""),
+        "instructor_id": request.GET.get("instructor", ""),
     })
 
+
+@role_required('jefe_centro', 'director')
+def director_historial_json(request):
+    """Misma consulta que el historial, en JSON: ?cursor=... para pedir la página siguiente."""
+    centro = centro_del_sesion(request)
+    pagina, siguiente = pagina_keyset(
+        _historial_filtrado(request, centro), request.GET.get("cursor"), HISTORIAL_POR_PAGINA
+    )
+    resultados = [
+        {
+            "id_clase": c.id_clase,
+            "hora_inicio": c.hora_inicio.isoformat(),
+            "hora_fin": c.hora_fin.isoformat(),
+            "duracion": c.duracion,
+            "disciplina_clase": c.disciplina_clase,
+            "nivel_clase": c.nivel_clase,
+            "nombre_titular": c.nombre_titular,
+            "cantidad_alumnos": c.cantidad_alumnos,
+            "instructor": {
+                "rut": c.rut_usuario_id,
+                "nombre": c.rut_usuario.nombre,
+                "apellido": c.rut_usuario.apellido,
+            },
+        }
+        for c in pagina
+    ]
+    return JsonResponse({"resultados": resultados, "siguiente": siguiente})
+
 @role_required('director', 'jefe_centro')
 def instructores_list(request):
     centro = centro_del_sesion(request)
@@ -381,6 +564,9 @@ def director_crear_instructor(request):
                 user.set_password(raw_password)
                 user.save()
 
+                usuario.user = user
+                usuario.save(update_fields=["user"])
+
                 messages.success(request, "Instructor creado correctamente.")
             except Exception as e:
                 messages.error(request, f"No se pudo crear: {e}")
@@ -430,7 +616,8 @@ def director_eliminar_instructor(request, rut):
         username_candidates.append(inst.correo.strip().lower())
     username_candidates.append(inst.rut_usuario)
 
-    User.objects.filter(username__in=username_candidates).delete()
+    user_ids = [inst.user_id] if inst.user_id else []
+    User.objects.filter(Q(username__in=username_candidates) | Q(pk__in=user_ids)).delete()
 
     # 🔹 Borrar el registro de Usuario
     inst.delete()
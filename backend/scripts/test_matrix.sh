@@ -0,0 +1,48 @@
+#!/usr/bin/env bash
+# Corre los chequeos y tests del backend contra cada perfil de base de datos:
+#   sqlite            (WAL, perfil por defecto)
+#   postgres + pool   (psycopg 3)
+#   postgres sin pool (CONN_MAX_AGE + health checks)
+#
+# Postgres se levanta en un contenedor desechable (docker) que se borra al terminar.
+# Uso (desde backend/):  ./scripts/test_matrix.sh [args extra para manage.py test]
+# Para usar un Postgres ya corriendo: POSTGRES_HOST=... POSTGRES_PORT=... SIN_DOCKER=1
+# (ese servidor necesita la extensión btree_gist de contrib para la restricción de
+# solapes de clases/migrations/0002; la imagen oficial de postgres ya la trae)
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+
+PG_IMAGEN="${PG_IMAGEN:-postgres:16-alpine}"
+PG_PUERTO="${POSTGRES_PORT:-55432}"
+CONTENEDOR="escuela-nieve-test-$$"
+
+correr() {
+    local nombre="$1"; shift
+    echo "=== ${nombre} ==="
+    env "$@" python manage.py check
+    env "$@" python manage.py makemigrations --check --dry-run
+    env "$@" python manage.py test --noinput "${ARGS_TEST[@]}"
+}
+
+ARGS_TEST=("$@")
+
+correr "sqlite (WAL)" DB_PERFIL=sqlite
+
+if [[ "${SIN_DOCKER:-0}" != "1" ]]; then
+    trap 'docker rm -f "$CONTENEDOR" >/dev/null 2>&1 || true' EXIT
+    docker run -d --rm --name "$CONTENEDOR" \
+        -e POSTGRES_PASSWORD=test -e POSTGRES_DB=escuela_nieve \
+        -p "${PG_PUERTO}:5432" "$PG_IMAGEN" >/dev/null
+    echo "Esperando a Postgres en el puerto ${PG_PUERTO}..."
+    for _ in $(seq 1 60); do
+        if docker exec "$CONTENEDOR" pg_isready -U postgres -q; then break; fi
+        sleep 1
+    done
+    export POSTGRES_HOST=127.0.0.1 POSTGRES_PORT="$PG_PUERTO" POSTGRES_USER=postgres POSTGRES_PASSWORD=test
+fi
+
+correr "postgres + pool" DB_PERFIL=postgres POSTGRES_POOL=1
+correr "postgres (CONN_MAX_AGE)" DB_PERFIL=postgres POSTGRES_POOL=0
+
+echo "Matriz OK"
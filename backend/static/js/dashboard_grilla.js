@@ -0,0 +1,219 @@
+// Grilla del director armada en el navegador.
+//
+// El servidor entrega la página sin grilla y este script pide el día a
+// data-json (?fecha=YYYY-MM-DD): horas, instructores y clases como intervalos.
+// Las filas se arman aquí y cada clase se ubica con grillaEnVivo.ponerClase
+// (las mismas tarjetas que usan los eventos en vivo). Cambiar de fecha o el
+// filtro "solo activos" solo vuelve a pedir el JSON y actualiza la URL.
+(function () {
+  const tabla = document.getElementById('grilla');
+  if (!tabla || !tabla.dataset.json || !window.grillaEnVivo) return;
+
+  const form = document.getElementById('filtro-dia');
+  const inpFecha = document.getElementById('inp-fecha');
+  const inpSolo = document.getElementById('inp-solo-activos');
+
+  const estado = { fecha: inpFecha.value, solo: inpSolo.checked, datos: null };
+  let pedido = 0; // descarta respuestas de una fecha que ya no se está mirando
+
+  function el(tag, clase, texto) {
+    const e = document.createElement(tag);
+    if (clase) e.className = clase;
+    if (texto !== undefined) e.textContent = texto;
+    return e;
+  }
+
+  function nombreCompleto(inst) {
+    return inst.apellido + ', ' + inst.nombre;
+  }
+
+  function meta(inst) {
+    let texto = 'Nivel ' + (inst.nivel || '—') + ' · ' + (inst.disciplina || '—');
+    if (inst.idioma) texto += ' · ' + inst.idioma;
+    return texto;
+  }
+
+  function visibles(datos) {
+    // igual que antes: si nadie está activo se muestran todos
+    if (!estado.solo) return datos.instructores;
+    const activos = datos.instructores.filter((i) => i.activo);
+    return activos.length ? activos : datos.instructores;
+  }
+
+  function filaInstructor(inst, totalBloques) {
+    const tr = el('tr', inst.activo ? '' : 'fila-inactiva');
+    tr.dataset.rut = inst.rut;
+
+    const col = el('td', 'inst-col');
+    const nombre = el('div', 'inst-nombre', nombreCompleto(inst) + ', ' + (inst.edad || '—') + ' ');
+    nombre.appendChild(el('span', 'badge ' + (inst.activo ? 'badge-ok' : 'badge-off'), inst.activo ? 'Activo' : 'Inactivo'));
+    col.appendChild(nombre);
+    col.appendChild(el('div', 'inst-meta', meta(inst)));
+
+    const eliminar = el('button', 'btn secondary', 'Eliminar instructor');
+    eliminar.type = 'button';
+    eliminar.addEventListener('click', () => abrirEliminarInstructor(inst.rut, nombreCompleto(inst)));
+    col.appendChild(eliminar);
+    tr.appendChild(col);
+
+    for (let i = 0; i < totalBloques; i++) {
+      const td = el('td');
+      td.dataset.bloque = i;
+      td.appendChild(el('div', 'empty', '·'));
+      tr.appendChild(td);
+    }
+    return tr;
+  }
+
+  function armarGrilla(datos) {
+    tabla.dataset.inicio = datos.inicio;
+    tabla.dataset.minutos = datos.minutos_bloque;
+
+    const frag = document.createDocumentFragment();
+    const encabezado = el('tr');
+    encabezado.appendChild(el('th', '', 'Instructor'));
+    datos.horas.forEach((h) => encabezado.appendChild(el('th', '', h)));
+    frag.appendChild(encabezado);
+    visibles(datos).forEach((inst) => frag.appendChild(filaInstructor(inst, datos.horas.length)));
+    tabla.replaceChildren(frag);
+
+    datos.clases.forEach(grillaEnVivo.ponerClase);
+  }
+
+  function fila(texto, input) {
+    const row = el('div', 'row');
+    row.appendChild(texto);
+    const label = el('label');
+    label.appendChild(input);
+    row.appendChild(label);
+    return row;
+  }
+
+  function checkbox(nombre, valor, marcado) {
+    const c = el('input');
+    c.type = 'checkbox';
+    c.name = nombre;
+    c.value = valor;
+    c.checked = marcado;
+    return c;
+  }
+
+  function armarModales(datos) {
+    const lista = visibles(datos);
+
+    document.getElementById('lista-asistencia').replaceChildren(...lista.map((inst) => {
+      const texto = el('div');
+      const titulo = el('div');
+      titulo.appendChild(el('strong', '', nombreCompleto(inst)));
+      texto.appendChild(titulo);
+      texto.appendChild(el('div', 'meta', meta(inst)));
+      const row = fila(texto, checkbox('activos', inst.rut, inst.activo));
+      row.querySelector('label').append(' Activo');
+      return row;
+    }));
+
+    document.getElementById('lista-planificar').replaceChildren(...lista.map((inst) =>
+      fila(el('div', '', nombreCompleto(inst)), checkbox('instructores', inst.rut, false))
+    ));
+
+    document.getElementById('edit-instructor').replaceChildren(...lista.map((inst) => {
+      const opt = el('option', '', nombreCompleto(inst) + ' (Nivel ' + inst.nivel + ' / ' + inst.disciplina + ')');
+      opt.value = inst.rut;
+      opt.dataset.disciplina = (inst.disciplina || '').toLowerCase();
+      return opt;
+    }));
+  }
+
+  function sincronizarPagina() {
+    // los formularios de los modales vuelven a la fecha y filtro que se están mirando
+    document.querySelectorAll('input[type=hidden][name=fecha]').forEach((i) => { i.value = estado.fecha; });
+    document.querySelectorAll('input[type=hidden][name=solo_activos]').forEach((i) => { i.value = estado.solo ? '1' : ''; });
+    document.querySelectorAll('#form-planificar input[type=date]').forEach((i) => { i.value = estado.fecha; });
+    inpFecha.value = estado.fecha;
+    inpSolo.checked = estado.solo;
+
+    const [a, m, d] = estado.fecha.split('-');
+    document.getElementById('titulo-asistencia').textContent = d + '/' + m + '/' + a;
+    const reportes = document.getElementById('link-reportes');
+    reportes.href = reportes.href.split('?')[0] + '?mes=' + a + '-' + m;
+  }
+
+  async function cargar() {
+    const n = ++pedido;
+    const fecha = estado.fecha;
+    let datos;
+    try {
+      const resp = await fetch(tabla.dataset.json + '?fecha=' + encodeURIComponent(fecha), {
+        headers: { Accept: 'application/json' },
+        credentials: 'same-origin',
+      });
+      if (!resp.ok) throw new Error('HTTP ' + resp.status);
+      datos = await resp.json();
+    } catch (err) {
+      console.error(err);
+      if (n === pedido) {
+        const tr = el('tr');
+        tr.appendChild(el('td', 'empty', 'No se pudo cargar la grilla.'));
+        tabla.replaceChildren(tr);
+      }
+      return;
+    }
+    if (n !== pedido) return;
+
+    estado.datos = datos;
+    armarGrilla(datos);
+    armarModales(datos);
+    document.getElementById('resumen-horas').textContent = datos.resumen_horas;
+    sincronizarPagina();
+    grillaEnVivo.conectar(tabla.dataset.eventosBase + '?fecha=' + fecha, cargar);
+  }
+
+  function navegar(fecha, solo) {
+    if (!fecha || (fecha === estado.fecha && solo === estado.solo)) return;
+    estado.fecha = fecha;
+    estado.solo = solo;
+    const params = new URLSearchParams({ fecha });
+    if (solo) params.set('solo_activos', '1');
+    history.pushState({ fecha, solo }, '', '?' + params.toString());
+    cargar();
+  }
+
+  function moverDia(delta) {
+    const [a, m, d] = estado.fecha.split('-').map(Number);
+    const f = new Date(a, m - 1, d + delta);
+    const dos = (x) => String(x).padStart(2, '0');
+    navegar(f.getFullYear() + '-' + dos(f.getMonth() + 1) + '-' + dos(f.getDate()), estado.solo);
+  }
+
+  form.addEventListener('submit', (e) => {
+    e.preventDefault();
+    navegar(inpFecha.value, inpSolo.checked);
+  });
+  inpFecha.addEventListener('change', () => navegar(inpFecha.value, inpSolo.checked));
+  inpSolo.addEventListener('change', () => {
+    // el filtro no cambia los datos: se rearma con lo que ya llegó
+    estado.solo = inpSolo.checked;
+    const params = new URLSearchParams({ fecha: estado.fecha });
+    if (estado.solo) params.set('solo_activos', '1');
+    history.replaceState({ fecha: estado.fecha, solo: estado.solo }, '', '?' + params.toString());
+    if (estado.datos) {
+      armarGrilla(estado.datos);
+      armarModales(estado.datos);
+      sincronizarPagina();
+    }
+  });
+  document.getElementById('dia-anterior').addEventListener('click', () => moverDia(-1));
+  document.getElementById('dia-siguiente').addEventListener('click', () => moverDia(1));
+
+  window.addEventListener('popstate', () => {
+    const params = new URLSearchParams(window.location.search);
+    estado.fecha = params.get('fecha') || estado.fecha;
+    estado.solo = params.get('solo_activos') === '1';
+    cargar();
+  });
+
+  // después de guardar asistencia o planificar
+  window.recargarGrilla = cargar;
+
+  cargar();
+})();
@@ -0,0 +1,151 @@
+// Grilla en vivo: escucha los cambios del día (Server-Sent Events) y actualiza
+// solo las celdas afectadas, sin recargar la página.
+//
+// La tabla necesita:
+//   <table id="grilla" data-eventos="URL" data-inicio="ISO primer bloque"
+//          data-minutos="minutos por bloque" data-editar="fn" data-cancelar="fn"
+//          data-modo="boleteria|director">
+//   <tr data-rut="...">   y   <td data-bloque="i"> por celda de bloque.
+//
+// Queda expuesto como window.grillaEnVivo para que una grilla armada en el
+// navegador (dashboard_grilla.js) use las mismas tarjetas y cambie de canal
+// al navegar de fecha con conectar(url).
+(function () {
+  const tabla = document.getElementById('grilla');
+  if (!tabla) return;
+
+  const modo = tabla.dataset.modo || 'boleteria';
+  let fuente = null;
+  let alRecargar = null;
+
+  function hhmm(iso) {
+    // el servidor manda la hora local del centro: se toma tal cual del ISO
+    return iso.substring(11, 16);
+  }
+
+  function fila(rut) {
+    return tabla.querySelector('tr[data-rut="' + CSS.escape(rut) + '"]');
+  }
+
+  function vaciar(td) {
+    td.removeAttribute('data-clase');
+    td.replaceChildren();
+    const vacio = document.createElement('div');
+    vacio.className = 'empty';
+    vacio.textContent = '·';
+    td.appendChild(vacio);
+  }
+
+  function quitarClase(idClase) {
+    tabla.querySelectorAll('td[data-clase="' + idClase + '"]').forEach(vaciar);
+  }
+
+  function div(clase, texto) {
+    const el = document.createElement('div');
+    if (clase) el.className = clase;
+    if (texto !== undefined) el.textContent = texto;
+    return el;
+  }
+
+  function boton(clase, icono, titulo, fn, datos) {
+    const b = document.createElement('button');
+    b.className = clase;
+    b.title = titulo;
+    b.textContent = icono;
+    Object.entries(datos).forEach(([k, v]) => { b.dataset[k] = v; });
+    b.addEventListener('click', () => { if (window[fn]) window[fn](b); });
+    return b;
+  }
+
+  function tarjeta(ev) {
+    const caja = div('clase-box nivel-' + ev.nivel_clase);
+    caja.appendChild(div('disc', ev.disciplina_clase.toUpperCase() + ' (N' + ev.nivel_clase + ')'));
+    caja.appendChild(div('hora-rango', hhmm(ev.hora_inicio) + ' – ' + hhmm(ev.hora_fin)));
+    caja.appendChild(div('', ev.nombre_titular));
+    caja.appendChild(div('', 'Tel: ' + ev.titular_telefono));
+    caja.appendChild(div('', ev.cantidad_alumnos + ' alumno(s)'));
+
+    const botonera = div('botonera-clase');
+    botonera.appendChild(boton('btn-icon-edit', '✏️', 'Modificar', tabla.dataset.editar, {
+      id: ev.id_clase, nombre: ev.nombre_titular, telefono: ev.titular_telefono,
+      nivel: ev.nivel_clase, alumnos: ev.cantidad_alumnos, duracion: ev.duracion,
+      instructor: ev.rut, disciplina: ev.disciplina_clase.toLowerCase(),
+    }));
+    botonera.appendChild(boton('btn-icon-delete', '🗑️', 'Cancelar clase', tabla.dataset.cancelar, {
+      id: ev.id_clase, nombre: ev.nombre_titular,
+    }));
+    caja.appendChild(botonera);
+    return caja;
+  }
+
+  function ponerClase(ev) {
+    quitarClase(ev.id_clase);
+    const tr = fila(ev.rut);
+    if (!tr) return; // instructor no visible (inactivo u otro centro)
+
+    // se leen en cada llamada: la grilla del director cambia al navegar de fecha
+    const inicioGrilla = new Date(tabla.dataset.inicio).getTime();
+    const msBloque = parseInt(tabla.dataset.minutos, 10) * 60 * 1000;
+    const celdas = tr.querySelectorAll('td[data-bloque]');
+    const primero = Math.max(0, Math.floor((new Date(ev.hora_inicio).getTime() - inicioGrilla) / msBloque));
+    const ultimo = Math.min(celdas.length, Math.ceil((new Date(ev.hora_fin).getTime() - inicioGrilla) / msBloque));
+
+    for (let i = primero; i < ultimo; i++) {
+      const td = celdas[i];
+      td.replaceChildren(i === primero ? tarjeta(ev) : div('clase-box plano nivel-' + ev.nivel_clase));
+      td.dataset.clase = ev.id_clase;
+    }
+  }
+
+  function aplicarEstados(estados) {
+    let faltan = false;
+    Object.entries(estados).forEach(([rut, activo]) => {
+      const tr = fila(rut);
+      if (modo === 'boleteria') {
+        // boletería solo muestra activos
+        if (tr && !activo) tr.remove();
+        if (!tr && activo) faltan = true;
+        return;
+      }
+      if (!tr) return;
+      tr.classList.toggle('fila-inactiva', !activo);
+      const badge = tr.querySelector('.inst-nombre .badge');
+      if (badge) {
+        badge.className = 'badge ' + (activo ? 'badge-ok' : 'badge-off');
+        badge.textContent = activo ? 'Activo' : 'Inactivo';
+      }
+    });
+    if (faltan) avisarRecarga();
+  }
+
+  function avisarRecarga() {
+    if (alRecargar) return alRecargar();
+    if (document.getElementById('aviso-recarga')) return;
+    const aviso = div('', 'Hay cambios en la grilla. ');
+    aviso.id = 'aviso-recarga';
+    aviso.style.cssText = 'background:#fef3c7;border:1px solid #d97706;padding:8px;margin-bottom:12px;border-radius:8px;font-size:12px;';
+    const link = document.createElement('a');
+    link.href = window.location.href;
+    link.textContent = 'Actualizar';
+    aviso.appendChild(link);
+    tabla.parentNode.insertBefore(aviso, tabla);
+  }
+
+  // Escucha el canal `url` (cierra el anterior). recargar: función a llamar
+  // cuando el servidor pide recargar; por defecto se muestra un aviso.
+  function conectar(url, recargar) {
+    if (fuente) fuente.close();
+    fuente = null;
+    alRecargar = recargar || null;
+    if (!url || !window.EventSource) return;
+
+    fuente = new EventSource(url);
+    fuente.addEventListener('clase', (e) => ponerClase(JSON.parse(e.data)));
+    fuente.addEventListener('borrado', (e) => quitarClase(JSON.parse(e.data).id_clase));
+    fuente.addEventListener('estados', (e) => aplicarEstados(JSON.parse(e.data).estados));
+    fuente.addEventListener('recargar', avisarRecarga);
+  }
+
+  window.grillaEnVivo = { ponerClase, quitarClase, aplicarEstados, conectar };
+  conectar(tabla.dataset.eventos);
+})();
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def vincular_users(apps, schema_editor):
+    # Hasta ahora el User se buscaba por username = correo (o RUT si no había correo)
+    Usuario = apps.get_model("usuarios", "Usuario")
+    User = apps.get_model("auth", "User")
+    por_username = dict(User.objects.values_list("username", "id"))
+    ya_usados = set()
+    for usuario in Usuario.objects.filter(user__isnull=True).only("rut_usuario", "correo"):
+        correo = (usuario.correo or "").strip().lower()
+        user_id = por_username.get(usuario.correo) or por_username.get(correo) or por_username.get(usuario.rut_usuario)
+        if user_id and user_id not in ya_usados:
+            ya_usados.add(user_id)
+            Usuario.objects.filter(pk=usuario.pk).update(user_id=user_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0006_alter_usuario_contraseña_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='user',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='usuario', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(vincular_users, migrations.RunPython.noop),
+    ]
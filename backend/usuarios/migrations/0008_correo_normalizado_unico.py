@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:26
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def normalizar_correos(apps, schema_editor):
+    Usuario = apps.get_model("usuarios", "Usuario")
+    por_correo = defaultdict(list)
+    for rut, correo in Usuario.objects.values_list("rut_usuario", "correo"):
+        normalizado = (correo or "").strip().lower() or None
+        if normalizado:
+            por_correo[normalizado].append(rut)
+        if normalizado != correo:
+            Usuario.objects.filter(pk=rut).update(correo=normalizado)
+
+    repetidos = {c: ruts for c, ruts in por_correo.items() if len(ruts) > 1}
+    if repetidos:
+        detalle = "; ".join(f"{c}: {', '.join(ruts)}" for c, ruts in repetidos.items())
+        raise RuntimeError(
+            "Hay correos repetidos (sin distinguir mayúsculas). Corrígelos antes de migrar: " + detalle
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0007_usuario_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalizar_correos, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='usuario',
+            name='correo',
+            field=models.EmailField(blank=True, max_length=254, null=True, unique=True),
+        ),
+    ]
@@ -1,7 +1,13 @@
 from django.db import models
-from centros.models import CentroDeEsqui
+from centros.models import CentroDeEsqui, PorCentroQuerySet
 from django.contrib.auth.models import User 
 
+def normalizar_correo(correo):
+    """Correo en minúsculas y sin espacios; vacío -> None (no choca con el índice único)."""
+    correo = (correo or "").strip().lower()
+    return correo or None
+
+
 class Identificador(models.Model):
     # Ej: "Instructor", "Boleteria", "Jefe_De_Centro"
     tipo_de_usuario = models.CharField(primary_key=True, max_length=30)
@@ -9,6 +15,10 @@ class Identificador(models.Model):
     def __str__(self):
         return self.tipo_de_usuario
 
+class UsuarioQuerySet(PorCentroQuerySet):
+    campo_centro = "id_centro"
+
+
 class Usuario(models.Model):
     # RUT será la PK
     rut_usuario = models.CharField(primary_key=True, max_length=20)
@@ -31,7 +41,8 @@ class Usuario(models.Model):
 
     # Contacto personal
     numero_telefono = models.CharField(max_length=30, null=True, blank=True)
-    correo = models.EmailField(null=True, blank=True)
+    # siempre normalizado (ver save); único para que el login sea una búsqueda por índice
+    correo = models.EmailField(null=True, blank=True, unique=True)
     contraseña = models.CharField(max_length=255, null=True, blank=True, default='')
 
     # Idiomas que habla el instructor (texto libre tipo "español, inglés, portugués")
@@ -53,6 +64,51 @@ class Usuario(models.Model):
         blank=True
     )
 
+    # Cuenta de Django con la que entra a la API (JWT). La crea el login de la app
+    # o el alta de instructor; las vistas de la API no la leen, usan los claims del token.
+    user = models.OneToOneField(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="usuario",
+    )
+
+    objects = UsuarioQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        self.correo = normalizar_correo(self.correo)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.nombre} {self.apellido} ({self.rut_usuario})"
 
+
+def copiar_centro(instancia, campo, kwargs, fk_guardado=None):
+    """
+    Para el save() de los modelos con el centro copiado del instructor (Clase,
+    EstadoInstructor): deja en instancia.id_centro el centro del Usuario del FK
+    `campo`, sin consulta si ya viene cargado. Con update_fields solo cuando se
+    guarda ese FK (y entonces agrega id_centro).
+
+    `fk_guardado` es el valor del FK en la base antes de este save() (None si la
+    fila es nueva). Mientras no cambie, la fila conserva su centro: una clase
+    sigue en el centro donde se reservó aunque el instructor se cambie después.
+    """
+    fk = instancia._meta.get_field(campo)
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None:
+        if campo not in update_fields and fk.attname not in update_fields:
+            return
+        kwargs["update_fields"] = {*update_fields, "id_centro"}
+
+    if instancia.id_centro_id is not None and fk_guardado == getattr(instancia, fk.attname):
+        return
+    if fk.is_cached(instancia):
+        usuario = getattr(instancia, campo)
+        instancia.id_centro_id = usuario.id_centro_id if usuario else None
+    else:
+        instancia.id_centro_id = (
+            Usuario.objects.filter(pk=getattr(instancia, fk.attname))
+            .values_list("id_centro", flat=True).first()
+        )
@@ -0,0 +1,11 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from backend_project.utils import clave_cache_usuario
+from .models import Usuario
+
+
+@receiver([post_save, post_delete], sender=Usuario)
+def invalidar_usuario_sesion(sender, instance, **kwargs):
+    cache.delete(clave_cache_usuario(instance.rut_usuario))
@@ -1,3 +1,46 @@
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 
-# Create your tests here.
+from backend_project.utils import verificar_credenciales
+from usuarios.models import Identificador, Usuario
+
+
+class CorreoYContraseñaTests(TestCase):
+    """Correo normalizado (índice único) y hash regenerado al entrar (backend_project/utils.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Identificador.objects.create(tipo_de_usuario="instructor")
+
+    def _usuario(self, rut, correo, contraseña=None):
+        return Usuario.objects.create(
+            rut_usuario=rut, nombre="Inst", apellido=rut, tipo_de_usuario_id="instructor",
+            correo=correo, contraseña=contraseña,
+        )
+
+    def test_correo_normalizado_y_unico(self):
+        usuario = self._usuario("u1", "  Inst@Norte.CL ")
+        usuario.refresh_from_db()
+        self.assertEqual(usuario.correo, "inst@norte.cl")
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self._usuario("u2", "INST@norte.cl")
+
+        # sin correo queda NULL: varios usuarios sin correo no chocan con el índice
+        self._usuario("u3", "")
+        self._usuario("u4", "   ")
+        self.assertEqual(Usuario.objects.filter(correo__isnull=True).count(), 2)
+
+    def test_hash_viejo_se_regenera_al_entrar(self):
+        usuario = self._usuario("u1", "inst@norte.cl", make_password("clave", hasher="pbkdf2_sha256"))
+        viejo = usuario.contraseña
+
+        self.assertIsNone(verificar_credenciales("inst@norte.cl", "otra"))
+        usuario.refresh_from_db()
+        self.assertEqual(usuario.contraseña, viejo)
+
+        self.assertEqual(verificar_credenciales(" Inst@Norte.cl", "clave"), usuario)
+        usuario.refresh_from_db()
+        self.assertTrue(usuario.contraseña.startswith("scrypt$"))
+        self.assertEqual(verificar_credenciales("inst@norte.cl", "clave"), usuario)